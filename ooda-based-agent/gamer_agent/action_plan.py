@@ -0,0 +1,303 @@
+"""
+Action Plan Module - Choices compiladas em planos de execução tipados
+
+Este módulo compila cada choice do livro-jogo, uma única vez no carregamento do
+conteúdo, em um plano imutável: uma sequência ordenada de operações
+(NamedTuples) com as tabelas de resultado já resolvidas. O Agent executa o
+plano diretamente, sem reinspecionar as chaves do dicionário da choice a cada
+jogada.
+
+Resoluções feitas na compilação:
+- conditional_on: um plano por ocupação, mais o plano default
+- roll em string ou dicionário: skill, dificuldade e results normalizados
+- results e outcomes: goto validado e efeitos de cada nível/desfecho
+- luck_roll: níveis sem resultado já apontam para o nível inferior mais próximo
+- opposed_roll: valores do oponente (half padrão = full // 2)
+- effects: cada efeito é validado (Character.validate_effect) uma única vez;
+  a execução usa Character.apply_validated_effects
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from character import Character
+
+
+# Níveis de sucesso (1 = fumble ... 5 = crítico); o índice 0 não é usado
+SUCCESS_LEVELS = (1, 2, 3, 4, 5)
+
+# Valores padrão do oponente em opposed_roll (mesmos de Character.opposed_roll)
+DEFAULT_OPPONENT_FULL = 30
+
+
+class Outcome(NamedTuple):
+    """Resultado de uma rolagem: página de destino (None = permanece) e efeitos."""
+    goto: Optional[int]
+    effects: Tuple[Dict[str, Any], ...] = ()
+
+
+class SetOccupationOp(NamedTuple):
+    """Define a ocupação do personagem."""
+    occupation: str
+
+
+class EffectsOp(NamedTuple):
+    """Aplica uma lista de efeitos já validados (Character.apply_validated_effects)."""
+    effects: Tuple[Dict[str, Any], ...]
+
+
+class SkillRollOp(NamedTuple):
+    """Teste de habilidade/característica; outcomes é indexado pelo nível (1-5)."""
+    skill: str
+    difficulty: str
+    bonus_dice: bool
+    penalty_dice: bool
+    outcomes: Tuple[Optional[Outcome], ...]
+
+
+class LuckRollOp(NamedTuple):
+    """Teste de sorte; outcomes já resolvidos para o nível inferior mais próximo."""
+    bonus_dice: bool
+    penalty_dice: bool
+    outcomes: Tuple[Optional[Outcome], ...]
+
+
+class OpposedRollOp(NamedTuple):
+    """Teste oposto contra um oponente com valores fixos."""
+    skill: str
+    opponent_full: int
+    opponent_half: int
+    bonus_dice: bool
+    penalty_dice: bool
+    win: Optional[Outcome]
+    lose: Optional[Outcome]
+    draw: Optional[Outcome]
+
+
+class GotoOp(NamedTuple):
+    """Navegação direta (None = goto inválido, permanece na página)."""
+    target: Optional[int]
+
+
+class ActionPlan(NamedTuple):
+    """Plano de uma choice já resolvida: operações executadas em ordem."""
+    text: str
+    ops: Tuple[Any, ...]
+
+
+class ChoicePlan(NamedTuple):
+    """
+    Plano compilado de uma choice do livro.
+
+    Choices simples têm apenas o plano default; choices conditional_on têm um
+    plano por ocupação em paths (tupla de pares ocupação/plano).
+    """
+    text: str
+    default: Optional[ActionPlan]
+    paths: Tuple[Tuple[str, ActionPlan], ...] = ()
+
+    @property
+    def conditional(self) -> bool:
+        """Indica se o plano depende da ocupação."""
+        return bool(self.paths)
+
+    def resolve(self, occupation: Optional[str]) -> Optional[ActionPlan]:
+        """
+        Obtém o plano a executar para uma ocupação.
+
+        Returns:
+            Plano da ocupação, plano default, ou None se não houver nenhum
+        """
+        for path_occupation, plan in self.paths:
+            if path_occupation == occupation:
+                return plan
+        return self.default
+
+
+def _goto(value: Any) -> Optional[int]:
+    """Valida um goto (inteiro não negativo)."""
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return value
+    return None
+
+
+def compile_effects(effects: Any) -> Tuple[Dict[str, Any], ...]:
+    """
+    Valida uma lista de efeitos e a congela em tupla.
+
+    Raises:
+        ValueError: Se 'effects' não for lista ou algum efeito for inválido
+    """
+    if not effects:
+        return ()
+    if not isinstance(effects, list):
+        raise ValueError(f"'effects' deve ser uma lista, recebido: {type(effects)}")
+    for effect in effects:
+        validation = Character.validate_effect(effect)
+        if not validation["valid"]:
+            raise ValueError(validation["error"])
+    return tuple(effects)
+
+
+def compile_outcome(result: Any) -> Optional[Outcome]:
+    """
+    Compila um resultado de results/outcomes (inteiro ou dicionário).
+
+    Returns:
+        Outcome, ou None se o resultado estiver ausente
+    """
+    if not result:
+        return None
+    if isinstance(result, dict):
+        return Outcome(_goto(result.get("goto")), compile_effects(result.get("effects")))
+    return Outcome(_goto(result))
+
+
+def _level_table(results: Dict[str, Any], fall_back_to_lower: bool = False) -> Tuple[Optional[Outcome], ...]:
+    """Tabela de resultados indexada pelo nível de sucesso (índice 0 não usado)."""
+    table: List[Optional[Outcome]] = [None]
+    for level in SUCCESS_LEVELS:
+        outcome = compile_outcome(results.get(str(level)))
+        if outcome is None and fall_back_to_lower:
+            # Sem resultado para o nível: usa o nível inferior mais próximo
+            outcome = next((table[i] for i in range(level - 1, 0, -1) if table[i] is not None), None)
+        table.append(outcome)
+    return tuple(table)
+
+
+def compile_action(choice: Dict[str, Any]) -> ActionPlan:
+    """
+    Compila uma choice sem conditional_on em um ActionPlan.
+
+    A ordem das operações segue Agent.perform_action: set-occupation, effects e
+    então uma única operação de resolução (roll, luck_roll, opposed_roll ou goto).
+
+    Args:
+        choice: Dicionário da choice (ou de um path)
+
+    Returns:
+        Plano imutável
+
+    Raises:
+        ValueError: Se 'roll' tiver formato inválido ou algum efeito for inválido
+    """
+    ops: List[Any] = []
+    bonus_dice = bool(choice.get("bonus_dice"))
+    penalty_dice = bool(choice.get("penalty_dice"))
+
+    if "set-occupation" in choice:
+        ops.append(SetOccupationOp(choice["set-occupation"]))
+    if choice.get("effects"):
+        ops.append(EffectsOp(compile_effects(choice["effects"])))
+
+    if "roll" in choice:
+        roll_data = choice["roll"]
+        if isinstance(roll_data, str):
+            skill, difficulty, results = roll_data, choice.get("difficulty", "regular"), choice.get("results", {})
+        elif isinstance(roll_data, dict) and "skill" in roll_data:
+            skill = roll_data["skill"]
+            difficulty = roll_data.get("difficulty", choice.get("difficulty", "regular"))
+            results = roll_data.get("results", choice.get("results", {}))
+        else:
+            raise ValueError(f"Formato de 'roll' inválido: {roll_data}")
+        ops.append(SkillRollOp(skill, difficulty, bonus_dice, penalty_dice, _level_table(results)))
+
+    elif choice.get("luck_roll"):
+        ops.append(LuckRollOp(bonus_dice, penalty_dice,
+                              _level_table(choice.get("results", {}), fall_back_to_lower=True)))
+
+    elif "opposed_roll" in choice:
+        opponent = choice.get("opponent_skill", {})
+        opponent_full = opponent.get("full", DEFAULT_OPPONENT_FULL)
+        outcomes = choice.get("outcomes", {})
+        ops.append(OpposedRollOp(
+            choice["opposed_roll"], opponent_full, opponent.get("half", opponent_full // 2),
+            bonus_dice, penalty_dice,
+            compile_outcome(outcomes.get("win")),
+            compile_outcome(outcomes.get("lose")),
+            compile_outcome(outcomes.get("draw"))
+        ))
+
+    elif "goto" in choice:
+        ops.append(GotoOp(_goto(choice["goto"])))
+
+    return ActionPlan(choice.get("text", ""), tuple(ops))
+
+
+def compile_choice(choice: Dict[str, Any]) -> ChoicePlan:
+    """
+    Compila uma choice do livro (resolvendo conditional_on por ocupação).
+
+    Args:
+        choice: Dicionário da choice
+
+    Returns:
+        ChoicePlan imutável
+
+    Raises:
+        ValueError: Se a choice ou algum path for malformado
+    """
+    if not isinstance(choice, dict):
+        raise ValueError(f"Choice deve ser um dicionário, recebido: {type(choice)}")
+
+    text = choice.get("text", "")
+    if choice.get("conditional_on") != "occupation":
+        return ChoicePlan(text, compile_action(choice))
+
+    paths = []
+    default = None
+    for occupation, path in choice.get("paths", {}).items():
+        if not isinstance(path, dict):
+            raise ValueError(f"Path '{occupation}' deve ser um dicionário: {path}")
+        plan = compile_action(path)
+        if "text" not in path:
+            # Preservar texto original se não houver no path
+            plan = plan._replace(text=text)
+        if occupation == "default":
+            default = plan
+        else:
+            paths.append((occupation, plan))
+    return ChoicePlan(text, default, tuple(paths))
+
+
+def compile_pages(pages: Dict[int, Dict[str, Any]]) -> Dict[int, Tuple[ChoicePlan, ...]]:
+    """
+    Compila as choices de todas as páginas.
+
+    Args:
+        pages: Dicionário com todas as páginas do jogo
+
+    Returns:
+        Dicionário página -> tupla de ChoicePlan (mesma ordem das choices)
+
+    Raises:
+        ValueError: Se alguma choice for malformada (com a página no erro)
+    """
+    plans = {}
+    for page_id, page_data in pages.items():
+        try:
+            plans[page_id] = tuple(compile_choice(choice) for choice in page_data.get("choices", []))
+        except ValueError as e:
+            raise ValueError(f"Página {page_id}: {e}") from e
+    return plans
+
+
+# Teste e validação
+if __name__ == "__main__":
+    from pages import PAGES
+
+    print("=== TESTE DO ACTION PLAN ===\n")
+
+    plans = compile_pages(PAGES)
+    total = sum(len(page_plans) for page_plans in plans.values())
+    conditional = sum(plan.conditional for page_plans in plans.values() for plan in page_plans)
+    print(f"1. {total} choices compiladas em {len(plans)} páginas ({conditional} conditional_on)")
+
+    page_id = next(page_id for page_id, page_plans in plans.items() if any(p.conditional for p in page_plans))
+    print(f"\n2. Planos da página {page_id}:")
+    for index, plan in enumerate(plans[page_id], 1):
+        print(f"   {index}. {plan.text[:40]!r}")
+        for occupation, path in ((None, plan.default),) + plan.paths:
+            if path is not None:
+                print(f"      [{occupation or 'default'}] {[type(op).__name__ for op in path.ops]}")
+
+    print("\n=== TESTE CONCLUÍDO ===")
@@ -1,10 +1,16 @@
 from character import Character
 from cockpit import Cockpit
 from player_strategy_interface import PlayerStrategy
-from typing import Dict, Any, Tuple
+from action_plan import (
+    ActionPlan, ChoicePlan, Outcome, compile_choice,
+    SetOccupationOp, EffectsOp, SkillRollOp, LuckRollOp, OpposedRollOp, GotoOp
+)
+from typing import Dict, Any, Tuple, Optional
+import random
 
 class Agent:
-    def __init__(self, game_repository: Dict[int, Dict], player_input_adapter: PlayerStrategy, debug: bool = False):
+    def __init__(self, game_repository: Dict[int, Dict], player_input_adapter: PlayerStrategy, debug: bool = False,
+                 interactive: bool = True, rng: Optional[random.Random] = None):
         """
         Inicializa o Agent com arquitetura PlayerInputStrategy v1.2.
         
@@ -12,9 +18,12 @@ class Agent:
             character: Instância da classe Character (pode ter occupation=None inicialmente)
             game_repository: Dicionário com todas as páginas do jogo
             player_input_adapter: Adapter para captura de entrada do jogador
+            interactive: Se False, não pausa entre jogadas (modo headless/simulação)
+            rng: Gerador aleatório injetado no Character (rolagens reprodutíveis)
         """
         self._debug_mode = debug
-        character = Character() 
+        self._interactive = interactive
+        character = Character(rng=rng)
         self.game_data = game_repository
         self.combat_status = {}
         
@@ -28,6 +37,21 @@ class Agent:
         # Criar instância do Cockpit para visualização rica
         self.cockpit = Cockpit(character, game_repository)
 
+        # Execução dos planos compilados: uma função por tipo de operação
+        self._op_handlers = {
+            SetOccupationOp: self._run_set_occupation,
+            EffectsOp: self._run_effects,
+            SkillRollOp: self._run_skill_roll,
+            LuckRollOp: self._run_luck_roll,
+            OpposedRollOp: self._run_opposed_roll,
+            GotoOp: self._run_goto,
+        }
+
+        # Telemetria da sessão (usada pelo Simulator)
+        self.visited_pages = []
+        self.turns = 0
+        self.end_reason = None
+
     @property
     def sheet(self):
         """Propriedade de compatibilidade para código que ainda acessa self.sheet"""
@@ -155,40 +179,31 @@ class Agent:
         
         raise Exception("Failed to obtain a valid choice after multiple attempts")
     
-    def _resolve_conditional_choice(self, choice: Dict[str, Any]) -> Dict[str, Any]:
+    def _resolve_plan(self, plan: ChoicePlan) -> ActionPlan:
         """
-        Resolve uma choice conditional_on para o path específico da ocupação atual.
+        Resolve o plano de uma choice para a ocupação atual (conditional_on).
         
         Args:
-            choice: Choice com conditional_on a ser resolvido
+            plan: Plano compilado da choice
             
         Returns:
-            Choice resolvido para a ocupação atual
+            Plano de execução para a ocupação atual
+            
+        Raises:
+            ValueError: Se não houver path para a ocupação nem default
         """
-        if choice.get('conditional_on') != 'occupation':
-            # Se não é conditional_on occupation, retornar como está
-            return choice
+        if not plan.conditional:
+            return plan.default
 
         current_occupation = self.cockpit.character.occupation
-        paths = choice.get('paths', {})
-        
-        # Determinar qual path usar
-        if current_occupation in paths:
-            resolved_choice = paths[current_occupation].copy()
-            print(f"Usando path para ocupação '{current_occupation}'")
-        elif 'default' in paths:
-            resolved_choice = paths['default'].copy()
+        action = plan.resolve(current_occupation)
+        if action is None:
+            raise ValueError(f"Nenhum path encontrado para ocupação '{current_occupation}' e sem default")
+        if action is plan.default:
             print(f"Usando path 'default' (ocupação atual: {current_occupation or 'None'})")
         else:
-            # Não deveria acontecer se validação passou, mas fallback de segurança
-            print(f"ERRO: Nenhum path encontrado para ocupação '{current_occupation}' e sem default")
-            return choice
-        
-        # Preservar texto original se não houver no path resolvido
-        if 'text' not in resolved_choice and 'text' in choice:
-            resolved_choice['text'] = choice['text']
-            
-        return resolved_choice
+            print(f"Usando path para ocupação '{current_occupation}'")
+        return action
     
     def _validate_choice_against_rules(self, choice: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -255,7 +270,8 @@ class Agent:
     def _process_effects(self, effects):
         """
         Processa uma lista de efeitos no estado do agente (v1.2).
-        Refatorado para usar character.apply_effects() com tratamento de ocupação dinâmica.
+        Os efeitos vêm dos planos compilados (já validados no carregamento) e
+        são aplicados por character.apply_validated_effects().
         """
         if not isinstance(effects, list):
             print(f"AVISO: 'effects' deve ser uma lista, recebido: {type(effects)}. Ignorando efeitos.")
@@ -263,8 +279,7 @@ class Agent:
 
         occupation_before = self.cockpit.character.occupation
         
-        # Usar o método robusto da classe Character
-        result = self.cockpit.character.apply_effects(effects)
+        result = self.cockpit.character.apply_validated_effects(effects)
         
         # Verificar se ocupação foi definida/alterada
         occupation_after = self.cockpit.character.occupation
@@ -288,6 +303,14 @@ class Agent:
             print(f"ERRO CRÍTICO: Choice deve ser um dicionário, recebido: {type(choice)}")
             return False
         
+        # Choices conditional_on são válidas se todos os paths forem válidos
+        if choice.get("conditional_on") == "occupation":
+            paths = choice.get("paths")
+            if not isinstance(paths, dict) or not paths:
+                print(f"ERRO: 'paths' deve ser um dicionário não vazio: {paths}")
+                return False
+            return all(self._validate_choice(path) for path in paths.values())
+        
         # Verifica se tem pelo menos um campo válido para ação
         valid_action_fields = ["goto", "roll", "opposed_roll", "luck_roll", "effects"]
         has_valid_action = any(field in choice for field in valid_action_fields)
@@ -397,13 +420,19 @@ class Agent:
         
         return True
 
-    def perform_action(self, choice):
+    def perform_action(self, choice, plan: Optional[ChoicePlan] = None):
         """
         Executa a ação decidida, aplicando efeitos e rolagens de dados.
         Retorna uma tupla com o (outcome, next_page).
+        
+        Args:
+            choice: Choice decidida
+            plan: Plano compilado da choice (padrão: compila a choice recebida)
         """
-        if not self._validate_choice(choice):
-            raise ValueError(f"Choice inválida: {choice}")
+        if plan is None:
+            if not self._validate_choice(choice):
+                raise ValueError(f"Choice inválida: {choice}")
+            plan = compile_choice(choice)
         
         outcome = choice.get("outcome", "")
         next_page = self.cockpit.current_page_number
@@ -412,65 +441,10 @@ class Agent:
         print("=" * 50)
 
         try:
-            # Resolver conditional_on se presente
-            choice = self._resolve_conditional_choice(choice)
-
-            if "set-occupation" in choice:
-                new_occupation = choice["set-occupation"]
-                self.cockpit.character.set_occupation(new_occupation)
-                print(f"OCUPAÇÃO DEFINIDA: {new_occupation}")
-
-            if "effects" in choice:
-                self._process_effects(choice["effects"])
-
-            if "roll" in choice:
-                roll_data = choice["roll"]
-                if isinstance(roll_data, str):
-                    skill_name, difficulty, results = roll_data, choice.get("difficulty", "normal"), choice.get("results", {})
-                elif isinstance(roll_data, dict):
-                    skill_name, difficulty, results = roll_data.get("skill"), roll_data.get("difficulty", "normal"), roll_data.get("results", {})
-                else:
-                    raise ValueError(f"Formato de 'roll' inválido: {roll_data}")
-
-                print(f"Usando dificuldade: {difficulty}, skill: {skill_name}")
-                roll_result = self.cockpit.character.roll_skill(skill_name, "common", difficulty=difficulty) or \
-                              self.cockpit.character.roll_skill(skill_name, "combat", difficulty=difficulty) or \
-                              self.cockpit.character.roll_skill(skill_name, "expert", difficulty=difficulty) or \
-                              self.cockpit.character.roll_characteristic(skill_name, difficulty=difficulty)
-
-                if not roll_result or not roll_result.get("success"):
-                    raise Exception(f"Falha na rolagem de '{skill_name}'")
-
-                level = roll_result["level"]
-                print(f"Rolled {skill_name}: {roll_result['roll']} vs {roll_result['target']} -> Level {level}")
-                
-                result = results.get(str(level))
-                if result:
-                    if isinstance(result, int):
-                        if result >= 0: next_page = result
-                    elif isinstance(result, dict):
-                        if "effects" in result: self._process_effects(result["effects"])
-                        if "goto" in result and isinstance(result["goto"], int) and result["goto"] >= 0:
-                            next_page = result["goto"]
-
-            elif "luck_roll" in choice and choice["luck_roll"]:
-                roll_result = self.cockpit.character.roll_luck()
-                level = roll_result["level"]
-                print(f"Rolled Luck: {roll_result['roll']} vs {roll_result['target']} -> Level {level}")
-                
-                results = choice.get("results", {})
-                result = results.get(str(level)) or next((results.get(str(i)) for i in range(level - 1, 0, -1) if results.get(str(i))), None)
-                if result:
-                    if "effects" in result: self._process_effects(result["effects"])
-                    if "goto" in result and isinstance(result["goto"], int) and result["goto"] >= 0:
-                        next_page = result["goto"]
-
-            elif "goto" in choice:
-                goto_page = choice["goto"]
-                if isinstance(goto_page, int) and goto_page >= 0:
-                    next_page = goto_page
-                else:
-                    print(f"ERRO: Página 'goto' inválida: {goto_page}")
+            for op in self._resolve_plan(plan).ops:
+                target = self._op_handlers[type(op)](op)
+                if target is not None:
+                    next_page = target
 
         except Exception as e:
             print(f"ERRO CRÍTICO durante execução da ação: {e}")
@@ -479,18 +453,83 @@ class Agent:
         print("=" * 50)
         return outcome, next_page
 
-    def run(self):
+    def _apply_outcome(self, outcome: Optional[Outcome]) -> Optional[int]:
+        """Aplica os efeitos de um resultado de rolagem e retorna seu destino."""
+        if outcome is None:
+            return None
+        if outcome.effects:
+            self._process_effects(list(outcome.effects))
+        return outcome.goto
+
+    def _run_set_occupation(self, op: SetOccupationOp) -> None:
+        self.cockpit.character.set_occupation(op.occupation)
+        print(f"OCUPAÇÃO DEFINIDA: {op.occupation}")
+
+    def _run_effects(self, op: EffectsOp) -> None:
+        self._process_effects(list(op.effects))
+
+    def _run_skill_roll(self, op: SkillRollOp) -> Optional[int]:
+        character = self.cockpit.character
+        print(f"Usando dificuldade: {op.difficulty}, skill: {op.skill}")
+        roll_result = character.roll_check(op.skill, op.bonus_dice, op.penalty_dice, op.difficulty)
+        if not roll_result or not roll_result.get("success"):
+            raise Exception(f"Falha na rolagem de '{op.skill}'")
+
+        if roll_result.get("untrained"):
+            print(f"AVISO: '{op.skill}' não existe na ficha; usando valor padrão {roll_result['target']}")
+
+        level = roll_result["level"]
+        print(f"Rolled {op.skill}: {roll_result['roll']} vs {roll_result['target']} -> Level {level}")
+        return self._apply_outcome(op.outcomes[level])
+
+    def _run_luck_roll(self, op: LuckRollOp) -> Optional[int]:
+        roll_result = self.cockpit.character.roll_luck(op.bonus_dice, op.penalty_dice)
+        level = roll_result["level"]
+        print(f"Rolled Luck: {roll_result['roll']} vs {roll_result['target']} -> Level {level}")
+        return self._apply_outcome(op.outcomes[level])
+
+    def _run_opposed_roll(self, op: OpposedRollOp) -> Optional[int]:
+        character = self.cockpit.character
+        entry = character.resolve_check(op.skill)
+        skill_type = entry[1] if entry is not None and entry[0] == "skills" else "common"
+        roll_result = character.opposed_roll(op.skill, skill_type, op.opponent_full, op.opponent_half,
+                                             op.bonus_dice, op.penalty_dice)
+        if not roll_result.get("success"):
+            raise Exception(f"Falha no teste oposto de '{op.skill}'")
+
+        my_roll, opponent_roll = roll_result["my_roll"], roll_result["opponent_roll"]
+        print(f"Opposed {op.skill}: {my_roll['roll']} (Level {my_roll['level']}) vs "
+              f"{opponent_roll['roll']} (Level {opponent_roll['level']}) -> {roll_result['outcome']}")
+        return self._apply_outcome(getattr(op, roll_result["outcome"]))
+
+    def _run_goto(self, op: GotoOp) -> Optional[int]:
+        if op.target is None:
+            print("ERRO: Página 'goto' inválida")
+        return op.target
+
+    def run(self, max_turns: Optional[int] = None):
         """
         Executa o ciclo OODA principal para navegar pelo livro-jogo.
+
+        Args:
+            max_turns: Limite opcional de jogadas (evita loops infinitos em simulações)
         """
         # Configurar a página inicial no Cockpit
         self.cockpit.set_current_page(1)
+        self.visited_pages = [1]
+        self.turns = 0
+        self.end_reason = None
 
         while True:
+            if max_turns is not None and self.turns >= max_turns:
+                self.end_reason = "max_turns"
+                break
+
             # 1. Observe
             page_text, choices = self._observe()
             if not choices:
                 print("Fim da história (nenhuma escolha encontrada).")
+                self.end_reason = "end"
                 break
             
             # 2. Orient
@@ -505,12 +544,13 @@ class Agent:
                 print("📊 Estatísticas da sessão:")
                 print(f"   - Página atual: {self.cockpit.current_page_number}")
                 print(f"   - Limite máximo: {self.max_choice_retries}")
+                self.end_reason = "circuit_breaker"
                 break
             
             
             # 4. Act
             try:
-                outcome, next_page = self.perform_action(chosen_action)
+                outcome, next_page = self.perform_action(chosen_action, self._choice_plan(choices, chosen_action))
                 
                 # Se a ação foi bem-sucedida, reseta o contador de falhas.
                 
@@ -522,15 +562,19 @@ class Agent:
                         break
                 self._log_turn_summary(chosen_action, choice_index, outcome)
 
-                # PAUSA MANUAL: Aguardar ENTER para continuar (todos os modos)
-                try:
-                    input("Pressione ENTER para continuar...")
-                except KeyboardInterrupt:
-                    print("\n🛑 Jogo interrompido pelo usuário")
-                    break
+                # PAUSA MANUAL: Aguardar ENTER para continuar (modos interativos)
+                if self._interactive:
+                    self.player_input_adapter.wait_render()
+                    try:
+                        input("Pressione ENTER para continuar...")
+                    except KeyboardInterrupt:
+                        print("\n🛑 Jogo interrompido pelo usuário")
+                        self.end_reason = "interrupted"
+                        break
                 
             except Exception as e:
                 print(f"🚨 ERRO DE EXECUÇÃO: A ação falhou. {e}")
+                self.end_reason = "error"
                 break
             
             # 5. Record - Registrar escolha no histórico detalhado
@@ -544,13 +588,31 @@ class Agent:
 
             # Navegação para a próxima página
             self.cockpit.set_current_page(next_page)        
-
+            self.visited_pages.append(next_page)
+            self.turns += 1
+            self.cockpit.character.advance_turn()
 
             # Condição de parada
             if self.cockpit.current_page_number == 0:
                 print("Fim da história (goto: 0).")
+                self.end_reason = "goto_zero"
                 break
 
+    def _choice_plan(self, choices, chosen_action) -> Optional[ChoicePlan]:
+        """
+        Obtém o plano pré-compilado da choice escolhida no repositório.
+        
+        Returns:
+            ChoicePlan, ou None se o repositório não oferecer planos compilados
+        """
+        if not hasattr(self.game_data, "get_choice_plans"):
+            return None
+        plans = self.game_data.get_choice_plans(self.cockpit.current_page_number)
+        for index, choice in enumerate(choices):
+            if choice is chosen_action and index < len(plans):
+                return plans[index]
+        return None
+
     def _observe(self):
         """
         Observa o ambiente usando Cockpit para visualização rica.
@@ -0,0 +1,132 @@
+"""
+Benchmarks Module - Medições de desempenho e memória do gamer_agent
+
+Este módulo reúne medições reprodutíveis usadas para comparar representações
+e caminhos quentes do agente. Cada medição retorna um dicionário com os
+números, para uso em scripts e relatórios.
+
+Uso:
+    python benchmarks.py
+"""
+
+import contextlib
+import io
+import json
+import pickle
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from character import Character
+
+
+def _per_call_us(function: Callable[[], Any], repeat: int) -> float:
+    """Tempo médio (microssegundos) de uma chamada."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def _allocated_per_item(factory: Callable[[int], Any], n: int) -> float:
+    """Memória alocada (bytes) por objeto mantido vivo, medida com tracemalloc."""
+    keep: List[Any] = []
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for index in range(n):
+            keep.append(factory(index))
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # Descontar a própria lista que mantém os objetos vivos
+    return (after - before - keep.__sizeof__()) / n
+
+
+# Gerador compartilhado: o estado do Mersenne Twister (~2,5 KB) não faz parte da ficha
+_SHARED_RNG = random.Random(0)
+
+
+def _sample_character(seed: int) -> Character:
+    """Personagem típico de meio de partida: ocupação, dano, item e histórico."""
+    character = Character(rng=_SHARED_RNG)
+    with contextlib.redirect_stdout(io.StringIO()):
+        character.set_occupation(("Police Officer", "Social Worker", "Nurse")[seed % 3])
+    character.take_damage(1)
+    character.add_item("Flashlight")
+    for page in range(10):
+        character.add_to_history(page, "Texto da página", {"goto": page + 1})
+    return character
+
+
+def memory_report(n: int = 2000) -> Dict[str, float]:
+    """
+    Memória por instância das representações do personagem.
+
+    Args:
+        n: Número de instâncias medidas
+
+    Returns:
+        Dicionário com bytes por instância de cada representação
+    """
+    originals = [_sample_character(seed) for seed in range(n)]
+    report = {
+        "character_bytes": _allocated_per_item(_sample_character, n),
+        "compact_bytes": _allocated_per_item(lambda index: originals[index].compact(), n),
+        "fork_bytes": _allocated_per_item(lambda index: originals[index].fork(), n),
+    }
+    report["compact_ratio"] = report["compact_bytes"] / report["character_bytes"]
+    return report
+
+
+def serialization_report(n: int = 200, repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    """
+    Tamanho e velocidade da serialização do personagem.
+
+    Compara Character.to_bytes()/from_bytes() (sem histórico) com pickle e
+    JSON da ficha completa (_sheet, incluindo page_history), que era a única
+    opção para checkpoints.
+
+    Args:
+        n: Número de personagens serializados
+        repeat: Repetições de cada medição
+
+    Returns:
+        Dicionário formato -> {"bytes", "encode_us", "decode_us"} por personagem
+    """
+    characters = [_sample_character(seed) for seed in range(n)]
+    formats = {
+        "binary": (lambda character: character.to_bytes(), Character.from_bytes),
+        "pickle": (lambda character: pickle.dumps(character._sheet, pickle.HIGHEST_PROTOCOL), pickle.loads),
+        "json": (lambda character: json.dumps(character._sheet, default=list), json.loads),
+    }
+    report = {}
+    for name, (encode, decode) in formats.items():
+        payloads = [encode(character) for character in characters]
+        report[name] = {
+            "bytes": sum(len(payload) for payload in payloads) / n,
+            "encode_us": _per_call_us(lambda: [encode(character) for character in characters], repeat) / n,
+            "decode_us": _per_call_us(lambda: [decode(payload) for payload in payloads], repeat) / n,
+        }
+    return report
+
+
+# Teste e validação
+if __name__ == "__main__":
+    print("=== BENCHMARKS ===\n")
+
+    memory = memory_report()
+    print("1. Memória por personagem:")
+    print(f"   Character (ficha em dicionários): {memory['character_bytes']:8.0f} bytes")
+    print(f"   CompactCharacter:                 {memory['compact_bytes']:8.0f} bytes "
+          f"({memory['compact_ratio']:.0%})")
+    print(f"   Character.fork() (copy-on-write): {memory['fork_bytes']:8.0f} bytes")
+
+    serialization = serialization_report()
+    print("\n2. Serialização por personagem:")
+    for name, numbers in serialization.items():
+        print(f"   {name:7s} {numbers['bytes']:7.0f} bytes  "
+              f"encode {numbers['encode_us']:6.1f} us  decode {numbers['decode_us']:6.1f} us")
+
+    print("\n=== BENCHMARKS CONCLUÍDOS ===")
@@ -10,8 +10,143 @@ setup_character(), oferecendo uma interface orientada a objetos para todas as
 operações relacionadas ao personagem.
 """
 
+import contextlib
+import copy
+import heapq
 import random
-from typing import Dict, List, Any, Optional
+from collections import Counter
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
+from dice_probability import (
+    success_level_distribution, difficulty_targets, opposed_roll_distribution, OPPOSED_ROLL_TABLE
+)
+from dice_engine import ScalarDiceEngine
+from history_buffer import HistoryBuffer
+
+
+# Rótulos dos níveis de dano, compartilhados por todas as fichas (somente leitura)
+DAMAGE_LEVELS = ["Healthy", "Hurt", "Bloodied", "Down", "Impaired"]
+
+
+# Entradas mantidas no histórico de decisões (as mais antigas são descartadas)
+HISTORY_CAPACITY = 30
+
+# Categorias do inventário
+INVENTORY_CATEGORIES = ("equipment", "weapons")
+
+
+def _copy_inventory(inventory: Any) -> Any:
+    """Copia o inventário (dicionário de multiconjuntos ou lista no formato antigo)."""
+    if isinstance(inventory, list):
+        return list(inventory)
+    return {category: items.copy() for category, items in inventory.items()}
+
+
+# Cópia de cada seção da ficha na profundidade em que ela é alterada;
+# damage_levels e as entradas do histórico são somente leitura e compartilhadas
+_SECTION_COPIERS = {
+    "info": dict.copy,
+    "contacts": dict.copy,
+    "case_files": list,
+    "characteristics": lambda section: {name: values.copy() for name, values in section.items()},
+    "resources": lambda section: {key: value.copy() if isinstance(value, dict) else value
+                                  for key, value in section.items()},
+    "skills": lambda section: {skill_type: {name: values.copy() for name, values in skills.items()}
+                               for skill_type, skills in section.items()},
+    "status": lambda section: dict(section, modifiers=[modifier.copy() for modifier in section["modifiers"]]),
+    "inventory": _copy_inventory,
+    "page_history": lambda history: history.copy(),
+}
+
+def _inventory_items(items: Any):
+    """Itens de uma categoria, repetidos conforme a quantidade (Counter ou lista antiga)."""
+    return items.elements() if isinstance(items, Counter) else items
+
+
+def _item_count(items: Any, item: str) -> int:
+    """Quantidade de um item em uma categoria (Counter ou lista antiga)."""
+    return items[item] if isinstance(items, Counter) else items.count(item)
+
+
+# Habilidade concedida por gain_skill quando o efeito não informa valor/tipo
+GAINED_SKILL_VALUE = 50
+GAINED_SKILL_TYPE = "expert"
+
+# Condições aceitas no campo "condition" de um efeito (o efeito só é
+# aplicado se a condição for verdadeira)
+_EFFECT_CONDITIONS = {
+    "full_health": lambda character: character._sheet["status"]["damage_taken"] == 0,
+}
+
+
+# Marcador do undo log para chaves que não existiam antes da alteração
+_MISSING = object()
+
+# Tipos de entrada do undo log
+_UNDO_SET = 0      # (tipo, seção, caminho, valor anterior)
+_UNDO_APPEND = 1   # (tipo, seção, caminho, tamanho anterior da lista)
+_UNDO_SHEET = 2    # (tipo, ficha anterior) - registrado por restore()
+
+
+class _ModifierIndex:
+    """
+    Índice derivado de status["modifiers"]: contagem de modificadores por
+    (habilidade, tipo) e min-heap de expirações (expires_at, habilidade, tipo).
+
+    Entradas do heap de modificadores já removidos não são apagadas; ao vencer,
+    não encontram modificador correspondente e são descartadas.
+    """
+
+    __slots__ = ("counts", "heap")
+
+    def __init__(self, modifiers: List[Dict[str, Any]]):
+        self.counts: Dict[Tuple[str, str], int] = {}
+        self.heap: List[Tuple[int, str, str]] = []
+        for modifier in modifiers:
+            self.add(modifier, push=False)
+        heapq.heapify(self.heap)
+
+    def add(self, modifier: Any, push: bool = True) -> None:
+        """Registra um modificador (push=False adia a ordenação do heap)."""
+        if not isinstance(modifier, dict):
+            return
+        key = (modifier.get("skill"), modifier.get("type"))
+        self.counts[key] = self.counts.get(key, 0) + 1
+        expires_at = modifier.get("expires_at")
+        if isinstance(expires_at, int):
+            entry = (expires_at,) + key
+            if push:
+                heapq.heappush(self.heap, entry)
+            else:
+                self.heap.append(entry)
+
+    def discard(self, modifier: Any) -> None:
+        """Remove um modificador das contagens."""
+        if not isinstance(modifier, dict):
+            return
+        key = (modifier.get("skill"), modifier.get("type"))
+        count = self.counts.get(key, 0) - 1
+        if count > 0:
+            self.counts[key] = count
+        else:
+            self.counts.pop(key, None)
+
+
+class CharacterSnapshot:
+    """
+    Token imutável de Character.snapshot().
+
+    Guarda apenas referências às seções da ficha no momento da captura; as
+    seções são compartilhadas até que alguma instância as altere.
+    """
+
+    __slots__ = ("_sections",)
+
+    def __init__(self, sheet: Dict[str, Any]):
+        self._sections = tuple(sheet.items())
+
+    def __repr__(self) -> str:
+        return f"CharacterSnapshot(sections={len(self._sections)})"
 
 
 class Character:
@@ -23,8 +158,13 @@ class Character:
     saúde, dano e histórico de ações.
     """
     
+    # Sem __dict__ por instância: forks e simulações mantêm muitos personagens
+    __slots__ = ("_rng", "_dice", "_sheet", "_owned", "_undo_log", "_savepoints", "_check_index",
+                 "_modifier_index", "_inventory_view", "_version", "_versions")
+    
     def __init__(self, name: str = "Character Name", occupation: Optional[str] = None, 
-                 age: int = 30, backstory: str = ""):
+                 age: int = 30, backstory: str = "", rng: Optional[random.Random] = None,
+                 dice_engine: Optional[Any] = None):
         """
         Inicializa um novo personagem.
         
@@ -33,19 +173,43 @@ class Character:
             occupation: Ocupação do personagem (Police Officer, Social Worker, Nurse)
             age: Idade do personagem
             backstory: História de fundo do personagem
+            rng: Gerador aleatório dedicado (padrão: módulo global random)
+            dice_engine: Backend de rolagens D100 (padrão: ScalarDiceEngine sobre rng;
+                         use dice_engine.NumpyDiceEngine para simulações em lote)
         """
+        self._rng = rng if rng is not None else random
+        self._dice = dice_engine if dice_engine is not None else ScalarDiceEngine(self._rng)
         self._sheet = self._create_base_sheet()
+        # Seções da ficha exclusivas desta instância (as demais são
+        # compartilhadas com snapshots/forks e copiadas antes de alterar)
+        self._owned = set(self._sheet)
+        # Undo log das transações (entradas de _record) e início de cada
+        # transação aninhada no log
+        self._undo_log: List[Tuple] = []
+        self._savepoints: List[int] = []
+        # Índice nome -> (seção, tipo) para rolagens por nome (construído sob demanda)
+        self._check_index: Optional[Dict[str, Tuple[str, Optional[str]]]] = None
+        # Índice de modificadores por habilidade e heap de expirações (sob demanda)
+        self._modifier_index: Optional[_ModifierIndex] = None
+        # Visão somente leitura do inventário para renderização (sob demanda)
+        self._inventory_view: Optional[MappingProxyType] = None
+        # Contador de alterações e versão (último valor do contador) de cada seção
+        self._version = 0
+        self._versions: Dict[str, int] = {}
 
     def set_occupation(self, occupation: str):
         """
         Define a ocupação do personagem e ajusta os atributos e habilidades
         correspondentes.
         """
-        self.sheet["info"]["occupation"] = occupation
+        self._record("info", "occupation")
+        self._record("info", "name")
+        info = self._writable("info")
+        info["occupation"] = occupation
         print(f"Setting occupation to {occupation}")
 
         if occupation == "Police Officer":
-            self.sheet["info"]["name"] = "Officer John Doe"
+            info["name"] = "Officer John Doe"
             self.set_characteristic("STR", 65)
             self.set_characteristic("CON", 60)
             self.set_characteristic("DEX", 55)
@@ -58,7 +222,7 @@ class Character:
             self.set_skill("Firearms", 65, "combat")
             self.set_skill("Law", 70, "expert")
         elif occupation == "Social Worker":
-            self.sheet["info"]["name"] = "Social Worker Jane Smith"
+            info["name"] = "Social Worker Jane Smith"
             self.set_characteristic("STR", 50)
             self.set_characteristic("CON", 55)
             self.set_characteristic("DEX", 50)
@@ -68,7 +232,7 @@ class Character:
             self.set_skill("Research", 60, "common")
             self.set_skill("Social", 70, "common")
         elif occupation == "Nurse":
-            self.sheet["info"]["name"] = "Nurse Emily Davis"
+            info["name"] = "Nurse Emily Davis"
             self.set_characteristic("STR", 50)
             self.set_characteristic("CON", 60)
             self.set_characteristic("DEX", 60)
@@ -79,7 +243,7 @@ class Character:
             self.set_skill("Social", 60, "common")
             self.set_skill("Medicine", 70, "expert")
         
-        self.set_magic_points(random.randint(1, 10) + random.randint(1, 10) +50)        
+        self.set_magic_points(self._rng.randint(1, 10) + self._rng.randint(1, 10) +50)        
 
         self.init_luck()
         
@@ -89,10 +253,13 @@ class Character:
         """
         Inicializa a sorte do personagem com base na regra: 50 + 2d10.
         """
-        luck_roll = random.randint(1, 10) + random.randint(1, 10)
+        luck_roll = self._rng.randint(1, 10) + self._rng.randint(1, 10)
         starting_luck = 50 + luck_roll
-        self._sheet["resources"]["luck"]["starting"] = starting_luck
-        self._sheet["resources"]["luck"]["current"] = starting_luck
+        self._record("resources", "luck", "starting")
+        self._record("resources", "luck", "current")
+        luck = self._writable("resources")["luck"]
+        luck["starting"] = starting_luck
+        luck["current"] = starting_luck
 
     def _create_base_sheet(self) -> Dict[str, Any]:
         """
@@ -128,12 +295,13 @@ class Character:
                 "expert": {}
             },
             "status": {
-                "damage_levels": ["Healthy", "Hurt", "Bloodied", "Down", "Impaired"],
+                "damage_levels": DAMAGE_LEVELS,
                 "damage_taken": 0,
+                "turn": 0,
                 "modifiers": []  # e.g., {"skill": "Fighting", "type": "penalty_dice", "duration": "scene"}
             },
-            "inventory": {"equipment": [], "weapons": []},
-            "page_history": []
+            "inventory": {"equipment": Counter(), "weapons": Counter()},  # item -> quantidade
+            "page_history": HistoryBuffer(HISTORY_CAPACITY)
         }
     
     # Propriedades para acesso fácil aos dados principais
@@ -157,14 +325,27 @@ class Character:
         """História de fundo do personagem."""
         return self._sheet["info"]["backstory"]
     
+    @property
+    def turn(self) -> int:
+        """Turno atual (base das expirações de modificadores)."""
+        return self._sheet["status"].get("turn", 0)
+    
     @property
     def sheet(self) -> Dict[str, Any]:
         """
         Acesso direto à ficha completa (para compatibilidade).
         
+        Como o chamador pode alterar a ficha diretamente, todas as seções
+        compartilhadas com snapshots são copiadas antes do acesso.
+        
         Returns:
             Dicionário completo da ficha do personagem
         """
+        for section in list(self._sheet):
+            self._writable(section)
+        self._check_index = None
+        self._modifier_index = None
+        self._inventory_view = None
         return self._sheet
     
     def get_characteristic(self, char_name: str) -> Dict[str, int]:
@@ -325,7 +506,8 @@ class Character:
             }
         
         old_value = self._sheet["resources"]["luck"]["current"]
-        self._sheet["resources"]["luck"]["current"] -= amount
+        self._record("resources", "luck", "current")
+        self._writable("resources")["luck"]["current"] -= amount
         
         return {
             "success": True,
@@ -361,7 +543,8 @@ class Character:
             }
         
         old_value = self._sheet["resources"]["magic_pts"]["current"]
-        self._sheet["resources"]["magic_pts"]["current"] -= amount
+        self._record("resources", "magic_pts", "current")
+        self._writable("resources")["magic_pts"]["current"] -= amount
         
         return {
             "success": True,
@@ -384,7 +567,8 @@ class Character:
         starting = self._sheet["resources"]["luck"]["starting"]
         
         # Não pode exceder o valor inicial
-        self._sheet["resources"]["luck"]["current"] = min(current + amount, starting)
+        self._record("resources", "luck", "current")
+        self._writable("resources")["luck"]["current"] = min(current + amount, starting)
     
     def restore_magic(self, amount: int) -> None:
         """
@@ -400,7 +584,8 @@ class Character:
         starting = self._sheet["resources"]["magic_pts"]["starting"]
         
         # Não pode exceder o valor inicial
-        self._sheet["resources"]["magic_pts"]["current"] = min(current + amount, starting)
+        self._record("resources", "magic_pts", "current")
+        self._writable("resources")["magic_pts"]["current"] = min(current + amount, starting)
     
     def set_magic_points(self, starting_value: int) -> None:
         """
@@ -412,8 +597,11 @@ class Character:
         if starting_value < 0:
             starting_value = 0
         
-        self._sheet["resources"]["magic_pts"]["starting"] = starting_value
-        self._sheet["resources"]["magic_pts"]["current"] = starting_value
+        self._record("resources", "magic_pts", "starting")
+        self._record("resources", "magic_pts", "current")
+        magic = self._writable("resources")["magic_pts"]
+        magic["starting"] = starting_value
+        magic["current"] = starting_value
     
     # Métodos de validação
     def validate_characteristic_value(self, value: int) -> int:
@@ -468,10 +656,12 @@ class Character:
         old_value = self._sheet["characteristics"][char_name]["full"]
         half_value = validated_value // 2
         
-        self._sheet["characteristics"][char_name] = {
+        self._record("characteristics", char_name)
+        self._writable("characteristics")[char_name] = {
             "full": validated_value,
             "half": half_value
         }
+        self._update_check_index(char_name)
         
         return {
             "success": True,
@@ -514,10 +704,12 @@ class Character:
         
         half_value = validated_value // 2
         
-        self._sheet["skills"][skill_type][skill_name] = {
+        self._record("skills", skill_type, skill_name)
+        self._writable("skills")[skill_type][skill_name] = {
             "full": validated_value,
             "half": half_value
         }
+        self._update_check_index(skill_name)
         
         return {
             "success": True,
@@ -540,29 +732,7 @@ class Character:
         Returns:
             Resultado da rolagem (1-100)
         """
-        tens_roll_1 = random.randint(0, 9) * 10
-        tens_roll_2 = random.randint(0, 9) * 10
-        units_roll = random.randint(1, 10)
-        
-        # Bonus e penalty dice se anulam
-        if bonus_dice and penalty_dice:
-            bonus_dice = False
-            penalty_dice = False
-        
-        if bonus_dice:
-            final_tens = min(tens_roll_1, tens_roll_2)
-        elif penalty_dice:
-            final_tens = max(tens_roll_1, tens_roll_2)
-        else:
-            final_tens = tens_roll_1
-        
-        # Calcula resultado final
-        if final_tens == 0 and units_roll == 10:
-            return 100
-        elif final_tens == 0:
-            return units_roll
-        else:
-            return final_tens + (units_roll % 10)
+        return self._dice.roll_d100(bonus_dice, penalty_dice)
     
     def _evaluate_roll_result(self, roll: int, target_value: int, half_value: int) -> tuple[int, str]:
         """
@@ -588,9 +758,37 @@ class Character:
         
         return (2, "Failure")
     
+    def _skill_roll_parameters(self, skill_data: Dict[str, int], skill_name: str, skill_type: str,
+                               bonus_dice: bool, penalty_dice: bool, difficulty: str,
+                               auto_apply_modifiers: bool) -> Tuple[int, int, bool, bool]:
+        """
+        Calcula alvo, metade e dados extras finais de uma rolagem de habilidade.
+        
+        Returns:
+            Tupla (target_value, half_value, bonus_dice, penalty_dice)
+        """
+        # Verificar modificadores se habilitado
+        final_bonus_dice = bonus_dice
+        final_penalty_dice = penalty_dice
+        
+        if auto_apply_modifiers:
+            modifiers = self.check_skill_modifiers(skill_name, skill_type)
+            
+            # Aplicar modificadores (bonus e penalty se cancelam)
+            if modifiers["has_bonus"] and not modifiers["has_penalty"]:
+                final_bonus_dice = True
+            elif modifiers["has_penalty"] and not modifiers["has_bonus"]:
+                final_penalty_dice = True
+            # Se ambos existem, se cancelam (mantém valores originais)
+        
+        # Determinar valores alvo baseado na dificuldade
+        target_value, half_value = difficulty_targets(skill_data["full"], skill_data["half"], difficulty)
+        return target_value, half_value, final_bonus_dice, final_penalty_dice
+
     def roll_skill(self, skill_name: str, skill_type: str = "common", 
                    bonus_dice: bool = False, penalty_dice: bool = False, 
-                   difficulty: str = "regular", auto_apply_modifiers: bool = True) -> Dict[str, Any]:
+                   difficulty: str = "regular", auto_apply_modifiers: bool = True,
+                   report_odds: bool = False) -> Dict[str, Any]:
         """
         Executa uma rolagem de habilidade.
         
@@ -601,6 +799,7 @@ class Character:
             penalty_dice: Se True, aplica penalty dice
             difficulty: Dificuldade do teste ("regular", "hard")
             auto_apply_modifiers: Se True, aplica modificadores automaticamente
+            report_odds: Se True, inclui em 'odds' a distribuição exata dos níveis
             
         Returns:
             Dicionário com resultado da rolagem
@@ -614,33 +813,22 @@ class Character:
             }
             print(f"Erro ao buscar habilidade: {e}")
         
-        # Verificar modificadores se habilitado
-        final_bonus_dice = bonus_dice
-        final_penalty_dice = penalty_dice
-        
-        if auto_apply_modifiers:
-            modifiers = self.check_skill_modifiers(skill_name, skill_type)
-            
-            # Aplicar modificadores (bonus e penalty se cancelam)
-            if modifiers["has_bonus"] and not modifiers["has_penalty"]:
-                final_bonus_dice = True
-            elif modifiers["has_penalty"] and not modifiers["has_bonus"]:
-                final_penalty_dice = True
-            # Se ambos existem, se cancelam (mantém valores originais)
-        
-        # Determinar valores alvo baseado na dificuldade
-        if difficulty == "hard":
-            target_value = skill_data["half"]
-            half_value = target_value // 2
-        else:  # regular
-            target_value = skill_data["full"]
-            half_value = skill_data["half"]
+        return self._roll_skill_data(skill_data, skill_name, skill_type, bonus_dice, penalty_dice,
+                                     difficulty, auto_apply_modifiers, report_odds)
+    
+    def _roll_skill_data(self, skill_data: Dict[str, int], skill_name: str, skill_type: Optional[str],
+                         bonus_dice: bool, penalty_dice: bool, difficulty: str,
+                         auto_apply_modifiers: bool, report_odds: bool) -> Dict[str, Any]:
+        """Executa a rolagem de habilidade sobre valores já obtidos (ver roll_skill)."""
+        target_value, half_value, final_bonus_dice, final_penalty_dice = self._skill_roll_parameters(
+            skill_data, skill_name, skill_type, bonus_dice, penalty_dice, difficulty, auto_apply_modifiers
+        )
         
         # Executar rolagem
         roll = self._make_d100_roll(final_bonus_dice, final_penalty_dice)
         level, description = self._evaluate_roll_result(roll, target_value, half_value)
         
-        return {
+        result = {
             "success": True,
             "skill": skill_name,
             "skill_type": skill_type,
@@ -654,9 +842,133 @@ class Character:
             "penalty_dice": final_penalty_dice,
             "modifiers_applied": auto_apply_modifiers
         }
+        if report_odds:
+            result["odds"] = success_level_distribution(target_value, half_value, final_bonus_dice, final_penalty_dice)
+        return result
+    
+    # Índice de rolagens por nome
+    def _build_check_index(self) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Constrói o índice nome -> (seção, tipo) a partir da ficha."""
+        index: Dict[str, Tuple[str, Optional[str]]] = {}
+        for char_name in self._sheet["characteristics"]:
+            index[char_name] = ("characteristics", None)
+        # Mesma precedência da antiga cadeia de fallback: common > combat > expert > característica
+        for skill_type in ("expert", "combat", "common"):
+            for skill_name in self._sheet["skills"].get(skill_type, {}):
+                index[skill_name] = ("skills", skill_type)
+        self._check_index = index
+        return index
+    
+    def _update_check_index(self, name: str) -> None:
+        """Atualiza a entrada de um nome após set_skill/set_characteristic/gain_skill."""
+        if self._check_index is None:
+            return
+        skills = self._sheet["skills"]
+        for skill_type in ("common", "combat", "expert"):
+            if name in skills.get(skill_type, {}):
+                self._check_index[name] = ("skills", skill_type)
+                return
+        if name in self._sheet["characteristics"]:
+            self._check_index[name] = ("characteristics", None)
+    
+    def resolve_check(self, name: str) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Resolve um nome de teste em uma única consulta ao índice.
+        
+        Args:
+            name: Nome da habilidade ou característica
+            
+        Returns:
+            ("skills", tipo) ou ("characteristics", None); None se não existir
+        """
+        index = self._check_index
+        if index is None:
+            index = self._build_check_index()
+        return index.get(name)
+    
+    def roll_check(self, name: str, bonus_dice: bool = False, penalty_dice: bool = False,
+                   difficulty: str = "regular", auto_apply_modifiers: bool = True,
+                   report_odds: bool = False) -> Dict[str, Any]:
+        """
+        Rola um teste pelo nome, seja habilidade de qualquer tipo ou característica.
+        
+        O nome é resolvido por resolve_check, sem exceções nem mensagens. Nomes
+        inexistentes usam o valor padrão 50/50 de roll_skill, com "untrained": True.
+        
+        Args:
+            name: Nome da habilidade ou característica
+            bonus_dice: Se True, aplica bonus dice
+            penalty_dice: Se True, aplica penalty dice
+            difficulty: Dificuldade do teste ("regular", "hard")
+            auto_apply_modifiers: Se True, aplica modificadores de habilidade
+            report_odds: Se True, inclui em 'odds' a distribuição exata dos níveis
+            
+        Returns:
+            Dicionário com resultado da rolagem (mesmo formato de roll_skill/roll_characteristic)
+        """
+        entry = self.resolve_check(name)
+        if entry is None:
+            result = self._roll_skill_data({"full": 50, "half": 50}, name, None, bonus_dice, penalty_dice,
+                                           difficulty, auto_apply_modifiers, report_odds)
+            result["untrained"] = True
+            return result
+        
+        section, skill_type = entry
+        if section == "characteristics":
+            return self.roll_characteristic(name, bonus_dice, penalty_dice, difficulty, report_odds)
+        return self._roll_skill_data(self._sheet["skills"][skill_type][name], name, skill_type,
+                                     bonus_dice, penalty_dice, difficulty, auto_apply_modifiers, report_odds)
+    
+    def roll_skill_batch(self, skill_name: str, n: int, skill_type: str = "common",
+                         bonus_dice: bool = False, penalty_dice: bool = False,
+                         difficulty: str = "regular", auto_apply_modifiers: bool = True) -> Dict[str, Any]:
+        """
+        Executa N rolagens da mesma habilidade de uma vez pelo backend de dados.
+        
+        Com NumpyDiceEngine, rolagens e níveis são arrays NumPy gerados de forma
+        vetorizada. Não consome modificadores nem altera a ficha.
+        
+        Args:
+            skill_name: Nome da habilidade
+            n: Número de rolagens
+            skill_type: Tipo da habilidade ("common", "combat", "expert")
+            bonus_dice: Se True, aplica bonus dice
+            penalty_dice: Se True, aplica penalty dice
+            difficulty: Dificuldade do teste ("regular", "hard")
+            auto_apply_modifiers: Se True, aplica modificadores automaticamente
+            
+        Returns:
+            Dicionário com 'rolls', 'levels' e 'level_counts' (nível → quantidade)
+        """
+        try:
+            skill_data = self.get_skill(skill_name, skill_type)
+        except KeyError:
+            skill_data = {"full": 50, "half": 50}
+        
+        target_value, half_value, final_bonus_dice, final_penalty_dice = self._skill_roll_parameters(
+            skill_data, skill_name, skill_type, bonus_dice, penalty_dice, difficulty, auto_apply_modifiers
+        )
+        
+        rolls = self._dice.roll_d100_batch(n, final_bonus_dice, final_penalty_dice)
+        levels = self._dice.evaluate_levels(rolls, target_value, half_value)
+        
+        return {
+            "success": True,
+            "skill": skill_name,
+            "skill_type": skill_type,
+            "difficulty": difficulty,
+            "target": target_value,
+            "half_target": half_value,
+            "bonus_dice": final_bonus_dice,
+            "penalty_dice": final_penalty_dice,
+            "rolls": rolls,
+            "levels": levels,
+            "level_counts": self._dice.count_levels(levels)
+        }
     
     def roll_characteristic(self, char_name: str, bonus_dice: bool = False, 
-                           penalty_dice: bool = False, difficulty: str = "regular") -> Dict[str, Any]:
+                           penalty_dice: bool = False, difficulty: str = "regular",
+                           report_odds: bool = False) -> Dict[str, Any]:
         """
         Executa uma rolagem de característica.
         
@@ -665,6 +977,7 @@ class Character:
             bonus_dice: Se True, aplica bonus dice
             penalty_dice: Se True, aplica penalty dice
             difficulty: Dificuldade do teste ("regular", "hard")
+            report_odds: Se True, inclui em 'odds' a distribuição exata dos níveis
             
         Returns:
             Dicionário com resultado da rolagem
@@ -682,18 +995,13 @@ class Character:
             }
         
         # Determinar valores alvo baseado na dificuldade
-        if difficulty == "hard":
-            target_value = char_data["half"]
-            half_value = target_value // 2
-        else:  # regular
-            target_value = char_data["full"]
-            half_value = char_data["half"]
+        target_value, half_value = difficulty_targets(char_data["full"], char_data["half"], difficulty)
         
         # Executar rolagem
         roll = self._make_d100_roll(bonus_dice, penalty_dice)
         level, description = self._evaluate_roll_result(roll, target_value, half_value)
         
-        return {
+        result = {
             "success": True,
             "characteristic": char_name,
             "difficulty": difficulty,
@@ -705,14 +1013,19 @@ class Character:
             "bonus_dice": bonus_dice,
             "penalty_dice": penalty_dice
         }
+        if report_odds:
+            result["odds"] = success_level_distribution(target_value, half_value, bonus_dice, penalty_dice)
+        return result
     
-    def roll_luck(self, bonus_dice: bool = False, penalty_dice: bool = False) -> Dict[str, Any]:
+    def roll_luck(self, bonus_dice: bool = False, penalty_dice: bool = False,
+                  report_odds: bool = False) -> Dict[str, Any]:
         """
         Executa uma rolagem de sorte.
         
         Args:
             bonus_dice: Se True, aplica bonus dice
             penalty_dice: Se True, aplica penalty dice
+            report_odds: Se True, inclui em 'odds' a distribuição exata dos níveis
             
         Returns:
             Dicionário com resultado da rolagem
@@ -725,7 +1038,7 @@ class Character:
         roll = self._make_d100_roll(bonus_dice, penalty_dice)
         level, description = self._evaluate_roll_result(roll, target_value, half_value)
         
-        return {
+        result = {
             "success": True,
             "type": "luck",
             "roll": roll,
@@ -736,6 +1049,107 @@ class Character:
             "bonus_dice": bonus_dice,
             "penalty_dice": penalty_dice
         }
+        if report_odds:
+            result["odds"] = success_level_distribution(target_value, half_value, bonus_dice, penalty_dice)
+        return result
+
+    # Probabilidades exatas (sem simulação)
+    def skill_odds(self, skill_name: str, skill_type: str = "common", bonus_dice: bool = False,
+                   penalty_dice: bool = False, difficulty: str = "regular",
+                   auto_apply_modifiers: bool = True) -> Dict[int, float]:
+        """
+        Distribuição exata dos níveis de sucesso de roll_skill com os mesmos parâmetros.
+        
+        Args:
+            skill_name: Nome da habilidade
+            skill_type: Tipo da habilidade ("common", "combat", "expert")
+            bonus_dice: Se True, aplica bonus dice
+            penalty_dice: Se True, aplica penalty dice
+            difficulty: Dificuldade do teste ("regular", "hard")
+            auto_apply_modifiers: Se True, considera os modificadores ativos
+            
+        Returns:
+            Dicionário nível (5-1) → probabilidade
+        """
+        try:
+            skill_data = self.get_skill(skill_name, skill_type)
+        except KeyError:
+            # Mesmo valor padrão usado por roll_skill
+            skill_data = {"full": 50, "half": 50}
+        
+        target_value, half_value, final_bonus_dice, final_penalty_dice = self._skill_roll_parameters(
+            skill_data, skill_name, skill_type, bonus_dice, penalty_dice, difficulty, auto_apply_modifiers
+        )
+        return success_level_distribution(target_value, half_value, final_bonus_dice, final_penalty_dice)
+
+    def characteristic_odds(self, char_name: str, bonus_dice: bool = False, penalty_dice: bool = False,
+                            difficulty: str = "regular") -> Dict[int, float]:
+        """
+        Distribuição exata dos níveis de sucesso de roll_characteristic.
+        
+        Args:
+            char_name: Nome da característica (STR, CON, DEX, INT, POW)
+            bonus_dice: Se True, aplica bonus dice
+            penalty_dice: Se True, aplica penalty dice
+            difficulty: Dificuldade do teste ("regular", "hard")
+            
+        Returns:
+            Dicionário nível (5-1) → probabilidade
+        """
+        char_data = self.get_characteristic(char_name)
+        return success_level_distribution(char_data["full"], char_data["half"], bonus_dice, penalty_dice, difficulty)
+
+    def luck_odds(self, bonus_dice: bool = False, penalty_dice: bool = False) -> Dict[int, float]:
+        """
+        Distribuição exata dos níveis de sucesso de roll_luck com a sorte atual.
+        
+        Args:
+            bonus_dice: Se True, aplica bonus dice
+            penalty_dice: Se True, aplica penalty dice
+            
+        Returns:
+            Dicionário nível (5-1) → probabilidade
+        """
+        current_luck = self._sheet["resources"]["luck"]["current"]
+        return success_level_distribution(current_luck, current_luck // 2, bonus_dice, penalty_dice)
+
+    def opposed_roll_odds(self, my_skill: str, my_skill_type: str = "common",
+                          opponent_skill_full: int = 30, opponent_skill_half: int = 15,
+                          my_bonus_dice: bool = False, my_penalty_dice: bool = False) -> Dict[str, float]:
+        """
+        Probabilidades exatas de opposed_roll com os mesmos parâmetros.
+        
+        Args:
+            my_skill: Nome da minha habilidade
+            my_skill_type: Tipo da minha habilidade
+            opponent_skill_full: Valor full da habilidade do oponente
+            opponent_skill_half: Valor half da habilidade do oponente
+            my_bonus_dice: Se True, aplica bonus dice para mim
+            my_penalty_dice: Se True, aplica penalty dice para mim
+            
+        Returns:
+            Dicionário com probabilidades de 'win', 'lose' e 'draw'
+        """
+        try:
+            skill_data = self.get_skill(my_skill, my_skill_type)
+        except KeyError:
+            # Mesmo valor padrão usado por roll_skill
+            skill_data = {"full": 50, "half": 50}
+        
+        target_value, half_value, final_bonus_dice, final_penalty_dice = self._skill_roll_parameters(
+            skill_data, my_skill, my_skill_type, my_bonus_dice, my_penalty_dice, "regular", True
+        )
+        if final_bonus_dice and final_penalty_dice:
+            final_bonus_dice = final_penalty_dice = False
+        
+        # Valores no formato padrão (half = full // 2) usam a tabela pré-calculada
+        if half_value == target_value // 2 and opponent_skill_half == opponent_skill_full // 2 \
+                and 0 <= target_value <= 100 and 0 <= opponent_skill_full <= 100:
+            modifier = "bonus" if final_bonus_dice else "penalty" if final_penalty_dice else "none"
+            return OPPOSED_ROLL_TABLE.lookup(target_value, opponent_skill_full, modifier)
+        
+        return opposed_roll_distribution(target_value, half_value, opponent_skill_full, opponent_skill_half,
+                                         final_bonus_dice, final_penalty_dice)
     
     def opposed_roll(self, my_skill: str, my_skill_type: str = "common",
                     opponent_skill_full: int = 30, opponent_skill_half: int = 15,
@@ -823,7 +1237,7 @@ class Character:
             "damage_taken": damage_taken,
             "current_level": current_level,
             "level_index": level_index,
-            "damage_levels": damage_levels.copy(),
+            "damage_levels": list(damage_levels),
             "is_alive": current_level != "Impaired",
             "is_healthy": damage_taken == 0,
             "max_damage": len(damage_levels) - 1
@@ -859,7 +1273,8 @@ class Character:
         old_status = self.get_health_status()
         
         # Aplicar dano
-        self._sheet["status"]["damage_taken"] += amount
+        self._record("status", "damage_taken")
+        self._writable("status")["damage_taken"] += amount
         
         # Estado atual
         new_status = self.get_health_status()
@@ -900,7 +1315,8 @@ class Character:
         # Aplicar cura (não pode ficar negativo)
         old_damage = self._sheet["status"]["damage_taken"]
         actual_heal = min(amount, old_damage)
-        self._sheet["status"]["damage_taken"] = max(0, old_damage - amount)
+        self._record("status", "damage_taken")
+        self._writable("status")["damage_taken"] = max(0, old_damage - amount)
         
         # Estado atual
         new_status = self.get_health_status()
@@ -931,7 +1347,9 @@ class Character:
         Args:
             skill: Nome da habilidade
             modifier_type: Tipo do modificador ("bonus_dice" ou "penalty_dice")
-            duration: Duração em número de usos
+            duration: Duração em turnos, contados a partir do próximo turno: o
+                modificador vale no turno atual e nos 'duration' seguintes
+                (expira em advance_turn)
             
         Returns:
             Dicionário com resultado da operação
@@ -952,10 +1370,14 @@ class Character:
         modifier = {
             "skill": skill,
             "type": modifier_type,
-            "duration": duration
+            "duration": duration,
+            "expires_at": self._sheet["status"].get("turn", 0) + duration + 1
         }
         
-        self._sheet["status"]["modifiers"].append(modifier)
+        self._record_append("status", "modifiers")
+        self._writable("status")["modifiers"].append(modifier)
+        if self._modifier_index is not None:
+            self._modifier_index.add(modifier)
         
         return {
             "success": True,
@@ -974,17 +1396,9 @@ class Character:
         Returns:
             Dicionário com status dos modificadores
         """
-        modifiers = self._sheet["status"]["modifiers"]
-        
-        has_bonus = any(
-            mod.get("skill") == skill_name and mod.get("type") == "bonus_dice"
-            for mod in modifiers if isinstance(mod, dict)
-        )
-        
-        has_penalty = any(
-            mod.get("skill") == skill_name and mod.get("type") == "penalty_dice"
-            for mod in modifiers if isinstance(mod, dict)
-        )
+        counts = self._modifiers().counts
+        has_bonus = (skill_name, "bonus_dice") in counts
+        has_penalty = (skill_name, "penalty_dice") in counts
         
         return {
             "has_bonus": has_bonus,
@@ -994,48 +1408,6 @@ class Character:
             "cancelled": has_bonus and has_penalty
         }
     
-    def reduce_modifier_duration(self, skill_name: str, modifier_type: str) -> Dict[str, Any]:
-        """
-        Reduz a duração de um modificador específico.
-        
-        Args:
-            skill_name: Nome da habilidade
-            modifier_type: Tipo do modificador
-            
-        Returns:
-            Dicionário com resultado da operação
-        """
-        modifiers = self._sheet["status"]["modifiers"]
-        found = False
-        
-        for i, mod in enumerate(modifiers):
-            if (isinstance(mod, dict) and 
-                mod.get("skill") == skill_name and 
-                mod.get("type") == modifier_type):
-                
-                mod["duration"] -= 1
-                found = True
-                
-                # Remove se duração chegou a 0
-                if mod["duration"] <= 0:
-                    modifiers.pop(i)
-                    return {
-                        "success": True,
-                        "modifier_removed": True,
-                        "remaining_duration": 0
-                    }
-                else:
-                    return {
-                        "success": True,
-                        "modifier_removed": False,
-                        "remaining_duration": mod["duration"]
-                    }
-        
-        return {
-            "success": False,
-            "error": f"Modificador {modifier_type} para {skill_name} não encontrado"
-        }
-    
     def clear_modifiers(self, skill_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Remove modificadores. Se skill_name for None, remove todos.
@@ -1046,10 +1418,15 @@ class Character:
         Returns:
             Dicionário com resultado da operação
         """
+        # A seção precisa ser exclusiva antes do registro no undo log: um
+        # rollback não pode devolver a lista compartilhada com forks/snapshots
+        status = self._writable("status")
         if skill_name is None:
             # Remove todos os modificadores
-            count = len(self._sheet["status"]["modifiers"])
-            self._sheet["status"]["modifiers"] = []
+            count = len(status["modifiers"])
+            self._record("status", "modifiers")
+            status["modifiers"] = []
+            self._modifier_index = None
             return {
                 "success": True,
                 "modifiers_removed": count,
@@ -1057,15 +1434,17 @@ class Character:
             }
         else:
             # Remove modificadores de uma habilidade específica
-            modifiers = self._sheet["status"]["modifiers"]
+            modifiers = status["modifiers"]
             original_count = len(modifiers)
             
-            self._sheet["status"]["modifiers"] = [
+            self._record("status", "modifiers")
+            status["modifiers"] = [
                 mod for mod in modifiers 
                 if not (isinstance(mod, dict) and mod.get("skill") == skill_name)
             ]
+            self._modifier_index = None
             
-            removed_count = original_count - len(self._sheet["status"]["modifiers"])
+            removed_count = original_count - len(status["modifiers"])
             
             return {
                 "success": True,
@@ -1073,10 +1452,68 @@ class Character:
                 "skill": skill_name
             }
     
+    def _modifiers(self) -> _ModifierIndex:
+        """Índice de modificadores (reconstruído a partir da ficha quando invalidado)."""
+        if self._modifier_index is None:
+            self._modifier_index = _ModifierIndex(self._sheet["status"]["modifiers"])
+        return self._modifier_index
+    
+    def advance_turn(self, turns: int = 1) -> Dict[str, Any]:
+        """
+        Avança o contador de turnos e remove os modificadores expirados.
+        
+        As expirações vêm do topo do min-heap: turnos sem expiração custam O(1)
+        independentemente do número de modificadores ativos, e cada entrada
+        vencida remove apenas o seu modificador.
+        
+        Args:
+            turns: Número de turnos a avançar
+            
+        Returns:
+            Dicionário com o turno atual e os modificadores expirados
+        """
+        if not isinstance(turns, int) or turns <= 0:
+            return {
+                "success": False,
+                "error": "Número de turnos deve ser um inteiro positivo"
+            }
+        
+        self._record("status", "turn")
+        status = self._writable("status")
+        turn = status.get("turn", 0) + turns
+        status["turn"] = turn
+        
+        index = self._modifiers()
+        heap = index.heap
+        if not heap or heap[0][0] > turn:
+            return {"success": True, "turn": turn, "expired": []}
+        
+        modifiers = status["modifiers"]
+        expired = []
+        while heap and heap[0][0] <= turn:
+            entry = heapq.heappop(heap)
+            if entry[1:] not in index.counts:
+                continue
+            # Remove o primeiro modificador correspondente à entrada vencida
+            for position, mod in enumerate(modifiers):
+                if (isinstance(mod, dict) and mod.get("expires_at") == entry[0]
+                        and (mod.get("skill"), mod.get("type")) == entry[1:]):
+                    if not expired:
+                        self._record("status", "modifiers", copy_value=True)
+                    del modifiers[position]
+                    index.discard(mod)
+                    expired.append(mod)
+                    break
+        
+        return {"success": True, "turn": turn, "expired": expired}
+    
     # Sistema de efeitos
+    # Cada ação tem um handler em _EFFECT_HANDLERS (definido após os handlers).
+    # Os campos obrigatórios são conferidos uma única vez por validate_effect,
+    # no carregamento do conteúdo; os handlers assumem efeitos válidos.
     def apply_effect(self, effect: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Aplica um único efeito ao personagem.
+        Valida e aplica um único efeito ao personagem.
         
         Args:
             effect: Dicionário com o efeito a ser aplicado
@@ -1084,217 +1521,199 @@ class Character:
         Returns:
             Dicionário com resultado da aplicação do efeito
         """
-        if not isinstance(effect, dict):
+        validation = self.validate_effect(effect)
+        if not validation["valid"]:
             return {
                 "success": False,
-                "error": f"Efeito deve ser um dicionário, recebido: {type(effect)}"
+                "error": validation["error"]
             }
+        return self._dispatch_effect(effect)
+    
+    def apply_effects(self, effects: List[Dict[str, Any]], atomic: bool = False) -> Dict[str, Any]:
+        """
+        Valida e processa uma lista de efeitos, modificando o estado do personagem.
         
-        action = effect.get("action")
-        if not action:
-            return {
-                "success": False,
-                "error": f"Efeito sem campo 'action': {effect}"
-            }
+        Efeitos inválidos contam como falha e não interrompem os demais. Com
+        atomic=True os efeitos são aplicados em uma transação: se algum
+        falhar, todos são desfeitos ("rolled_back" no resultado).
+        """
+        return self._apply_effect_list(effects, atomic, validate=True)
+    
+    def apply_validated_effects(self, effects, atomic: bool = False) -> Dict[str, Any]:
+        """
+        Aplica efeitos já validados (ex.: planos compilados no carregamento),
+        sem revalidar cada efeito.
         
-        # Processar cada tipo de ação
-        if action == "take_damage":
-            amount = effect.get("amount", 0)
-            return self.take_damage(amount)
-            
-        elif action == "heal_damage":
-            amount = effect.get("amount", 0)
-            return self.heal_damage(amount)
-            
-        elif action == "spend_luck":
-            amount = effect.get("amount", 0)
-            return self.spend_luck(amount)
-            
-        elif action == "spend_magic":
-            amount = effect.get("amount", 0)
-            return self.spend_magic(amount)
-            
-        elif action == "gain_skill":
-            skill_name = effect.get("skill")
-            if not skill_name or not isinstance(skill_name, str):
-                return {
-                    "success": False,
-                    "error": f"Nome de skill inválido: {skill_name}"
-                }
+        Args:
+            effects: Sequência de efeitos aprovados por validate_effect
+            atomic: Desfaz todos os efeitos se algum falhar
             
-            # Adicionar skill se não existir (valor padrão 60/30)
-            skill_type = effect.get("skill_type", "common")
-            if skill_type not in self._sheet["skills"]:
-                skill_type = "common"  # fallback
-                
-            if skill_name not in self._sheet["skills"][skill_type]:
-                self._sheet["skills"][skill_type][skill_name] = {
-                    "full": 60,
-                    "half": 30
-                }
-                
-                return {
-                    "success": True,
-                    "action": action,
-                    "skill": skill_name,
-                    "skill_type": skill_type,
-                    "value": 60,
-                    "message": f"Gained skill {skill_name} at 60%"
-                }
+        Returns:
+            Mesmo formato de apply_effects
+        """
+        return self._apply_effect_list(effects, atomic, validate=False)
+    
+    def _apply_effect_list(self, effects, atomic: bool, validate: bool) -> Dict[str, Any]:
+        """Laço comum de apply_effects e apply_validated_effects."""
+        if atomic:
+            self.begin_transaction()
+            try:
+                result = self._apply_effect_list(effects, False, validate)
+            except BaseException:
+                self.rollback()
+                raise
+            if result["success"]:
+                self.commit()
             else:
-                return {
-                    "success": True,
-                    "action": action,
-                    "skill": skill_name,
-                    "message": f"Skill {skill_name} already exists"
-                }
-                
-        elif action == "apply_penalty":
-            skill_name = effect.get("skill", "General")
-            duration = effect.get("duration", 1)
-            return self.add_modifier(skill_name, "penalty_dice", duration)
-            
-        elif action == "apply_bonus":
-            skill_name = effect.get("skill", "General")
-            duration = effect.get("duration", 1)
-            return self.add_modifier(skill_name, "bonus_dice", duration)
-            
-        elif action == "restore_luck":
-            amount = effect.get("amount", 0)
-            return self.restore_luck(amount)
-            
-        elif action == "restore_magic":
-            amount = effect.get("amount", 0)
-            return self.restore_magic(amount)
-            
-        elif action == "set_characteristic":
-            char_name = effect.get("characteristic")
-            value = effect.get("value")
-            if not char_name or value is None:
-                return {
-                    "success": False,
-                    "error": "set_characteristic requer 'characteristic' e 'value'"
-                }
-            return self.set_characteristic(char_name, value)
-            
-        elif action == "set_skill":
-            skill_name = effect.get("skill")
-            value = effect.get("value")
-            skill_type = effect.get("skill_type", "common")
-            if not skill_name or value is None:
-                return {
-                    "success": False,
-                    "error": "set_skill requer 'skill' e 'value'"
-                }
-            return self.set_skill(skill_name, value, skill_type)
-            
-        elif action == "add_inventory":
-            item = effect.get("item")
-            if not item:
-                return {
-                    "success": False,
-                    "error": "add_inventory requer 'item'"
-                }
-            
-            # Garantir que o inventário existe e tem a estrutura correta
-            if "inventory" not in self._sheet:
-                self._sheet["inventory"] = {"equipment": [], "weapons": []}
-            elif isinstance(self._sheet["inventory"], list):
-                # Converter lista antiga para nova estrutura
-                old_items = self._sheet["inventory"]
-                self._sheet["inventory"] = {"equipment": old_items, "weapons": []}
-            
-            # Determinar categoria (default equipment)
-            category = effect.get("category", "equipment")
-            if category not in ["equipment", "weapons"]:
-                category = "equipment"
-            
-            self._sheet["inventory"][category].append(item)
-            return {
-                "success": True,
-                "action": action,
-                "item": item,
-                "category": category,
-                "message": f"Added {item} to {category}"
-            }
-            
-        elif action == "remove_inventory":
-            item = effect.get("item")
-            if not item:
-                return {
-                    "success": False,
-                    "error": "remove_inventory requer 'item'"
-                }
-            
-            inventory = self._sheet.get("inventory", {"equipment": [], "weapons": []})
-            
-            # Procurar em ambas as categorias
-            for category in ["equipment", "weapons"]:
-                if category in inventory and item in inventory[category]:
-                    inventory[category].remove(item)
-                    return {
-                        "success": True,
-                        "action": action,
-                        "item": item,
-                        "category": category,
-                        "message": f"Removed {item} from {category}"
-                    }
-            
-            return {
-                "success": False,
-                "error": f"Item {item} not found in inventory"
-            }
+                self.rollback()
+            result["rolled_back"] = not result["success"]
+            return result
         
-        else:
-            return {
-                "success": False,
-                "error": f"Ação desconhecida '{action}' em efeito: {effect}"
-            }
-    
-    def apply_effects(self, effects: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """
-        Processa uma lista de efeitos, modificando o estado do personagem.
-        """
         applied_count = 0
         failed_count = 0
+        skipped_count = 0
 
         for effect in effects:
-            action = effect.get("action")
-            try:
-                if action == "set-occupation":
-                    self.set_occupation(effect["value"])
-                    applied_count += 1
-                elif action == "take_damage":
-                    self.take_damage(effect["amount"])
-                    applied_count += 1
-                elif action == "heal_damage":
-                    self.heal_damage(effect["amount"])
-                    applied_count += 1
-                elif action == "spend_magic":
-                    self.spend_magic(effect["amount"])
-                    applied_count += 1
-                elif action == "spend_luck":
-                    self.spend_luck(effect["amount"])
-                    applied_count += 1
-                elif action == "gain_skill":
-                    self.set_skill(effect["skill"], 50, "expert") # Default value
-                    applied_count += 1
-                else:
+            if validate:
+                validation = self.validate_effect(effect)
+                if not validation["valid"]:
+                    print(f"Failed to apply effect {effect}: {validation['error']}")
                     failed_count += 1
-            except (KeyError, TypeError) as e:
-                print(f"Failed to apply effect {effect}: {e}")
+                    continue
+            outcome = self._dispatch_effect(effect)
+            # Métodos que recusam a alteração (ex.: sorte insuficiente) também contam como falha
+            if isinstance(outcome, dict) and outcome.get("success") is False:
                 failed_count += 1
+            elif isinstance(outcome, dict) and outcome.get("skipped"):
+                skipped_count += 1
+            else:
+                applied_count += 1
         
         return {
             "success": failed_count == 0,
             "effects_applied": applied_count,
-            "effects_failed": failed_count
+            "effects_failed": failed_count,
+            "effects_skipped": skipped_count
         }
     
-    def validate_effect(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+    def _dispatch_effect(self, effect: Dict[str, Any]) -> Any:
+        """Aplica um efeito válido: confere a condição e chama o handler da ação."""
+        condition = effect.get("condition")
+        if condition is not None and not _EFFECT_CONDITIONS[condition](self):
+            return {
+                "success": True,
+                "action": effect["action"],
+                "skipped": True,
+                "message": f"Condição '{condition}' não atendida"
+            }
+        return self._EFFECT_HANDLERS[effect["action"]](self, effect)
+    
+    def _effect_set_occupation(self, effect: Dict[str, Any]) -> Any:
+        return self.set_occupation(effect["value"])
+    
+    def _effect_take_damage(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        return self.take_damage(effect.get("amount", 0))
+    
+    def _effect_heal_damage(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        return self.heal_damage(effect.get("amount", 0))
+    
+    def _effect_spend_luck(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        return self.spend_luck(effect.get("amount", 0))
+    
+    def _effect_spend_magic(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        return self.spend_magic(effect.get("amount", 0))
+    
+    def _effect_restore_luck(self, effect: Dict[str, Any]) -> Any:
+        return self.restore_luck(effect.get("amount", 0))
+    
+    def _effect_restore_magic(self, effect: Dict[str, Any]) -> Any:
+        return self.restore_magic(effect.get("amount", 0))
+    
+    def _effect_gain_skill(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        skill_name = effect["skill"]
+        if self.resolve_check(skill_name) is not None:
+            # Habilidade já conhecida: não rebaixa nem troca de tipo
+            return {
+                "success": True,
+                "action": "gain_skill",
+                "skill": skill_name,
+                "message": f"Skill {skill_name} already exists"
+            }
+        
+        value = effect.get("value", GAINED_SKILL_VALUE)
+        result = self.set_skill(skill_name, value, effect.get("skill_type", GAINED_SKILL_TYPE))
+        if result["success"]:
+            result["action"] = "gain_skill"
+            result["message"] = f"Gained skill {skill_name} at {value}%"
+        return result
+    
+    def _effect_apply_penalty(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        return self.add_modifier(effect.get("skill", "General"), "penalty_dice", effect.get("duration", 1))
+    
+    def _effect_apply_bonus(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        return self.add_modifier(effect.get("skill", "General"), "bonus_dice", effect.get("duration", 1))
+    
+    def _effect_set_characteristic(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        return self.set_characteristic(effect["characteristic"], effect["value"])
+    
+    def _effect_set_skill(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        return self.set_skill(effect["skill"], effect["value"], effect.get("skill_type", "common"))
+    
+    def _effect_add_inventory(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        item = effect["item"]
+        category = effect.get("category", "equipment")
+        self._add_to_inventory(item, category)
+        return {
+            "success": True,
+            "action": "add_inventory",
+            "item": item,
+            "category": category,
+            "message": f"Added {item} to {category}"
+        }
+    
+    def _effect_remove_inventory(self, effect: Dict[str, Any]) -> Dict[str, Any]:
+        item = effect["item"]
+        # Procurar em ambas as categorias
+        category = self._remove_from_inventory(item, INVENTORY_CATEGORIES)
+        if category is None:
+            return {
+                "success": False,
+                "error": f"Item {item} not found in inventory"
+            }
+        return {
+            "success": True,
+            "action": "remove_inventory",
+            "item": item,
+            "category": category,
+            "message": f"Removed {item} from {category}"
+        }
+    
+    # Ação -> handler (função chamada com o personagem e o efeito)
+    _EFFECT_HANDLERS = {
+        "set-occupation": _effect_set_occupation,
+        "take_damage": _effect_take_damage,
+        "heal_damage": _effect_heal_damage,
+        "spend_luck": _effect_spend_luck,
+        "spend_magic": _effect_spend_magic,
+        "restore_luck": _effect_restore_luck,
+        "restore_magic": _effect_restore_magic,
+        "gain_skill": _effect_gain_skill,
+        "apply_penalty": _effect_apply_penalty,
+        "apply_bonus": _effect_apply_bonus,
+        "set_characteristic": _effect_set_characteristic,
+        "set_skill": _effect_set_skill,
+        "add_inventory": _effect_add_inventory,
+        "remove_inventory": _effect_remove_inventory,
+    }
+    
+    @staticmethod
+    def validate_effect(effect: Dict[str, Any]) -> Dict[str, Any]:
         """
         Valida um efeito sem aplicá-lo.
         
+        Usado no carregamento do conteúdo (compilação dos planos de ação) e por
+        apply_effect/apply_effects; não depende do estado do personagem.
+        
         Args:
             effect: Dicionário com o efeito a ser validado
             
@@ -1314,18 +1733,17 @@ class Character:
                 "error": f"Efeito sem campo 'action': {effect}"
             }
         
-        # Lista de ações válidas
-        valid_actions = [
-            "take_damage", "heal_damage", "spend_luck", "spend_magic",
-            "gain_skill", "apply_penalty", "apply_bonus", "restore_luck",
-            "restore_magic", "set_characteristic", "set_skill",
-            "add_inventory", "remove_inventory"
-        ]
+        if action not in Character._EFFECT_HANDLERS:
+            return {
+                "valid": False,
+                "error": f"Ação '{action}' não é válida. Ações válidas: {list(Character._EFFECT_HANDLERS)}"
+            }
         
-        if action not in valid_actions:
+        condition = effect.get("condition")
+        if condition is not None and condition not in _EFFECT_CONDITIONS:
             return {
                 "valid": False,
-                "error": f"Ação '{action}' não é válida. Ações válidas: {valid_actions}"
+                "error": f"Condição '{condition}' não é válida. Condições válidas: {list(_EFFECT_CONDITIONS)}"
             }
         
         # Validações específicas por ação
@@ -1345,18 +1763,36 @@ class Character:
                     "error": f"Campo 'skill' deve ser uma string não vazia, recebido: {skill}"
                 }
         
+        if action in ["gain_skill", "set_skill"]:
+            skill_type = effect.get("skill_type", "common")
+            if skill_type not in ("common", "combat", "expert"):
+                return {
+                    "valid": False,
+                    "error": f"Campo 'skill_type' inválido: {skill_type}"
+                }
+        
+        if action in ["set_characteristic", "set_skill"]:
+            value = effect.get("value")
+            if value is None or not isinstance(value, (int, float)):
+                return {
+                    "valid": False,
+                    "error": f"Campo 'value' deve ser um número"
+                }
+        
         if action == "set_characteristic":
             char = effect.get("characteristic")
-            value = effect.get("value")
             if not char or not isinstance(char, str):
                 return {
                     "valid": False,
                     "error": f"Campo 'characteristic' deve ser uma string não vazia"
                 }
-            if value is None or not isinstance(value, (int, float)):
+        
+        if action == "set-occupation":
+            occupation = effect.get("value")
+            if not occupation or not isinstance(occupation, str):
                 return {
                     "valid": False,
-                    "error": f"Campo 'value' deve ser um número"
+                    "error": f"Campo 'value' deve ser o nome da ocupação"
                 }
         
         if action in ["add_inventory", "remove_inventory"]:
@@ -1366,6 +1802,11 @@ class Character:
                     "valid": False,
                     "error": f"Campo 'item' deve ser uma string não vazia"
                 }
+            if effect.get("category", "equipment") not in INVENTORY_CATEGORIES:
+                return {
+                    "valid": False,
+                    "error": f"Campo 'category' deve ser um de {list(INVENTORY_CATEGORIES)}"
+                }
         
         return {
             "valid": True,
@@ -1374,23 +1815,52 @@ class Character:
         }
     
     # Sistema de inventário
+    def inventory_view(self) -> MappingProxyType:
+        """
+        Visão somente leitura do inventário, para renderização.
+        
+        Mantida em cache até a próxima alteração do inventário: leituras
+        repetidas (a cada renderização) não copiam nada.
+        
+        Returns:
+            Mapeamento categoria -> tupla de itens (repetidos conforme a quantidade)
+        """
+        if self._inventory_view is None:
+            inventory = self._sheet.get("inventory", {})
+            if isinstance(inventory, list):
+                inventory = {"equipment": inventory}
+            self._inventory_view = MappingProxyType({
+                category: tuple(_inventory_items(inventory.get(category, ())))
+                for category in INVENTORY_CATEGORIES
+            })
+        return self._inventory_view
+    
     def get_inventory(self) -> Dict[str, List[str]]:
         """
         Retorna o inventário do personagem.
         
         Returns:
-            Dicionário com listas de equipamentos e armas
+            Dicionário com listas (novas) de equipamentos e armas
         """
-        inventory = self._sheet.get("inventory", {"equipment": [], "weapons": []})
+        view = self.inventory_view()
+        return {category: list(items) for category, items in view.items()}
+    
+    def get_item_count(self, item: str, category: Optional[str] = None) -> int:
+        """
+        Quantidade de unidades de um item no inventário.
         
-        # Garantir compatibilidade com formato antigo
+        Args:
+            item: Nome do item
+            category: Categoria específica ou None para somar todas
+            
+        Returns:
+            Número de unidades (0 se não possuir)
+        """
+        inventory = self._sheet.get("inventory", {})
         if isinstance(inventory, list):
-            return {"equipment": inventory.copy(), "weapons": []}
-        
-        return {
-            "equipment": inventory.get("equipment", []).copy(),
-            "weapons": inventory.get("weapons", []).copy()
-        }
+            inventory = {"equipment": inventory}
+        categories = [category] if category else INVENTORY_CATEGORIES
+        return sum(_item_count(inventory.get(cat, ()), item) for cat in categories)
     
     def add_item(self, item: str, category: str = "equipment") -> Dict[str, Any]:
         """
@@ -1409,27 +1879,16 @@ class Character:
                 "error": "Item deve ser uma string não vazia"
             }
         
-        if category not in ["equipment", "weapons"]:
+        if category not in INVENTORY_CATEGORIES:
             category = "equipment"
         
-        # Garantir que o inventário existe
-        if "inventory" not in self._sheet:
-            self._sheet["inventory"] = {"equipment": [], "weapons": []}
-        elif isinstance(self._sheet["inventory"], list):
-            # Converter lista antiga para nova estrutura
-            old_items = self._sheet["inventory"]
-            self._sheet["inventory"] = {"equipment": old_items, "weapons": []}
-        
-        if category not in self._sheet["inventory"]:
-            self._sheet["inventory"][category] = []
-        
-        self._sheet["inventory"][category].append(item)
+        self._add_to_inventory(item, category)
         
         return {
             "success": True,
             "item": item,
             "category": category,
-            "inventory_size": len(self._sheet["inventory"][category])
+            "inventory_size": self._inventory_size(category)
         }
     
     def remove_item(self, item: str, category: Optional[str] = None) -> Dict[str, Any]:
@@ -1449,31 +1908,15 @@ class Character:
                 "error": "Item deve ser uma string não vazia"
             }
         
-        inventory = self._sheet.get("inventory", {"equipment": [], "weapons": []})
-        
-        if isinstance(inventory, list):
-            # Compatibilidade com formato antigo
-            if item in inventory:
-                inventory.remove(item)
-                return {
-                    "success": True,
-                    "item": item,
-                    "category": "equipment",
-                    "inventory_size": len(inventory)
-                }
-        else:
-            # Buscar na categoria específica ou em todas
-            categories = [category] if category else ["equipment", "weapons"]
-            
-            for cat in categories:
-                if cat in inventory and item in inventory[cat]:
-                    inventory[cat].remove(item)
-                    return {
-                        "success": True,
-                        "item": item,
-                        "category": cat,
-                        "inventory_size": len(inventory[cat])
-                    }
+        # Buscar na categoria específica ou em todas
+        removed_from = self._remove_from_inventory(item, [category] if category else INVENTORY_CATEGORIES)
+        if removed_from is not None:
+            return {
+                "success": True,
+                "item": item,
+                "category": removed_from,
+                "inventory_size": self._inventory_size(removed_from)
+            }
         
         return {
             "success": False,
@@ -1491,21 +1934,61 @@ class Character:
         Returns:
             True se possui o item, False caso contrário
         """
-        inventory = self._sheet.get("inventory", {"equipment": [], "weapons": []})
+        inventory = self._sheet.get("inventory", {})
         
         if isinstance(inventory, list):
             # Compatibilidade com formato antigo
             return item in inventory
         
-        # Buscar na categoria específica ou em todas
-        categories = [category] if category else ["equipment", "weapons"]
+        # Buscar na categoria específica ou em todas (consulta O(1) no multiconjunto)
+        categories = [category] if category else INVENTORY_CATEGORIES
         
         for cat in categories:
-            if cat in inventory and item in inventory[cat]:
+            if item in inventory.get(cat, ()):
                 return True
         
         return False
     
+    def _add_to_inventory(self, item: str, category: str) -> None:
+        """Adiciona uma unidade de um item (O(1))."""
+        self._ensure_inventory()
+        inventory = self._writable("inventory")
+        if category not in inventory:
+            self._record("inventory", category)
+            inventory[category] = Counter()
+        
+        self._record("inventory", category, item)
+        inventory[category][item] += 1
+        self._inventory_view = None
+    
+    def _remove_from_inventory(self, item: str, categories) -> Optional[str]:
+        """
+        Remove uma unidade de um item da primeira categoria que o contiver (O(1)).
+        
+        Returns:
+            Categoria de onde o item foi removido, ou None se não encontrado
+        """
+        if "inventory" not in self._sheet:
+            return None
+        self._ensure_inventory()
+        inventory = self._sheet["inventory"]
+        
+        for category in categories:
+            if item in inventory.get(category, ()):
+                items = self._writable("inventory")[category]
+                self._record("inventory", category, item)
+                if items[item] > 1:
+                    items[item] -= 1
+                else:
+                    del items[item]
+                self._inventory_view = None
+                return category
+        return None
+    
+    def _inventory_size(self, category: str) -> int:
+        """Total de unidades em uma categoria (usado só no resultado de add/remove_item)."""
+        return sum(self._sheet["inventory"][category].values())
+    
     def __repr__(self) -> str:
         """Representação string do personagem."""
         return f"Character(name='{self.name}', occupation='{self.occupation}', health='{self.get_health_status()}')"
@@ -1529,6 +2012,9 @@ class Character:
             page_text: Texto da página onde a decisão foi tomada
             choice_made: Objeto choice completo que foi escolhido
             choice_index: Índice da escolha (opcional)
+            
+        Returns:
+            Entrada mais antiga descartada (histórico cheio), ou None
         """
         history_entry = {
             'page_number': page_number,
@@ -1538,18 +2024,432 @@ class Character:
             'reason': reason
         }
         
-        self._sheet['page_history'].append(history_entry)
+        # O buffer descarta a entrada mais antiga: o undo guarda uma cópia (O(capacidade))
+        self._record('page_history', copy_value=True)
+        return self._writable('page_history').append(history_entry)
     
-    def get_history(self) -> List[Dict[str, Any]]:
+    def get_history(self) -> HistoryBuffer:
         """
-        Retorna o histórico de decisões.
+        Retorna o histórico de decisões (somente leitura).
         
         Returns:
-            Lista com entradas do histórico
+            Buffer circular com as últimas HISTORY_CAPACITY entradas; use
+            last(k) para as k mais recentes sem cópia
         """
-        return self._sheet.get('page_history', [])
+        return self._sheet['page_history']
     
     def clear_history(self):
         """Limpa o histórico de decisões."""
-        self._sheet['page_history'] = []
+        self._record('page_history')
+        self._sheet['page_history'] = HistoryBuffer(self._sheet['page_history'].capacity)
+        self._owned.add('page_history')
+        self._touch('page_history')
+        
+
+    # Ramificação de estado (snapshots copy-on-write)
+    def _writable(self, section: str) -> Any:
+        """
+        Retorna uma seção da ficha que pode ser alterada por esta instância.
+        
+        Se a seção ainda é compartilhada com um snapshot ou fork, ela é copiada
+        (na profundidade adequada) antes; as seções não alteradas continuam
+        compartilhadas.
+        
+        Args:
+            section: Nome da seção ("status", "resources", "skills", ...)
+            
+        Returns:
+            Seção exclusiva desta instância
+        """
+        self._touch(section)
+        if section not in self._owned:
+            copier = _SECTION_COPIERS.get(section, copy.deepcopy)
+            self._sheet[section] = copier(self._sheet[section])
+            self._owned.add(section)
+        return self._sheet[section]
+    
+    def _touch(self, section: str) -> None:
+        """Marca uma seção como alterada (avança o contador de versão)."""
+        self._version += 1
+        self._versions[section] = self._version
+    
+    def _touch_all(self) -> None:
+        """Marca todas as seções da ficha atual como alteradas."""
+        self._version += 1
+        for section in self._sheet:
+            self._versions[section] = self._version
+    
+    @property
+    def version(self) -> int:
+        """
+        Contador de alterações do personagem.
+        
+        Avança a cada alteração da ficha (inclusive restore/rollback); dois
+        valores iguais garantem que nada mudou entre as leituras.
+        """
+        return self._version
+    
+    def section_version(self, section: str) -> int:
+        """
+        Versão de uma seção da ficha ("info", "resources", "status", ...).
+        
+        Returns:
+            Valor do contador na última alteração da seção (0 = nunca alterada)
+        """
+        return self._versions.get(section, 0)
+    
+    def snapshot(self) -> "CharacterSnapshot":
+        """
+        Captura o estado atual do personagem em O(número de seções).
+        
+        Nenhuma seção é copiada: o snapshot compartilha as estruturas atuais e
+        a primeira alteração posterior de cada seção faz a cópia (copy-on-write).
+        
+        Returns:
+            Token imutável para uso em restore()
+        """
+        self._owned.clear()
+        return CharacterSnapshot(self._sheet)
+    
+    def restore(self, token: "CharacterSnapshot") -> None:
+        """
+        Restaura o estado capturado por snapshot().
+        
+        O mesmo token pode ser restaurado várias vezes (ex.: um rollout por
+        iteração de busca).
+        
+        Args:
+            token: Snapshot obtido de snapshot() (deste ou de outro Character)
+            
+        Raises:
+            TypeError: Se token não for um CharacterSnapshot
+        """
+        if not isinstance(token, CharacterSnapshot):
+            raise TypeError(f"Snapshot inválido: {type(token)}")
+        if self._savepoints:
+            self._undo_log.append((_UNDO_SHEET, self._sheet))
+        self._touch_all()
+        self._sheet = dict(token._sections)
+        self._owned = set()
+        self._touch_all()
+        self._check_index = None
+        self._modifier_index = None
+        self._inventory_view = None
+    
+    @staticmethod
+    def _copy_sections(sections: Dict[str, Any]) -> Dict[str, Any]:
+        """Copia seções da ficha na profundidade em que são alteradas."""
+        return {key: _SECTION_COPIERS.get(key, copy.deepcopy)(value) for key, value in sections.items()}
+    
+    def compact(self) -> "CompactCharacter":
+        """
+        Cria uma cópia congelada e compacta em memória do estado atual.
+        
+        Returns:
+            CompactCharacter (ver compact_character.py)
+        """
+        from compact_character import CompactCharacter
+        return CompactCharacter.from_character(self)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializa o estado em um formato binário compacto e versionado.
+
+        O histórico de páginas não é incluído (é mantido separadamente; ver
+        from_bytes).
+
+        Returns:
+            Bytes no formato de character_codec.py
+        """
+        from character_codec import encode_character
+        return encode_character(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, rng: Optional[random.Random] = None, dice_engine: Optional[Any] = None,
+                   history: Optional[List[Dict[str, Any]]] = None) -> "Character":
+        """
+        Reconstrói um personagem a partir de to_bytes().
+
+        Args:
+            data: Bytes serializados
+            rng: Gerador aleatório dedicado
+            dice_engine: Backend de rolagens D100
+            history: Histórico de páginas a reanexar (padrão: vazio)
+
+        Returns:
+            Novo Character
+
+        Raises:
+            ValueError: Se os bytes forem inválidos ou de versão desconhecida
+        """
+        from character_codec import decode_character
+        return decode_character(data, rng=rng, dice_engine=dice_engine, history=history)
+
+    def fork(self, rng: Optional[random.Random] = None) -> "Character":
+        """
+        Cria uma cópia independente do personagem para ramificar o estado.
         
+        A cópia compartilha todas as seções com o original (copy-on-write):
+        o custo é O(número de seções) e cada lado copia apenas as seções que
+        vier a alterar.
+        
+        Args:
+            rng: Gerador aleatório da cópia (padrão: o mesmo do original)
+            
+        Returns:
+            Novo Character com o mesmo estado
+        """
+        clone = Character.__new__(Character)
+        if rng is None:
+            clone._rng = self._rng
+            clone._dice = self._dice
+        else:
+            clone._rng = rng
+            clone._dice = ScalarDiceEngine(rng)
+        clone._sheet = dict(self._sheet)
+        clone._owned = set()
+        clone._undo_log = []
+        clone._savepoints = []
+        clone._check_index = dict(self._check_index) if self._check_index is not None else None
+        clone._modifier_index = None
+        clone._inventory_view = self._inventory_view  # imutável, pode ser compartilhada
+        clone._version = self._version
+        clone._versions = dict(self._versions)
+        self._owned.clear()
+        return clone
+    
+    # Transações (undo log)
+    def _ensure_inventory(self) -> None:
+        """Garante que o inventário existe no formato {categoria: Counter(item -> quantidade)}."""
+        inventory = self._sheet.get("inventory")
+        if inventory is None:
+            self._record("inventory")
+            self._sheet["inventory"] = {category: Counter() for category in INVENTORY_CATEGORIES}
+            self._owned.add("inventory")
+            self._touch("inventory")
+        elif isinstance(inventory, list) or not all(isinstance(items, Counter) for items in inventory.values()):
+            # Converter formatos antigos (lista única ou listas por categoria)
+            self._record("inventory")
+            if isinstance(inventory, list):
+                inventory = {"equipment": inventory}
+            converted = {category: Counter() for category in INVENTORY_CATEGORIES}
+            converted.update((category, Counter(items)) for category, items in inventory.items())
+            self._sheet["inventory"] = converted
+            self._owned.add("inventory")
+            self._touch("inventory")
+            self._inventory_view = None
+    
+    def _record(self, section: str, *path: str, copy_value: bool = False) -> None:
+        """
+        Registra no undo log o valor atual de uma posição da ficha antes de alterá-la.
+        
+        Sem transação ativa não faz nada. O valor anterior é guardado por
+        referência (as alterações substituem valores em vez de modificá-los);
+        use copy_value=True antes de modificar uma lista no lugar.
+        
+        Args:
+            section: Seção da ficha
+            path: Chaves dentro da seção (vazio = a seção inteira)
+            copy_value: Guarda uma cópia rasa do valor anterior
+        """
+        if not self._savepoints:
+            return
+        node = self._sheet.get(section, _MISSING)
+        for key in path:
+            node = node.get(key, _MISSING)
+        if copy_value and node is not _MISSING:
+            node = copy.copy(node)
+        self._undo_log.append((_UNDO_SET, section, path, node))
+    
+    def _record_append(self, section: str, *path: str) -> None:
+        """Registra no undo log o tamanho de uma lista antes de um append."""
+        if not self._savepoints:
+            return
+        node = self._sheet[section]
+        for key in path:
+            node = node[key]
+        self._undo_log.append((_UNDO_APPEND, section, path, len(node)))
+    
+    def _undo(self, entry: Tuple) -> None:
+        """Desfaz uma entrada do undo log."""
+        kind = entry[0]
+        if kind == _UNDO_SHEET:
+            self._touch_all()
+            self._sheet = entry[1]
+            self._owned = set()
+            self._touch_all()
+            return
+        
+        _, section, path, value = entry
+        if kind == _UNDO_APPEND:
+            node = self._writable(section)
+            for key in path:
+                node = node[key]
+            del node[value:]
+            return
+        
+        if not path:
+            if value is _MISSING:
+                self._sheet.pop(section, None)
+            else:
+                self._sheet[section] = value
+            # O valor anterior pode ser compartilhado com snapshots
+            self._owned.discard(section)
+            self._touch(section)
+            return
+        
+        node = self._writable(section)
+        for key in path[:-1]:
+            node = node[key]
+        if value is _MISSING:
+            node.pop(path[-1], None)
+        else:
+            node[path[-1]] = value
+    
+    @property
+    def in_transaction(self) -> bool:
+        """Indica se há uma transação ativa."""
+        return bool(self._savepoints)
+    
+    def begin_transaction(self) -> None:
+        """
+        Inicia uma transação: as alterações seguintes são registradas no undo log
+        e podem ser confirmadas (commit) ou desfeitas (rollback) em O(alterações).
+        
+        Transações podem ser aninhadas; cada commit/rollback encerra a mais interna.
+        Alterações feitas diretamente na ficha (propriedade sheet) não são registradas.
+        """
+        self._savepoints.append(len(self._undo_log))
+    
+    def commit(self) -> None:
+        """
+        Confirma a transação mais interna.
+        
+        Raises:
+            RuntimeError: Se não houver transação ativa
+        """
+        if not self._savepoints:
+            raise RuntimeError("Nenhuma transação ativa para commit")
+        self._savepoints.pop()
+        if not self._savepoints:
+            self._undo_log.clear()
+    
+    def rollback(self) -> int:
+        """
+        Desfaz todas as alterações da transação mais interna e a encerra.
+        
+        Returns:
+            Número de alterações desfeitas
+            
+        Raises:
+            RuntimeError: Se não houver transação ativa
+        """
+        if not self._savepoints:
+            raise RuntimeError("Nenhuma transação ativa para rollback")
+        start = self._savepoints.pop()
+        log = self._undo_log
+        undone = len(log) - start
+        while len(log) > start:
+            self._undo(log.pop())
+        if undone:
+            self._check_index = None
+            self._modifier_index = None
+            self._inventory_view = None
+        return undone
+    
+    @contextlib.contextmanager
+    def transaction(self, commit: bool = True):
+        """
+        Context manager de transação.
+        
+        Exceções desfazem as alterações e são propagadas. Com commit=False as
+        alterações são sempre desfeitas ao sair (avaliação especulativa).
+        
+        Args:
+            commit: Confirma as alterações ao sair sem exceção
+        """
+        self.begin_transaction()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        if commit:
+            self.commit()
+        else:
+            self.rollback()
+    
+    @classmethod
+    def from_sheet(cls, sheet: Dict[str, Any], rng: Optional[random.Random] = None,
+                   dice_engine: Optional[Any] = None) -> "Character":
+        """
+        Cria um personagem que passa a ser dono de uma ficha completa já montada.
+        
+        Args:
+            sheet: Ficha no formato de _create_base_sheet (não deve ser compartilhada)
+            rng: Gerador aleatório dedicado
+            dice_engine: Backend de rolagens D100
+            
+        Returns:
+            Novo Character com a ficha informada
+        """
+        character = cls(rng=rng, dice_engine=dice_engine)
+        if not isinstance(sheet.get("page_history"), HistoryBuffer):
+            sheet["page_history"] = HistoryBuffer(HISTORY_CAPACITY, sheet.get("page_history", ()))
+        character._sheet = sheet
+        character._owned = set(sheet)
+        return character
+    
+    @classmethod
+    def from_status(cls, character_data: Dict[str, Any], rng: Optional[random.Random] = None) -> "Character":
+        """
+        Reconstrói um personagem a partir de Cockpit.render_character_status.
+        
+        Não rerrola sorte nem magia. Como o status agrupa as habilidades sem
+        categoria, elas são registradas em "common". O turno vem de
+        health_status["turn"]; sem ele, as expirações dos modificadores são
+        recalculadas a partir do turno 0 (duração restante = duração).
+        
+        Args:
+            character_data: Dados estruturados do personagem
+            rng: Gerador aleatório dedicado
+            
+        Returns:
+            Novo Character com o estado informado
+        """
+        character = cls(rng=rng)
+        sheet = character._sheet
+        info = character_data.get("character_info", {})
+        sheet["info"]["name"] = info.get("name", sheet["info"]["name"])
+        sheet["info"]["occupation"] = info.get("occupation")
+        sheet["info"]["age"] = info.get("age", sheet["info"]["age"])
+        
+        for char_name, values in character_data.get("characteristics", {}).items():
+            sheet["characteristics"][char_name] = {"full": values["full"], "half": values["half"]}
+        for skill_name, values in character_data.get("skills", {}).items():
+            sheet["skills"]["common"][skill_name] = {"full": values["full"], "half": values["half"]}
+        
+        resources = character_data.get("resources", {})
+        for source, target in (("luck", "luck"), ("magic", "magic_pts")):
+            if source in resources:
+                sheet["resources"][target] = {
+                    "starting": resources[source].get("starting", 0),
+                    "current": resources[source].get("current", 0)
+                }
+        
+        health = character_data.get("health_status", {})
+        sheet["status"]["damage_taken"] = health.get("damage_taken", 0)
+        modifiers = [dict(modifier) for modifier in character_data.get("modifiers", [])]
+        if "turn" in health:
+            sheet["status"]["turn"] = health["turn"]
+        else:
+            for modifier in modifiers:
+                if isinstance(modifier.get("expires_at"), int) and isinstance(modifier.get("duration"), int):
+                    modifier["expires_at"] = modifier["duration"]
+        sheet["status"]["modifiers"] = modifiers
+        inventory = character_data.get("inventory", {})
+        sheet["inventory"] = {category: Counter(inventory.get(category, ())) for category in INVENTORY_CATEGORIES}
+        character._check_index = None
+        character._modifier_index = None
+        character._inventory_view = None
+        return character
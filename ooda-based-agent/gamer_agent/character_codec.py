@@ -0,0 +1,293 @@
+"""
+Character Codec Module - Serialização binária do estado do personagem
+
+Este módulo implementa o formato binário compacto e versionado usado por
+Character.to_bytes() / Character.from_bytes() para checkpoints e para enviar
+o estado entre processos, sem serializar a ficha aninhada inteira.
+
+Layout (little-endian, versão 1):
+- cabeçalho: b"CHR" + versão (B)
+- info: nome, ocupação (opcional), idade (h), backstory
+- características: quantidade (B) + (nome, full h, half h)
+- recursos: sorte inicial/atual, magia inicial/atual e mov (5 x h)
+- habilidades: quantidade de tipos (B) + (tipo, quantidade H, (nome, full h, half h)...)
+- status: dano (B), turno (i), quantidade de modificadores (H) +
+  (habilidade, tipo, flags B, duração i, expires_at i)
+- inventário: por categoria, quantidade (H) + (item, unidades H)
+- extra: bloco JSON (tamanho I; 0 = vazio) com contacts/case_files e seções
+  desconhecidas
+
+Textos são gravados como UTF-8 com tamanho (H); 0xFFFF indica None.
+
+O histórico de páginas (page_history, que inclui o texto das páginas) não faz
+parte do formato: ele é mantido e transmitido separadamente e pode ser
+reanexado em decode_character(history=...).
+"""
+
+import json
+import struct
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from character import Character, DAMAGE_LEVELS, HISTORY_CAPACITY, INVENTORY_CATEGORIES
+from history_buffer import HistoryBuffer
+
+
+# Identificação e versão do formato; altere a versão ao mudar o layout
+MAGIC = b"CHR"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<3sB")
+_TEXT_LENGTH = struct.Struct("<H")
+_COUNT_BYTE = struct.Struct("<B")
+_COUNT = struct.Struct("<H")
+_AGE = struct.Struct("<h")
+_VALUES = struct.Struct("<hh")
+_RESOURCES = struct.Struct("<hhhhh")
+_STATUS = struct.Struct("<BiH")
+_MODIFIER = struct.Struct("<Bii")
+_BLOB_LENGTH = struct.Struct("<I")
+
+_NONE_TEXT = 0xFFFF
+_HAS_EXPIRY = 0x01
+
+# Seções gravadas em campos próprios (as demais vão para o bloco extra)
+_STRUCTURED_SECTIONS = ("info", "characteristics", "resources", "skills", "status", "inventory", "page_history")
+
+
+def _put_text(parts: List[bytes], text: Optional[str]) -> None:
+    """Acrescenta um texto opcional (tamanho + UTF-8)."""
+    if text is None:
+        parts.append(_TEXT_LENGTH.pack(_NONE_TEXT))
+        return
+    encoded = text.encode("utf-8")
+    if len(encoded) >= _NONE_TEXT:
+        raise ValueError(f"Texto longo demais para o formato binário ({len(encoded)} bytes)")
+    parts.append(_TEXT_LENGTH.pack(len(encoded)))
+    parts.append(encoded)
+
+
+def encode_character(character: Character) -> bytes:
+    """
+    Serializa o estado de um Character (sem page_history).
+
+    Args:
+        character: Personagem de origem (não é modificado)
+
+    Returns:
+        Bytes no formato versionado descrito no módulo
+
+    Raises:
+        ValueError: Se algum valor não couber no formato (ex.: duração não inteira)
+    """
+    sheet = character._sheet
+    parts: List[bytes] = [_HEADER.pack(MAGIC, FORMAT_VERSION)]
+    try:
+        info = sheet["info"]
+        _put_text(parts, info["name"])
+        _put_text(parts, info["occupation"])
+        parts.append(_AGE.pack(info["age"]))
+        _put_text(parts, info["backstory"])
+
+        characteristics = sheet["characteristics"]
+        parts.append(_COUNT_BYTE.pack(len(characteristics)))
+        for name, values in characteristics.items():
+            _put_text(parts, name)
+            parts.append(_VALUES.pack(values["full"], values["half"]))
+
+        resources = sheet["resources"]
+        parts.append(_RESOURCES.pack(resources["luck"]["starting"], resources["luck"]["current"],
+                                     resources["magic_pts"]["starting"], resources["magic_pts"]["current"],
+                                     resources["mov"]))
+
+        skills = sheet["skills"]
+        parts.append(_COUNT_BYTE.pack(len(skills)))
+        for skill_type, entries in skills.items():
+            _put_text(parts, skill_type)
+            parts.append(_COUNT.pack(len(entries)))
+            for name, values in entries.items():
+                _put_text(parts, name)
+                parts.append(_VALUES.pack(values["full"], values["half"]))
+
+        status = sheet["status"]
+        modifiers = status["modifiers"]
+        parts.append(_STATUS.pack(status["damage_taken"], status.get("turn", 0), len(modifiers)))
+        for modifier in modifiers:
+            duration = modifier.get("duration")
+            if not isinstance(duration, int):
+                raise ValueError(f"Duração de modificador não serializável: {duration!r}")
+            expires_at = modifier.get("expires_at")
+            _put_text(parts, modifier.get("skill"))
+            _put_text(parts, modifier.get("type"))
+            parts.append(_MODIFIER.pack(_HAS_EXPIRY if expires_at is not None else 0, duration,
+                                        expires_at if expires_at is not None else 0))
+
+        inventory = sheet.get("inventory", {})
+        if isinstance(inventory, list):
+            inventory = {"equipment": inventory}
+        for category in INVENTORY_CATEGORIES:
+            items = inventory.get(category, ())
+            counts = items if isinstance(items, Counter) else Counter(items)
+            parts.append(_COUNT.pack(len(counts)))
+            for item, count in counts.items():
+                _put_text(parts, item)
+                parts.append(_COUNT.pack(count))
+    except struct.error as e:
+        raise ValueError(f"Valor fora do intervalo do formato binário: {e}") from e
+
+    extra = {key: value for key, value in sheet.items()
+             if key not in _STRUCTURED_SECTIONS and value}
+    if extra:
+        blob = json.dumps(extra, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        parts.append(_BLOB_LENGTH.pack(len(blob)))
+        parts.append(blob)
+    else:
+        parts.append(_BLOB_LENGTH.pack(0))
+    return b"".join(parts)
+
+
+class _Reader:
+    """Cursor de leitura sobre os bytes serializados."""
+
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def unpack(self, layout: struct.Struct) -> tuple:
+        values = layout.unpack_from(self.data, self.pos)
+        self.pos += layout.size
+        return values
+
+    def text(self) -> Optional[str]:
+        length, = _TEXT_LENGTH.unpack_from(self.data, self.pos)
+        self.pos += 2
+        if length == _NONE_TEXT:
+            return None
+        end = self.pos + length
+        text = self.data[self.pos:end].decode("utf-8")
+        self.pos = end
+        return text
+
+
+def decode_character(data: bytes, rng=None, dice_engine=None,
+                     history: Optional[List[Dict[str, Any]]] = None) -> Character:
+    """
+    Reconstrói um Character a partir de encode_character().
+
+    Args:
+        data: Bytes serializados
+        rng: Gerador aleatório do novo personagem
+        dice_engine: Backend de dados do novo personagem
+        history: Histórico de páginas a reanexar (padrão: vazio)
+
+    Returns:
+        Novo Character independente
+
+    Raises:
+        ValueError: Se os bytes não forem deste formato ou de versão desconhecida
+    """
+    data = bytes(data)
+    try:
+        reader = _Reader(data)
+        magic, version = reader.unpack(_HEADER)
+        if magic != MAGIC:
+            raise ValueError("Bytes não contêm um Character serializado")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Versão do formato não suportada: {version} (esperada {FORMAT_VERSION})")
+
+        info = {"name": reader.text(), "occupation": reader.text()}
+        info["age"], = reader.unpack(_AGE)
+        info["backstory"] = reader.text()
+
+        characteristics = {}
+        for _ in range(reader.unpack(_COUNT_BYTE)[0]):
+            name = reader.text()
+            full, half = reader.unpack(_VALUES)
+            characteristics[name] = {"full": full, "half": half}
+
+        luck_start, luck_current, magic_start, magic_current, mov = reader.unpack(_RESOURCES)
+        resources = {
+            "luck": {"starting": luck_start, "current": luck_current},
+            "magic_pts": {"starting": magic_start, "current": magic_current},
+            "mov": mov
+        }
+
+        skills = {}
+        for _ in range(reader.unpack(_COUNT_BYTE)[0]):
+            entries = skills[reader.text()] = {}
+            for _ in range(reader.unpack(_COUNT)[0]):
+                name = reader.text()
+                full, half = reader.unpack(_VALUES)
+                entries[name] = {"full": full, "half": half}
+
+        damage_taken, turn, modifier_count = reader.unpack(_STATUS)
+        modifiers = []
+        for _ in range(modifier_count):
+            modifier = {"skill": reader.text(), "type": reader.text()}
+            flags, modifier["duration"], expires_at = reader.unpack(_MODIFIER)
+            if flags & _HAS_EXPIRY:
+                modifier["expires_at"] = expires_at
+            modifiers.append(modifier)
+
+        inventory = {}
+        for category in INVENTORY_CATEGORIES:
+            items = inventory[category] = Counter()
+            for _ in range(reader.unpack(_COUNT)[0]):
+                item = reader.text()
+                items[item], = reader.unpack(_COUNT)
+
+        blob_length, = reader.unpack(_BLOB_LENGTH)
+        extra = json.loads(data[reader.pos:reader.pos + blob_length]) if blob_length else {}
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Bytes de Character corrompidos ou truncados: {e}") from e
+
+    sheet = {
+        "info": info,
+        "contacts": extra.pop("contacts", {}),
+        "case_files": extra.pop("case_files", []),
+        "characteristics": characteristics,
+        "resources": resources,
+        "skills": skills,
+        "status": {
+            "damage_levels": DAMAGE_LEVELS,
+            "damage_taken": damage_taken,
+            "turn": turn,
+            "modifiers": modifiers
+        },
+        "inventory": inventory,
+        "page_history": HistoryBuffer(HISTORY_CAPACITY, history or ())
+    }
+    sheet.update(extra)
+    return Character.from_sheet(sheet, rng=rng, dice_engine=dice_engine)
+
+
+# Teste e validação
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+
+    print("=== TESTE DO CHARACTER CODEC ===\n")
+
+    character = Character(rng=random.Random(1))
+    with contextlib.redirect_stdout(io.StringIO()):
+        character.set_occupation("Nurse")
+    character.take_damage(1)
+    character.add_modifier("Social", "bonus_dice", 2)
+    character.add_item("Bandage")
+    character.add_to_history(1, "Texto da página", {"goto": 2})
+
+    data = encode_character(character)
+    print(f"1. {len(data)} bytes (versão {FORMAT_VERSION}, sem histórico)")
+
+    restored = decode_character(data, rng=random.Random(2), history=character.get_history())
+    print(f"2. Ficha restaurada igual à original: {restored.sheet == character.sheet}")
+
+    try:
+        decode_character(data[:10])
+    except ValueError as e:
+        print(f"3. Bytes truncados rejeitados: {e}")
+
+    print("\n=== TESTE CONCLUÍDO ===")
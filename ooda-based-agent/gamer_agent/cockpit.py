@@ -10,9 +10,20 @@ A estrutura é dividida em:
 - Body: Estado atual do personagem (ficha, status, inventário, histórico)
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 from character import Character
+from history_buffer import HistoryArchive
+
+
+# Ícone de cada nível de dano no status do personagem
+HEALTH_ICONS = {
+    "Healthy": "💚",
+    "Hurt": "💛",
+    "Bloodied": "🧡",
+    "Down": "❤️",
+    "Impaired": "💜"
+}
 
 
 class Cockpit:
@@ -24,16 +35,25 @@ class Cockpit:
     de forma compacta e organizada, separando a apresentação da lógica de decisão.
     """
     
-    def __init__(self, character: Character, pages_data: Dict[int, Dict]):
+    def __init__(self, character: Character, pages_data: Dict[int, Dict],
+                 history_archive: Optional[HistoryArchive] = None):
         """
         Inicializa o Cockpit.
         
         Args:
             character: Instância da classe Character
             pages_data: Dicionário com todas as páginas do jogo
+            history_archive: Arquivo JSONL que recebe as entradas descartadas do
+                histórico (None = descartar)
         """
         self.character = character
         self.pages_data = pages_data
+        self.history_archive = history_archive
+        # Cache de render_character_status: chave -> (versão da seção, valor)
+        self._status_cache: Dict[str, Any] = {}
+        self._status_owner: Optional[Character] = None
+        # Fragmentos JSON das entradas do histórico: id(entrada) -> (entrada, fragmento)
+        self._history_fragments: Dict[int, Any] = {}
         self.current_page_number = None
         self.current_page_data = None
         
@@ -108,80 +128,105 @@ INSTRUCTIONS:
         """
         Retorna o status atual do personagem como objeto estruturado.
         
+        Cada parte do status é mantida em cache junto com a versão da seção da
+        ficha de origem (Character.section_version) e só é reconstruída quando
+        essa seção muda; sem alterações, a chamada apenas monta o dicionário
+        externo. As partes são compartilhadas entre chamadas: trate o resultado
+        como somente leitura.
+        
         Returns:
             Dicionário com todas as informações do personagem organizadas por categoria
         """
+        character = self.character
+        if self._status_owner is not character:
+            # Outro personagem (ex.: nova partida): descartar todo o cache
+            self._status_cache = {}
+            self._status_owner = character
+        
+        cache = self._status_cache
+        status = {}
+        for key, section, builder in self._STATUS_PARTS:
+            version = character.section_version(section)
+            cached = cache.get(key)
+            if cached is None or cached[0] != version:
+                cached = cache[key] = (version, builder(self, character))
+            status[key] = cached[1]
+        return status
+    
+    def _status_character_info(self, character: Character) -> Dict[str, Any]:
+        return {
+            "name": character.name,
+            "occupation": character.occupation,
+            "age": character.age
+        }
+    
+    def _status_health(self, character: Character) -> Dict[str, Any]:
         # Status de saúde usando o novo sistema
-        health_status = self.character.get_health_status()
+        health_status = character.get_health_status()
         current_health = health_status["current_level"]
-        damage_taken = health_status["damage_taken"]
-        
-        health_icons = {
-            "Healthy": "💚",
-            "Hurt": "💛", 
-            "Bloodied": "🧡",
-            "Down": "❤️",
-            "Impaired": "💜"
+        return {
+            "current_level": current_health,
+            "damage_taken": health_status["damage_taken"],
+            "icon": HEALTH_ICONS.get(current_health, '❓'),
+            "turn": character.turn
         }
-        
-        # Recursos usando métodos da Character
-        luck_data = self.character.get_luck()
-        print(f"Luck data: {luck_data}")
-        magic_data = self.character.get_magic_points()
-        
+    
+    def _status_resources(self, character: Character) -> Dict[str, Any]:
+        luck_data = character.get_luck()
+        magic_data = character.get_magic_points()
+        return {
+            "luck": {
+                "current": luck_data['current'],
+                "starting": luck_data['starting']
+            },
+            "magic": {
+                "current": magic_data['current'],
+                "starting": magic_data['starting']
+            }
+        }
+    
+    def _status_characteristics(self, character: Character) -> Dict[str, Any]:
         # Características principais usando métodos da Character
         characteristics = {}
-        char_names = ["STR", "CON", "DEX", "INT", "POW"]
-        for char_name in char_names:
+        for char_name in ["STR", "CON", "DEX", "INT", "POW"]:
             try:
-                char_data = self.character.get_characteristic(char_name)
+                char_data = character.get_characteristic(char_name)
                 characteristics[char_name] = {
                     "full": char_data['full'],
                     "half": char_data['half']
                 }
             except KeyError:
                 continue
-        
+        return characteristics
+    
+    def _status_skills(self, character: Character) -> Dict[str, Any]:
         # Habilidades organizadas por categoria
-        skills = self.character.get_all_skills()
-        
-        # Inventário usando métodos da Character
-        inventory = self.character.get_inventory()
-        
-        # Modificadores ativos usando métodos da Character
-        modifiers = self.character.get_modifiers()
-        
-        # Retornar objeto estruturado
+        return character.get_all_skills()
+    
+    def _status_inventory(self, character: Character) -> Dict[str, Any]:
+        # Inventário (visão somente leitura em cache na Character)
+        inventory = character.inventory_view()
         return {
-            "character_info": {
-                "name": self.character.name,
-                "occupation": self.character.occupation,
-                "age": self.character.age
-            },
-            "health_status": {
-                "current_level": current_health,
-                "damage_taken": damage_taken,
-                "icon": health_icons.get(current_health, '❓')
-            },
-            "resources": {
-                "luck": {
-                    "current": luck_data['current'],
-                    "starting": luck_data['starting']
-                },
-                "magic": {
-                    "current": magic_data['current'],
-                    "starting": magic_data['starting']
-                }
-            },
-            "characteristics": characteristics,
-            "skills": skills,
-            "inventory": {
-                "equipment": inventory.get('equipment', []),
-                "weapons": inventory.get('weapons', [])
-            },
-            "modifiers": modifiers if modifiers else []
+            "equipment": inventory.get('equipment', []),
+            "weapons": inventory.get('weapons', [])
         }
     
+    def _status_modifiers(self, character: Character) -> list:
+        # Modificadores ativos usando métodos da Character
+        modifiers = character.get_modifiers()
+        return modifiers if modifiers else []
+    
+    # Partes do status: (chave no resultado, seção da ficha de origem, construtor)
+    _STATUS_PARTS = (
+        ("character_info", "info", _status_character_info),
+        ("health_status", "status", _status_health),
+        ("resources", "resources", _status_resources),
+        ("characteristics", "characteristics", _status_characteristics),
+        ("skills", "skills", _status_skills),
+        ("inventory", "inventory", _status_inventory),
+        ("modifiers", "status", _status_modifiers),
+    )
+    
     def render_current_situation(self) -> str:
         """
         Renderiza a situação atual (página atual e opções disponíveis).
@@ -217,6 +262,10 @@ INSTRUCTIONS:
     def render_history(self, max_entries: int = 3) -> str:
         """
         Renderiza o histórico de decisões em formato JSON estruturado
+        
+        O JSON de cada entrada é formatado uma única vez (ao ser adicionada) e
+        mantido em cache; aqui a janela é apenas montada a partir dos
+        fragmentos, com o mesmo resultado de json.dumps(indent=2).
     
         Args:
             max_entries: Número máximo de entradas a exibir (padrão: 3)
@@ -233,79 +282,105 @@ INSTRUCTIONS:
                 "entries": []
             }, indent=2, ensure_ascii=False)
         
-        # Limitar o número de entradas
-        recent_history = history[-max_entries:] if len(history) > max_entries else history
+        # Limitar o número de entradas (visão sem cópia)
+        recent_history = history.last(max_entries)
         
         formatted_entries = []
         
         for i, entry in enumerate(recent_history, 1):
-            # APENAS formato moderno (dicionário) - SEM suporte legado
-            if not isinstance(entry, dict):
+            fragment = self._history_fragment(entry)
+            if fragment is None:
                 print(f"AVISO: Entrada de histórico inválida ignorada: {type(entry)}")
                 continue
-                
-            # Formato moderno: dicionário completo
-            page_number = entry.get('page_number', 0)
-            page_text = entry.get('page_text', '')
-            choice_made = entry.get('choice_made', {})
+            # "step" depende da posição na janela: é o único campo inserido aqui
+            formatted_entries.append(f'    {{\n      "step": {i},\n{fragment}')
+        
+        # Construir objeto final (mesmo layout de json.dumps com indent=2)
+        summary = json.dumps(f"Últimas {len(formatted_entries)} decisões do agente", ensure_ascii=False)
+        entries = "[\n" + ",\n".join(formatted_entries) + "\n  ]" if formatted_entries else "[]"
+        return (f'{{\n  "history_summary": {summary},\n  "total_decisions": {len(history)},'
+                f'\n  "entries": {entries}\n}}')
+    
+    def _history_fragment(self, entry: Any) -> Optional[str]:
+        """
+        Fragmento JSON em cache de uma entrada do histórico.
+        
+        Returns:
+            Linhas da entrada sem "step", já indentadas para a lista "entries",
+            ou None se a entrada for inválida
+        """
+        cached = self._history_fragments.get(id(entry))
+        if cached is not None and cached[0] is entry:
+            return cached[1]
+        
+        fragment = self._format_history_entry(entry)
+        if len(self._history_fragments) >= 2 * self.character.get_history().capacity:
+            # Entradas que saíram do histórico (restore, clear_history) deixam o cache
+            live = {id(item) for item in self.character.get_history()}
+            self._history_fragments = {key: value for key, value in self._history_fragments.items() if key in live}
+        self._history_fragments[id(entry)] = (entry, fragment)
+        return fragment
+    
+    def _format_history_entry(self, entry: Any) -> Optional[str]:
+        """Formata uma entrada do histórico (sem "step") como fragmento JSON."""
+        # APENAS formato moderno (dicionário) - SEM suporte legado
+        if not isinstance(entry, dict):
+            return None
+            
+        # Formato moderno: dicionário completo
+        page_number = entry.get('page_number', 0)
+        page_text = entry.get('page_text', '')
+        choice_made = entry.get('choice_made', {})
 
-            # Truncamento inteligente dos últimos 50 caracteres preservando palavras
-            truncated_text = self._smart_truncate_text(page_text, 50)
+        # Truncamento inteligente dos últimos 50 caracteres preservando palavras
+        truncated_text = self._smart_truncate_text(page_text, 50)
 
-            # Construir resultado da ação
-            action_result = {}
-            
-            # Adicionar outcome executado
-            if 'executed_outcome' in choice_made:
-                action_result['executed_outcome'] = choice_made['executed_outcome']
-            
-            # Adicionar resultados de roll
-            if 'roll_result' in choice_made:
-                action_result['roll_result'] = choice_made['roll_result']
-                action_result['skill_used'] = choice_made.get('skill_used', '')
-                action_result['target_value'] = choice_made.get('target_value', 0)
-                action_result['success'] = choice_made.get('success', False)
-            
-            # Adicionar resultados de opposite roll
-            if 'opposite_roll' in choice_made:
-                action_result['opposite_roll'] = choice_made['opposite_roll']
-            
-            # Adicionar efeitos aplicados
-            if 'effects_applied' in choice_made and choice_made['effects_applied']:
-                action_result['effects_applied'] = choice_made['effects_applied']
-            
-            # Adicionar goto executado
-            if 'goto_executed' in choice_made:
-                action_result['goto_executed'] = choice_made['goto_executed']
-            
-            # Limpar choice_made dos campos de resultado para separar decisão de execução
-            clean_choice = {k: v for k, v in choice_made.items() 
-                           if k not in ['executed_outcome', 'roll_result', 'skill_used', 
-                                       'target_value', 'success', 'opposite_roll', 
-                                       'effects_applied', 'goto_executed']}
-            
-            # Construir entrada formatada (SIMPLIFICADA - sem original_choices e choice_index)
-            formatted_entry = {
-                "step": i,
-                "page_number": page_number,
-                "page_text": truncated_text,
-                "choice_made": clean_choice if clean_choice else {"empty_choice": True}
-            }
-            
-            # Adicionar resultado da ação apenas se não estiver vazio
-            if action_result:
-                formatted_entry["action_result"] = action_result
-            
-            formatted_entries.append(formatted_entry)
+        # Construir resultado da ação
+        action_result = {}
+        
+        # Adicionar outcome executado
+        if 'executed_outcome' in choice_made:
+            action_result['executed_outcome'] = choice_made['executed_outcome']
+        
+        # Adicionar resultados de roll
+        if 'roll_result' in choice_made:
+            action_result['roll_result'] = choice_made['roll_result']
+            action_result['skill_used'] = choice_made.get('skill_used', '')
+            action_result['target_value'] = choice_made.get('target_value', 0)
+            action_result['success'] = choice_made.get('success', False)
+        
+        # Adicionar resultados de opposite roll
+        if 'opposite_roll' in choice_made:
+            action_result['opposite_roll'] = choice_made['opposite_roll']
         
-        # Construir objeto final
-        history_json = {
-            "history_summary": f"Últimas {len(formatted_entries)} decisões do agente",
-            "total_decisions": len(history),
-            "entries": formatted_entries
+        # Adicionar efeitos aplicados
+        if 'effects_applied' in choice_made and choice_made['effects_applied']:
+            action_result['effects_applied'] = choice_made['effects_applied']
+        
+        # Adicionar goto executado
+        if 'goto_executed' in choice_made:
+            action_result['goto_executed'] = choice_made['goto_executed']
+        
+        # Limpar choice_made dos campos de resultado para separar decisão de execução
+        clean_choice = {k: v for k, v in choice_made.items() 
+                       if k not in ['executed_outcome', 'roll_result', 'skill_used', 
+                                   'target_value', 'success', 'opposite_roll', 
+                                   'effects_applied', 'goto_executed']}
+        
+        # Construir entrada formatada (SIMPLIFICADA - sem original_choices e choice_index)
+        formatted_entry = {
+            "page_number": page_number,
+            "page_text": truncated_text,
+            "choice_made": clean_choice if clean_choice else {"empty_choice": True}
         }
         
-        return json.dumps(history_json, indent=2, ensure_ascii=False)
+        # Adicionar resultado da ação apenas se não estiver vazio
+        if action_result:
+            formatted_entry["action_result"] = action_result
+        
+        # Sem o "{" inicial; cada linha recuada para a profundidade de "entries"
+        lines = json.dumps(formatted_entry, indent=2, ensure_ascii=False).split("\n")[1:]
+        return "\n".join("    " + line for line in lines)
         
     def add_to_history(self, page_number: int, page_text: str, choice_made: Dict[str, Any], choice_index: int = None, reason: str = None):
         """
@@ -317,18 +392,12 @@ INSTRUCTIONS:
             choice_made: Objeto choice completo que foi escolhido
             choice_index: Índice da escolha (opcional)
         """
-        self.character.add_to_history(page_number, page_text, choice_made, choice_index, reason)
-
-        # Manter apenas as últimas 30 entradas para evitar overflow
-        history = self.character.get_history()
-        if len(history) > 30:
-            # Manter apenas as últimas 30 entradas
-            self.character.clear_history()
-            for entry in history[-30:]:
-                self.character.add_to_history(
-                    entry['page_number'],
-                    entry['page_text'],
-                    entry['choice_made'],
-                    entry.get('choice_index'),
-                    entry.get('reason')
-                )
+        # O histórico da Character é um buffer circular (últimas HISTORY_CAPACITY entradas)
+        evicted = self.character.add_to_history(page_number, page_text, choice_made, choice_index, reason)
+        if evicted is not None:
+            self._history_fragments.pop(id(evicted), None)
+            if self.history_archive is not None:
+                self.history_archive.append(evicted)
+        
+        # Formatar o JSON da nova entrada uma única vez (usado por render_history)
+        self._history_fragment(self.character.get_history()[-1])
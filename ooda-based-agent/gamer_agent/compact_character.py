@@ -0,0 +1,249 @@
+"""
+Compact Character Module - Representação compacta do estado do personagem
+
+Este módulo implementa o CompactCharacter, uma forma congelada e econômica em
+memória de um Character, para manter dezenas de milhares de estados em
+simulações paralelas e árvores de busca.
+
+- __slots__: sem __dict__ por instância
+- características e habilidades em arrays de inteiros, indexados por IDs de
+  um registro global de nomes (compartilhado por todas as instâncias)
+- half não é armazenado quando segue a regra padrão (full // 2)
+- textos fixos (rótulos de dano, ocupação, nomes) são compartilhados
+
+A propriedade sheet reconstrói sob demanda a ficha no formato de dicionário
+de Character.sheet (dicionários novos a cada leitura), e
+expand() devolve um Character completo para continuar a partida.
+"""
+
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from character import Character, DAMAGE_LEVELS, HISTORY_CAPACITY
+from history_buffer import HistoryBuffer
+
+
+# Características em ordem fixa (IDs 0-4)
+CHARACTERISTIC_IDS = {name: index for index, name in enumerate(("STR", "CON", "DEX", "INT", "POW"))}
+
+# Tipos de habilidade (código armazenado em skill_types; -1 = ausente)
+SKILL_TYPES = ("common", "combat", "expert")
+
+# Registro global nome -> ID de habilidade (cresce conforme novas habilidades aparecem)
+SKILL_IDS: Dict[str, int] = {}
+_SKILL_NAMES: List[str] = []
+
+
+def skill_id(name: str) -> int:
+    """Obtém (registrando se necessário) o ID de uma habilidade."""
+    index = SKILL_IDS.get(name)
+    if index is None:
+        index = SKILL_IDS[name] = len(_SKILL_NAMES)
+        _SKILL_NAMES.append(name)
+    return index
+
+
+class CompactCharacter:
+    """
+    Estado congelado de um Character em formato compacto.
+
+    Criado por Character.compact() (ou from_character); não é alterado depois
+    da criação.
+    """
+
+    __slots__ = (
+        "name", "occupation", "age", "backstory",
+        "characteristics", "characteristic_halves",
+        "skill_values", "skill_types", "skill_halves",
+        "luck", "magic", "mov", "damage_taken", "turn",
+        "modifiers", "equipment", "weapons",
+        "page_history", "extra"
+    )
+
+    @classmethod
+    def from_character(cls, character: Character) -> "CompactCharacter":
+        """
+        Compacta o estado atual de um Character.
+
+        Args:
+            character: Personagem de origem (não é modificado)
+
+        Returns:
+            Novo CompactCharacter
+        """
+        sheet = character._sheet
+        compact = cls.__new__(cls)
+
+        info = sheet["info"]
+        compact.name = info["name"]
+        compact.occupation = info["occupation"]
+        compact.age = info["age"]
+        compact.backstory = info["backstory"]
+
+        characteristics = sheet["characteristics"]
+        compact.characteristics = array("h", (characteristics[name]["full"] for name in CHARACTERISTIC_IDS))
+        compact.characteristic_halves = None
+        if any(characteristics[name]["half"] != characteristics[name]["full"] // 2 for name in CHARACTERISTIC_IDS):
+            compact.characteristic_halves = array("h", (characteristics[name]["half"] for name in CHARACTERISTIC_IDS))
+
+        entries = []
+        for type_code, skill_type in enumerate(SKILL_TYPES):
+            for skill_name, values in sheet["skills"][skill_type].items():
+                entries.append((skill_id(skill_name), type_code, values))
+        size = max((entry[0] for entry in entries), default=-1) + 1
+        compact.skill_values = array("h", [-1]) * size
+        compact.skill_types = array("b", [-1]) * size
+        compact.skill_halves = None
+        for index, type_code, values in entries:
+            # Se a habilidade existir em mais de um tipo, vale a ordem de precedência
+            if compact.skill_types[index] == -1:
+                compact.skill_values[index] = values["full"]
+                compact.skill_types[index] = type_code
+                if values["half"] != values["full"] // 2:
+                    if compact.skill_halves is None:
+                        compact.skill_halves = {}
+                    compact.skill_halves[index] = values["half"]
+
+        resources = sheet["resources"]
+        compact.luck = (resources["luck"]["starting"], resources["luck"]["current"])
+        compact.magic = (resources["magic_pts"]["starting"], resources["magic_pts"]["current"])
+        compact.mov = resources["mov"]
+
+        status = sheet["status"]
+        compact.damage_taken = status["damage_taken"]
+        compact.turn = status.get("turn", 0)
+        compact.modifiers = tuple((mod.get("skill"), mod.get("type"), mod.get("duration"), mod.get("expires_at"))
+                                  for mod in status["modifiers"])
+
+        # Inventário como pares (item, quantidade), na ordem de inserção
+        inventory = sheet["inventory"]
+        if isinstance(inventory, list):
+            inventory = {"equipment": inventory}
+        compact.equipment = tuple(Counter(inventory.get("equipment", ())).items())
+        compact.weapons = tuple(Counter(inventory.get("weapons", ())).items())
+        compact.page_history = tuple(sheet["page_history"])
+
+        # Seções raramente usadas (e características fora das 5 padrão) só
+        # ocupam espaço quando preenchidas
+        extra = {key: sheet[key] for key in ("contacts", "case_files") if sheet.get(key)}
+        other_characteristics = {name: values for name, values in characteristics.items()
+                                 if name not in CHARACTERISTIC_IDS}
+        if other_characteristics:
+            extra["characteristics"] = other_characteristics
+        compact.extra = Character._copy_sections(extra) if extra else None
+        return compact
+
+    # Consultas diretas (sem construir a ficha)
+    def get_characteristic(self, char_name: str) -> Dict[str, int]:
+        """Valores full/half de uma característica (KeyError se não existir)."""
+        index = CHARACTERISTIC_IDS[char_name]
+        full = self.characteristics[index]
+        half = self.characteristic_halves[index] if self.characteristic_halves is not None else full // 2
+        return {"full": full, "half": half}
+
+    def get_skill(self, skill_name: str) -> Tuple[str, Dict[str, int]]:
+        """
+        Tipo e valores full/half de uma habilidade.
+
+        Raises:
+            KeyError: Se a habilidade não existir
+        """
+        index = SKILL_IDS.get(skill_name, -1)
+        if index < 0 or index >= len(self.skill_types) or self.skill_types[index] < 0:
+            raise KeyError(f"Habilidade '{skill_name}' não encontrada")
+        full = self.skill_values[index]
+        half = self.skill_halves.get(index, full // 2) if self.skill_halves else full // 2
+        return SKILL_TYPES[self.skill_types[index]], {"full": full, "half": half}
+
+    def is_alive(self) -> bool:
+        """Verifica se o personagem está vivo (não Impaired)."""
+        return self.damage_taken < len(DAMAGE_LEVELS) - 1
+
+    @property
+    def sheet(self) -> Dict[str, Any]:
+        """
+        Ficha no formato de Character.sheet.
+
+        Cada leitura constrói dicionários novos: alterá-los não afeta o
+        CompactCharacter. Use expand() para obter um personagem alterável.
+        """
+        return self._build_sheet()
+
+    def _build_sheet(self) -> Dict[str, Any]:
+        """Reconstrói a ficha completa em dicionários novos."""
+        extra = Character._copy_sections(self.extra) if self.extra else {}
+        characteristics = {name: self.get_characteristic(name) for name in CHARACTERISTIC_IDS}
+        characteristics.update(extra.get("characteristics", {}))
+        skills: Dict[str, Dict[str, Dict[str, int]]] = {skill_type: {} for skill_type in SKILL_TYPES}
+        for index, type_code in enumerate(self.skill_types):
+            if type_code >= 0:
+                full = self.skill_values[index]
+                half = self.skill_halves.get(index, full // 2) if self.skill_halves else full // 2
+                skills[SKILL_TYPES[type_code]][_SKILL_NAMES[index]] = {"full": full, "half": half}
+
+        return {
+            "info": {"name": self.name, "occupation": self.occupation, "age": self.age, "backstory": self.backstory},
+            "contacts": extra.get("contacts", {}),
+            "case_files": extra.get("case_files", []),
+            "characteristics": characteristics,
+            "resources": {
+                "luck": {"starting": self.luck[0], "current": self.luck[1]},
+                "magic_pts": {"starting": self.magic[0], "current": self.magic[1]},
+                "mov": self.mov
+            },
+            "skills": skills,
+            "status": {
+                "damage_levels": list(DAMAGE_LEVELS),
+                "damage_taken": self.damage_taken,
+                "turn": self.turn,
+                "modifiers": [
+                    {"skill": skill, "type": kind, "duration": duration, "expires_at": expires_at}
+                    if expires_at is not None else {"skill": skill, "type": kind, "duration": duration}
+                    for skill, kind, duration, expires_at in self.modifiers
+                ]
+            },
+            "inventory": {"equipment": Counter(dict(self.equipment)), "weapons": Counter(dict(self.weapons))},
+            "page_history": HistoryBuffer(HISTORY_CAPACITY, self.page_history)
+        }
+
+    def expand(self, rng=None, dice_engine=None) -> Character:
+        """
+        Reconstrói um Character completo e independente a partir deste estado.
+
+        Args:
+            rng: Gerador aleatório do novo personagem
+            dice_engine: Backend de dados do novo personagem
+
+        Returns:
+            Novo Character
+        """
+        return Character.from_sheet(self._build_sheet(), rng=rng, dice_engine=dice_engine)
+
+    def __repr__(self) -> str:
+        return f"CompactCharacter(name={self.name!r}, occupation={self.occupation!r}, damage={self.damage_taken})"
+
+
+# Teste e validação
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+
+    print("=== TESTE DO COMPACT CHARACTER ===\n")
+
+    character = Character(rng=random.Random(1))
+    with contextlib.redirect_stdout(io.StringIO()):
+        character.set_occupation("Police Officer")
+    character.take_damage(1)
+    character.add_item("Flashlight")
+
+    compact = character.compact()
+    print(f"1. {compact}")
+    print(f"   Firearms: {compact.get_skill('Firearms')}")
+    print(f"   Ficha reconstruída igual à original: {compact.sheet == character.sheet}")
+
+    restored = compact.expand(rng=random.Random(2))
+    print(f"2. Personagem expandido: {restored!r} dano={restored.get_health_status()['damage_taken']}")
+
+    print("\n=== TESTE CONCLUÍDO ===")
@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+from game_repository import SNAPSHOT_DIR_ENV
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _snapshot_dir_outside_source_tree(tmp_path_factory):
+    """Snapshots de conteúdo dos testes vão para um diretório temporário."""
+    previous = os.environ.get(SNAPSHOT_DIR_ENV)
+    os.environ[SNAPSHOT_DIR_ENV] = str(tmp_path_factory.mktemp("content_cache"))
+    yield
+    if previous is None:
+        os.environ.pop(SNAPSHOT_DIR_ENV, None)
+    else:
+        os.environ[SNAPSHOT_DIR_ENV] = previous
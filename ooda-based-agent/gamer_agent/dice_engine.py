@@ -0,0 +1,216 @@
+"""
+Dice Engine Module - Backends de rolagem D100 plugáveis no Character
+
+Este módulo separa a geração dos dados da lógica do Character:
+
+- ScalarDiceEngine: caminho escalar padrão, usado no jogo interativo. Consome o
+  rng na mesma ordem de sempre (dezena 1, dezena 2, unidade), preservando a
+  reprodutibilidade das partidas semeadas.
+- NumpyDiceEngine: backend vetorizado com NumPy para simulações Monte Carlo.
+  Gera lotes inteiros de rolagens (com bonus/penalty dice) e avalia os níveis
+  de sucesso em arrays, com a mesma semântica de Character._evaluate_roll_result.
+  Rolagens avulsas são servidas a partir de um buffer pré-gerado.
+
+NumPy é opcional: sem ele, apenas o ScalarDiceEngine fica disponível.
+"""
+
+import random
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from dice_probability import SUCCESS_LEVELS, evaluate_level
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None
+
+
+NUMPY_AVAILABLE = np is not None
+
+
+class ScalarDiceEngine:
+    """Backend escalar: uma rolagem por chamada usando random.Random."""
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        """
+        Inicializa o backend escalar.
+
+        Args:
+            rng: Gerador aleatório (padrão: módulo global random)
+        """
+        self._rng = rng if rng is not None else random
+
+    def roll_d100(self, bonus_dice: bool = False, penalty_dice: bool = False) -> int:
+        """
+        Executa uma rolagem D100 com suporte para bonus/penalty dice.
+
+        Args:
+            bonus_dice: Se True, usa o menor dos dois dados de dezena
+            penalty_dice: Se True, usa o maior dos dois dados de dezena
+
+        Returns:
+            Resultado da rolagem (1-100)
+        """
+        tens_roll_1 = self._rng.randint(0, 9) * 10
+        tens_roll_2 = self._rng.randint(0, 9) * 10
+        units_roll = self._rng.randint(1, 10)
+
+        # Bonus e penalty dice se anulam
+        if bonus_dice and penalty_dice:
+            bonus_dice = False
+            penalty_dice = False
+
+        if bonus_dice:
+            final_tens = min(tens_roll_1, tens_roll_2)
+        elif penalty_dice:
+            final_tens = max(tens_roll_1, tens_roll_2)
+        else:
+            final_tens = tens_roll_1
+
+        # Calcula resultado final
+        if final_tens == 0 and units_roll == 10:
+            return 100
+        elif final_tens == 0:
+            return units_roll
+        else:
+            return final_tens + (units_roll % 10)
+
+    def roll_d100_batch(self, n: int, bonus_dice: bool = False, penalty_dice: bool = False) -> List[int]:
+        """Executa N rolagens D100 em sequência."""
+        return [self.roll_d100(bonus_dice, penalty_dice) for _ in range(n)]
+
+    def evaluate_levels(self, rolls: Sequence[int], target_value: int, half_value: int) -> List[int]:
+        """Avalia o nível de sucesso de cada rolagem."""
+        return [evaluate_level(roll, target_value, half_value) for roll in rolls]
+
+    def count_levels(self, levels: Sequence[int]) -> Dict[int, int]:
+        """Conta quantas rolagens caíram em cada nível (5 a 1)."""
+        counts = Counter(levels)
+        return {level: counts[level] for level in SUCCESS_LEVELS}
+
+
+class NumpyDiceEngine:
+    """
+    Backend vetorizado: gera e avalia rolagens D100 em arrays NumPy.
+
+    Rolagens avulsas (roll_d100) consomem um buffer de componentes pré-gerados,
+    reabastecido em lotes de buffer_size.
+    """
+
+    def __init__(self, seed: Union[int, "np.random.Generator", None] = None, buffer_size: int = 4096):
+        """
+        Inicializa o backend NumPy.
+
+        Args:
+            seed: Semente ou numpy.random.Generator já criado
+            buffer_size: Quantidade de rolagens pré-geradas para chamadas avulsas
+
+        Raises:
+            ImportError: Se NumPy não estiver instalado
+        """
+        if np is None:
+            raise ImportError("NumpyDiceEngine requer NumPy (pip install numpy)")
+
+        self._generator = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        self._buffer_size = max(1, buffer_size)
+        self._tens_1: List[int] = []
+        self._tens_2: List[int] = []
+        self._units: List[int] = []
+        self._position = 0
+
+    def _draw_components(self, n: int):
+        """Sorteia N triplas (dezena 1, dezena 2, unidade) de uma vez."""
+        tens_1 = self._generator.integers(0, 10, n, dtype=np.int16) * 10
+        tens_2 = self._generator.integers(0, 10, n, dtype=np.int16) * 10
+        units = self._generator.integers(1, 11, n, dtype=np.int16)
+        return tens_1, tens_2, units
+
+    @staticmethod
+    def _combine(tens_1, tens_2, units, bonus_dice: bool, penalty_dice: bool):
+        """Combina componentes em resultados D100 (mesmas regras do caminho escalar)."""
+        if bonus_dice and penalty_dice:
+            bonus_dice = penalty_dice = False
+
+        if bonus_dice:
+            final_tens = np.minimum(tens_1, tens_2)
+        elif penalty_dice:
+            final_tens = np.maximum(tens_1, tens_2)
+        else:
+            final_tens = tens_1
+
+        # 00 + 0 (unidade 10) é 100; nos demais casos dezena + (unidade % 10)
+        rolls = final_tens + units % 10
+        rolls[rolls == 0] = 100
+        return rolls
+
+    def roll_d100(self, bonus_dice: bool = False, penalty_dice: bool = False) -> int:
+        """
+        Executa uma rolagem D100 a partir do buffer pré-gerado.
+
+        Args:
+            bonus_dice: Se True, usa o menor dos dois dados de dezena
+            penalty_dice: Se True, usa o maior dos dois dados de dezena
+
+        Returns:
+            Resultado da rolagem (1-100)
+        """
+        if self._position >= len(self._units):
+            tens_1, tens_2, units = self._draw_components(self._buffer_size)
+            self._tens_1, self._tens_2, self._units = tens_1.tolist(), tens_2.tolist(), units.tolist()
+            self._position = 0
+
+        i = self._position
+        self._position += 1
+        tens_1, tens_2, units = self._tens_1[i], self._tens_2[i], self._units[i]
+
+        if bonus_dice and not penalty_dice:
+            final_tens = min(tens_1, tens_2)
+        elif penalty_dice and not bonus_dice:
+            final_tens = max(tens_1, tens_2)
+        else:
+            final_tens = tens_1
+
+        roll = final_tens + units % 10
+        return roll if roll else 100
+
+    def roll_d100_batch(self, n: int, bonus_dice: bool = False, penalty_dice: bool = False) -> "np.ndarray":
+        """
+        Executa N rolagens D100 vetorizadas.
+
+        Args:
+            n: Número de rolagens
+            bonus_dice: Se True, aplica bonus dice em todas
+            penalty_dice: Se True, aplica penalty dice em todas
+
+        Returns:
+            Array int16 com N resultados (1-100)
+        """
+        tens_1, tens_2, units = self._draw_components(n)
+        return self._combine(tens_1, tens_2, units, bonus_dice, penalty_dice)
+
+    def evaluate_levels(self, rolls: Any, target_value: int, half_value: int) -> "np.ndarray":
+        """
+        Avalia níveis de sucesso de um array de rolagens.
+
+        Args:
+            rolls: Array (ou sequência) de resultados D100
+            target_value: Valor alvo
+            half_value: Valor de sucesso difícil
+
+        Returns:
+            Array int8 de níveis (5 a 1), como em Character._evaluate_roll_result
+        """
+        rolls = np.asarray(rolls)
+        levels = np.full(rolls.shape, 2, dtype=np.int8)
+        levels[rolls <= target_value] = 3
+        levels[rolls <= half_value] = 4
+        # Fumble e crítico têm precedência sobre os alvos
+        levels[rolls == 100] = 1
+        levels[rolls == 1] = 5
+        return levels
+
+    def count_levels(self, levels: Any) -> Dict[int, int]:
+        """Conta quantas rolagens caíram em cada nível (5 a 1)."""
+        counts = np.bincount(np.asarray(levels, dtype=np.int64), minlength=6)
+        return {level: int(counts[level]) for level in SUCCESS_LEVELS}
@@ -0,0 +1,308 @@
+"""
+Dice Probability Module - Distribuições exatas das rolagens D100
+
+Este módulo calcula, por enumeração completa dos dados, a distribuição exata
+dos níveis de sucesso de uma rolagem D100 com as mesmas regras de
+Character._make_d100_roll e Character._evaluate_roll_result. Os resultados são
+memorizados por combinação de parâmetros, substituindo amostragens por uma
+consulta em tabela.
+
+Níveis de sucesso: 5 = Critical Success, 4 = Hard Success, 3 = Success,
+2 = Failure, 1 = Fumble.
+
+Também calcula as probabilidades exatas de vitória/derrota/empate de
+Character.opposed_roll e mantém uma tabela pré-calculada (OpposedRollTable)
+para consultas O(1) por valor de habilidade.
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+SUCCESS_LEVELS = (5, 4, 3, 2, 1)
+
+LEVEL_DESCRIPTIONS = {
+    5: "Critical Success",
+    4: "Hard Success",
+    3: "Success",
+    2: "Failure",
+    1: "Fumble"
+}
+
+# Total de combinações enumeradas: dois dados de dezena x um dado de unidade
+D100_OUTCOMES = 10 * 10 * 10
+
+
+def evaluate_level(roll: int, target_value: int, half_value: int) -> int:
+    """
+    Avalia o nível de sucesso de uma rolagem (mesma regra de Character).
+
+    Args:
+        roll: Resultado da rolagem (1-100)
+        target_value: Valor alvo
+        half_value: Valor de sucesso difícil
+
+    Returns:
+        Nível de sucesso (1-5)
+    """
+    if roll == 1:
+        return 5
+    if roll == 100:
+        return 1
+    if roll <= half_value:
+        return 4
+    if roll <= target_value:
+        return 3
+    return 2
+
+
+def difficulty_targets(target_value: int, half_value: int, difficulty: str = "regular") -> Tuple[int, int]:
+    """
+    Aplica a dificuldade aos valores alvo (mesma regra de Character.roll_skill).
+
+    Args:
+        target_value: Valor full
+        half_value: Valor half
+        difficulty: "regular" ou "hard"
+
+    Returns:
+        Tupla (alvo efetivo, metade efetiva)
+    """
+    if difficulty == "hard":
+        return half_value, half_value // 2
+    return target_value, half_value
+
+
+@lru_cache(maxsize=None)
+def d100_distribution(bonus_dice: bool = False, penalty_dice: bool = False) -> Tuple[int, ...]:
+    """
+    Distribuição exata dos resultados D100 em contagens sobre D100_OUTCOMES.
+
+    Args:
+        bonus_dice: Usa o menor dos dois dados de dezena
+        penalty_dice: Usa o maior dos dois dados de dezena
+
+    Returns:
+        Tupla de 100 contagens, onde o índice i corresponde à rolagem i + 1
+    """
+    if bonus_dice and penalty_dice:
+        bonus_dice = penalty_dice = False
+
+    counts = [0] * 100
+    for tens_1 in range(0, 100, 10):
+        for tens_2 in range(0, 100, 10):
+            if bonus_dice:
+                tens = min(tens_1, tens_2)
+            elif penalty_dice:
+                tens = max(tens_1, tens_2)
+            else:
+                tens = tens_1
+            for units in range(1, 11):
+                if tens == 0 and units == 10:
+                    roll = 100
+                elif tens == 0:
+                    roll = units
+                else:
+                    roll = tens + (units % 10)
+                counts[roll - 1] += 1
+    return tuple(counts)
+
+
+@lru_cache(maxsize=None)
+def _level_counts(target_value: int, half_value: int, bonus_dice: bool, penalty_dice: bool) -> Tuple[int, ...]:
+    """Contagens por nível de sucesso (índice = nível) sobre D100_OUTCOMES."""
+    counts = [0] * 6
+    for index, count in enumerate(d100_distribution(bonus_dice, penalty_dice)):
+        if count:
+            counts[evaluate_level(index + 1, target_value, half_value)] += count
+    return tuple(counts)
+
+
+def success_level_distribution(target_value: int, half_value: int, bonus_dice: bool = False,
+                               penalty_dice: bool = False, difficulty: str = "regular",
+                               exact: bool = False) -> Dict[int, Union[float, Fraction]]:
+    """
+    Distribuição exata dos níveis de sucesso de uma rolagem.
+
+    Args:
+        target_value: Valor full da habilidade/característica
+        half_value: Valor half da habilidade/característica
+        bonus_dice: Se True, aplica bonus dice
+        penalty_dice: Se True, aplica penalty dice
+        difficulty: "regular" ou "hard"
+        exact: Se True, retorna frações exatas em vez de floats
+
+    Returns:
+        Dicionário nível → probabilidade (níveis 5 a 1)
+    """
+    target, half = difficulty_targets(target_value, half_value, difficulty)
+    counts = _level_counts(target, half, bool(bonus_dice), bool(penalty_dice))
+    if exact:
+        return {level: Fraction(counts[level], D100_OUTCOMES) for level in SUCCESS_LEVELS}
+    return {level: counts[level] / D100_OUTCOMES for level in SUCCESS_LEVELS}
+
+
+def success_chance(distribution: Dict[int, Union[float, Fraction]], minimum_level: int = 3) -> Union[float, Fraction]:
+    """
+    Probabilidade de atingir pelo menos um nível de sucesso.
+
+    Args:
+        distribution: Distribuição produzida por success_level_distribution
+        minimum_level: Nível mínimo (padrão: 3 = Success)
+
+    Returns:
+        Probabilidade acumulada
+    """
+    return sum(p for level, p in distribution.items() if level >= minimum_level)
+
+
+@lru_cache(maxsize=None)
+def _opponent_profile(opponent_full: int, opponent_half: int) -> Tuple[Tuple[int, ...], Tuple[Tuple[int, ...], ...], Tuple[int, ...]]:
+    """
+    Pré-calcula a rolagem simples do oponente para comparação com cada rolagem minha.
+
+    Returns:
+        Tupla (below, suffix, levels) onde below[l] conta rolagens do oponente com
+        nível < l, suffix[l][r] conta rolagens s > r com nível l, e levels[r] é o
+        nível do oponente ao rolar r (índices de rolagem 1-100)
+    """
+    counts = d100_distribution()
+    levels = [0] + [evaluate_level(roll, opponent_full, opponent_half) for roll in range(1, 101)]
+
+    per_level = [0] * 6
+    for roll in range(1, 101):
+        per_level[levels[roll]] += counts[roll - 1]
+    below = tuple(sum(per_level[:level]) for level in range(6))
+
+    suffix = [[0] * 102 for _ in range(6)]
+    for roll in range(100, 0, -1):
+        for level in range(1, 6):
+            suffix[level][roll - 1] = suffix[level][roll]
+        suffix[levels[roll]][roll - 1] += counts[roll - 1]
+
+    return below, tuple(tuple(row) for row in suffix), tuple(levels)
+
+
+@lru_cache(maxsize=None)
+def _opposed_counts(my_full: int, my_half: int, opponent_full: int, opponent_half: int,
+                    my_bonus_dice: bool, my_penalty_dice: bool) -> Tuple[int, int, int]:
+    """Contagens (win, lose, draw) sobre D100_OUTCOMES² combinações."""
+    below, suffix, opponent_levels = _opponent_profile(opponent_full, opponent_half)
+    plain_counts = d100_distribution()
+    my_counts = d100_distribution(my_bonus_dice, my_penalty_dice)
+
+    win = draw = 0
+    for roll in range(1, 101):
+        count = my_counts[roll - 1]
+        if not count:
+            continue
+        level = evaluate_level(roll, my_full, my_half)
+        # Vence se o oponente tiver nível menor, ou mesmo nível com rolagem maior
+        win += count * (below[level] + suffix[level][roll])
+        if opponent_levels[roll] == level:
+            draw += count * plain_counts[roll - 1]
+
+    total = D100_OUTCOMES * D100_OUTCOMES
+    return win, total - win - draw, draw
+
+
+def opposed_roll_distribution(my_full: int, my_half: int, opponent_full: int, opponent_half: int,
+                              my_bonus_dice: bool = False, my_penalty_dice: bool = False,
+                              exact: bool = False) -> Dict[str, Union[float, Fraction]]:
+    """
+    Probabilidades exatas de um teste oposto (mesmas regras de Character.opposed_roll).
+
+    Maior nível vence; no mesmo nível, a menor rolagem vence; rolagens iguais empatam.
+    O oponente rola sem dados extras.
+
+    Args:
+        my_full: Meu valor full
+        my_half: Meu valor half
+        opponent_full: Valor full do oponente
+        opponent_half: Valor half do oponente
+        my_bonus_dice: Se True, aplica bonus dice para mim
+        my_penalty_dice: Se True, aplica penalty dice para mim
+        exact: Se True, retorna frações exatas em vez de floats
+
+    Returns:
+        Dicionário com probabilidades de 'win', 'lose' e 'draw'
+    """
+    counts = _opposed_counts(my_full, my_half, opponent_full, opponent_half,
+                             bool(my_bonus_dice), bool(my_penalty_dice))
+    total = D100_OUTCOMES * D100_OUTCOMES
+    if exact:
+        return {outcome: Fraction(count, total) for outcome, count in zip(("win", "lose", "draw"), counts)}
+    return {outcome: count / total for outcome, count in zip(("win", "lose", "draw"), counts)}
+
+
+class OpposedRollTable:
+    """
+    Tabela pré-calculada de testes opostos: 101 x 101 valores de habilidade
+    (0-100, com half = full // 2) para cada modificador meu (nenhum, bonus, penalty).
+
+    As linhas (oponente, modificador) são calculadas sob demanda na primeira
+    consulta ou todas de uma vez com precompute(); consultas seguintes são O(1).
+    """
+
+    MODIFIERS = ("none", "bonus", "penalty")
+    SIZE = 101
+
+    def __init__(self, precompute: bool = False):
+        """
+        Inicializa a tabela.
+
+        Args:
+            precompute: Se True, calcula todas as linhas imediatamente
+        """
+        self._rows: List[Optional[Tuple[Tuple[float, float, float], ...]]] = [None] * (len(self.MODIFIERS) * self.SIZE)
+        if precompute:
+            self.precompute()
+
+    def _row(self, modifier_index: int, opponent_skill: int) -> Tuple[Tuple[float, float, float], ...]:
+        """Obtém (calculando se necessário) a linha de um oponente e modificador."""
+        key = modifier_index * self.SIZE + opponent_skill
+        row = self._rows[key]
+        if row is None:
+            bonus = modifier_index == 1
+            penalty = modifier_index == 2
+            total = D100_OUTCOMES * D100_OUTCOMES
+            row = tuple(
+                tuple(count / total for count in _opposed_counts(
+                    my_skill, my_skill // 2, opponent_skill, opponent_skill // 2, bonus, penalty))
+                for my_skill in range(self.SIZE)
+            )
+            self._rows[key] = row
+        return row
+
+    def precompute(self) -> None:
+        """Calcula todas as linhas da tabela."""
+        for modifier_index in range(len(self.MODIFIERS)):
+            for opponent_skill in range(self.SIZE):
+                self._row(modifier_index, opponent_skill)
+
+    def lookup(self, my_skill: int, opponent_skill: int, modifier: str = "none") -> Dict[str, float]:
+        """
+        Consulta as probabilidades de um teste oposto.
+
+        Args:
+            my_skill: Meu valor full (0-100)
+            opponent_skill: Valor full do oponente (0-100)
+            modifier: "none", "bonus" ou "penalty" (meus dados extras)
+
+        Returns:
+            Dicionário com probabilidades de 'win', 'lose' e 'draw'
+
+        Raises:
+            ValueError: Se valores ou modificador estiverem fora do domínio
+        """
+        if modifier not in self.MODIFIERS:
+            raise ValueError(f"Modificador inválido '{modifier}'. Válidos: {self.MODIFIERS}")
+        if not (0 <= my_skill < self.SIZE and 0 <= opponent_skill < self.SIZE):
+            raise ValueError(f"Valores de habilidade devem estar entre 0 e {self.SIZE - 1}")
+
+        win, lose, draw = self._row(self.MODIFIERS.index(modifier), opponent_skill)[my_skill]
+        return {"win": win, "lose": lose, "draw": draw}
+
+
+# Tabela compartilhada do processo (preenchida sob demanda)
+OPPOSED_ROLL_TABLE = OpposedRollTable()
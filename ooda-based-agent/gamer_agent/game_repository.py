@@ -4,9 +4,36 @@ Game Repository Module - Gerenciamento centralizado de dados do jogo
 Este módulo implementa o padrão Repository para acesso aos dados do jogo,
 incluindo páginas, validação e cache. Separa as responsabilidades de
 acesso a dados da lógica de negócio.
+
+O conteúdo compilado (páginas validadas e índices derivados) é gravado em um
+snapshot pickle chaveado pelo hash do módulo de páginas e dos módulos que
+compilam o conteúdo. Inicializações seguintes com o mesmo hash carregam o
+snapshot diretamente, sem importar o módulo de páginas nem revalidá-lo.
 """
 
-from typing import Dict, Any, Optional
+import hashlib
+import importlib
+import importlib.util
+import os
+import pickle
+import tempfile
+import time
+from typing import Dict, Any, Optional, FrozenSet, Tuple
+from story_graph import StoryGraph
+from action_plan import ChoicePlan, compile_pages
+
+
+# Versão do formato do snapshot; altere ao mudar a estrutura gravada
+SNAPSHOT_FORMAT_VERSION = 2
+
+# Módulos cujo código participa da compilação do conteúdo (invalidam o snapshot)
+_SNAPSHOT_COMPILERS = ("game_repository", "story_graph", "action_plan", "character")
+
+# Diretório padrão dos snapshots, ao lado do módulo de páginas
+_SNAPSHOT_DIRNAME = ".content_cache"
+
+# Variável de ambiente que substitui o diretório padrão (ex.: testes)
+SNAPSHOT_DIR_ENV = "GAMER_AGENT_SNAPSHOT_DIR"
 
 
 class GameRepository:
@@ -17,15 +44,45 @@ class GameRepository:
     proporcionando cache, validação e interface limpa para o resto do sistema.
     """
 
-    def __init__(self, lang='en'):
-        """Inicializa o repositório com dados das páginas."""
-        if lang == 'pt':
-            from pages_pt import PAGES
-        else:
-            from pages import PAGES
-        self._pages_data = PAGES
+    def __init__(self, lang='en', use_snapshot: bool = True, snapshot_dir: Optional[str] = None):
+        """
+        Inicializa o repositório com dados das páginas.
+        
+        Args:
+            lang: Idioma do conteúdo ('en' ou 'pt')
+            use_snapshot: Se True, usa/grava o snapshot do conteúdo compilado
+            snapshot_dir: Diretório dos snapshots (padrão: $GAMER_AGENT_SNAPSHOT_DIR
+                ou .content_cache ao lado das páginas)
+        """
+        start = time.perf_counter()
+        module_name = 'pages_pt' if lang == 'pt' else 'pages'
         self._cache = {}
-        self._validate_data()
+
+        snapshot_key = self._compute_snapshot_key(module_name) if use_snapshot else None
+        snapshot_path = self._snapshot_path(module_name, snapshot_key, snapshot_dir) if snapshot_key else None
+
+        snapshot = self._read_snapshot(snapshot_path, snapshot_key) if snapshot_path else None
+        if snapshot is not None:
+            # Hash confere: conteúdo já validado e compilado
+            self._pages_data = snapshot["pages"]
+            self._graph = snapshot["graph"]
+            self._plans = snapshot["plans"]
+            source = "snapshot"
+        else:
+            self._pages_data = importlib.import_module(module_name).PAGES
+            self._validate_data()
+            self._graph = StoryGraph(self._pages_data)
+            self._plans = compile_pages(self._pages_data)
+            source = "module"
+            if snapshot_path:
+                self._write_snapshot(snapshot_path, snapshot_key)
+
+        self._load_stats = {
+            "source": source,
+            "load_time_ms": (time.perf_counter() - start) * 1000,
+            "snapshot_path": snapshot_path,
+            "snapshot_key": snapshot_key
+        }
     
     def get_page(self, page_id: int, default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -113,6 +170,139 @@ class GameRepository:
         """
         return len(self._pages_data)
     
+    @staticmethod
+    def _compute_snapshot_key(module_name: str) -> Optional[str]:
+        """
+        Calcula o hash do módulo de páginas e dos módulos compiladores.
+        
+        Returns:
+            Hash hexadecimal, ou None se algum código-fonte não for localizável
+        """
+        digest = hashlib.sha256(f"v{SNAPSHOT_FORMAT_VERSION}".encode())
+        for name in (module_name,) + _SNAPSHOT_COMPILERS:
+            spec = importlib.util.find_spec(name)
+            if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+                return None
+            with open(spec.origin, "rb") as source_file:
+                digest.update(source_file.read())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _snapshot_path(module_name: str, snapshot_key: str, snapshot_dir: Optional[str]) -> str:
+        """Monta o caminho do arquivo de snapshot para um módulo e hash."""
+        if snapshot_dir is None:
+            snapshot_dir = os.environ.get(SNAPSHOT_DIR_ENV) or None
+        if snapshot_dir is None:
+            origin = importlib.util.find_spec(module_name).origin
+            snapshot_dir = os.path.join(os.path.dirname(origin), _SNAPSHOT_DIRNAME)
+        return os.path.join(snapshot_dir, f"{module_name}.{snapshot_key[:16]}.pickle")
+
+    @staticmethod
+    def _read_snapshot(snapshot_path: str, snapshot_key: str) -> Optional[Dict[str, Any]]:
+        """Lê um snapshot se existir e corresponder ao hash atual."""
+        try:
+            with open(snapshot_path, "rb") as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"AVISO: Snapshot de conteúdo ignorado ({snapshot_path}): {e}")
+            return None
+
+        if not isinstance(snapshot, dict) or snapshot.get("key") != snapshot_key:
+            return None
+        return snapshot
+
+    def _write_snapshot(self, snapshot_path: str, snapshot_key: str) -> None:
+        """
+        Grava o snapshot de forma atômica (seguro com vários processos).
+        
+        Falhas na gravação não são fatais: o repositório continua funcionando
+        com o conteúdo recém-compilado.
+        """
+        snapshot = {
+            "key": snapshot_key,
+            "pages": self._pages_data,
+            "graph": self._graph,
+            "plans": self._plans
+        }
+        tmp_path = None
+        try:
+            snapshot_dir = os.path.dirname(snapshot_path)
+            os.makedirs(snapshot_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=snapshot_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as snapshot_file:
+                pickle.dump(snapshot, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, snapshot_path)
+            tmp_path = None
+
+            # Remover snapshots obsoletos do mesmo módulo (hash antigo)
+            prefix = os.path.basename(snapshot_path).split(".")[0] + "."
+            for name in os.listdir(snapshot_dir):
+                stale_path = os.path.join(snapshot_dir, name)
+                if name.startswith(prefix) and name.endswith(".pickle") and stale_path != snapshot_path:
+                    os.remove(stale_path)
+        except Exception as e:
+            print(f"AVISO: Não foi possível gravar o snapshot de conteúdo: {e}")
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def get_load_statistics(self) -> Dict[str, Any]:
+        """
+        Obtém as métricas de inicialização do repositório.
+        
+        Returns:
+            Dicionário com origem dos dados ('snapshot' ou 'module'), tempo de
+            carga em ms, caminho e chave do snapshot
+        """
+        return dict(self._load_stats)
+
+    @property
+    def graph(self) -> StoryGraph:
+        """Índice compilado de transições entre páginas."""
+        return self._graph
+
+    def get_successors(self, page_id: int) -> FrozenSet[int]:
+        """
+        Obtém as páginas alcançáveis diretamente a partir de uma página.
+        
+        Args:
+            page_id: ID da página
+            
+        Returns:
+            Conjunto imutável de IDs de destino (0 indica fim de jogo)
+        """
+        return self._graph.successors(page_id)
+
+    def get_choice_plans(self, page_id: int) -> Tuple[ChoicePlan, ...]:
+        """
+        Obtém os planos compilados das choices de uma página.
+        
+        Args:
+            page_id: ID da página
+            
+        Returns:
+            Tupla de ChoicePlan na mesma ordem de get_page_choices (vazia se
+            a página não existir)
+        """
+        return self._plans.get(page_id, ())
+
+    def get_predecessors(self, page_id: int) -> FrozenSet[int]:
+        """
+        Obtém as páginas que levam diretamente a uma página.
+        
+        Args:
+            page_id: ID da página
+            
+        Returns:
+            Conjunto imutável de IDs de origem
+        """
+        return self._graph.predecessors(page_id)
+
     def _validate_data(self) -> None:
         """
         Valida estrutura dos dados das páginas.
@@ -156,7 +346,9 @@ class GameRepository:
             "pages_with_choices": pages_with_choices,
             "pages_without_choices": total_pages - pages_with_choices,
             "total_choices": total_choices,
-            "avg_choices_per_page": total_choices / max(pages_with_choices, 1)
+            "avg_choices_per_page": total_choices / max(pages_with_choices, 1),
+            "terminal_pages": sorted(self._graph.terminal_pages),
+            "unreachable_pages": sorted(self._graph.unreachable_pages)
         }
     
     def __repr__(self) -> str:
@@ -195,4 +387,20 @@ if __name__ == "__main__":
         print(f"   {key}: {value}")
     print()
     
+    # Métricas de inicialização
+    print("5. Inicialização:")
+    for key, value in repo.get_load_statistics().items():
+        print(f"   {key}: {value}")
+    print()
+    
+    # Grafo de transições
+    print("6. Grafo de transições:")
+    print(f"   {repo.graph}")
+    print(f"   Sucessores da página 1: {sorted(repo.get_successors(1))}")
+    print(f"   Predecessores da página 34: {sorted(repo.get_predecessors(34))}")
+    print(f"   Planos da página 1: {[type(op).__name__ for plan in repo.get_choice_plans(1) for op in plan.default.ops]}")
+    for occupation in sorted(repo.graph.occupations):
+        print(f"   Páginas alcançáveis como {occupation}: {len(repo.graph.occupation_subgraph(occupation))}")
+    print()
+    
     print("=== TESTE CONCLUÍDO ===")
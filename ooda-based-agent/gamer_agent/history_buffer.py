@@ -0,0 +1,213 @@
+"""
+History Buffer Module - Histórico de decisões com capacidade fixa
+
+Este módulo implementa o HistoryBuffer, um buffer circular pré-alocado usado
+como page_history do Character:
+
+- append O(1): ao atingir a capacidade, a entrada mais antiga é descartada
+  (e devolvida, para quem quiser arquivá-la)
+- last(k) devolve uma visão das k entradas mais recentes sem copiá-las
+- indexação e fatias negativas continuam funcionando (history[-5:])
+
+E o HistoryArchive, um arquivo JSONL somente de acréscimo onde o Cockpit
+grava as entradas descartadas, mantendo o histórico completo disponível para
+análise.
+"""
+
+import json
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class HistoryView(Sequence):
+    """
+    Visão somente leitura de um trecho do HistoryBuffer (sem cópia).
+
+    As posições são absolutas: se o buffer descartar uma entrada da visão
+    depois de criada, acessá-la levanta IndexError.
+    """
+
+    __slots__ = ("_buffer", "_first", "_length")
+
+    def __init__(self, buffer: "HistoryBuffer", first: int, length: int):
+        self._buffer = buffer
+        self._first = first
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Índice fora da visão do histórico")
+        return self._buffer._at_position(self._first + index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(self._first, self._first + self._length):
+            yield self._buffer._at_position(position)
+
+    def __repr__(self) -> str:
+        return f"HistoryView({list(self)!r})"
+
+
+class HistoryBuffer(Sequence):
+    """
+    Buffer circular de entradas do histórico, da mais antiga para a mais recente.
+    """
+
+    __slots__ = ("_items", "_head", "_size", "_total")
+
+    def __init__(self, capacity: int, entries: Iterable[Dict[str, Any]] = ()):
+        """
+        Inicializa o buffer.
+
+        Args:
+            capacity: Número máximo de entradas mantidas
+            entries: Entradas iniciais (só as últimas 'capacity' são mantidas)
+
+        Raises:
+            ValueError: Se capacity não for positiva
+        """
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError(f"Capacidade do histórico deve ser um inteiro positivo, recebido: {capacity}")
+        self._items: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._head = 0    # índice da entrada mais antiga em _items
+        self._size = 0
+        self._total = 0   # entradas já adicionadas (incluindo descartadas)
+        for entry in entries:
+            self.append(entry)
+
+    @property
+    def capacity(self) -> int:
+        """Número máximo de entradas mantidas."""
+        return len(self._items)
+
+    @property
+    def total_appended(self) -> int:
+        """Total de entradas já adicionadas, incluindo as descartadas."""
+        return self._total
+
+    def append(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Adiciona uma entrada em O(1).
+
+        Returns:
+            A entrada descartada (a mais antiga) se o buffer estava cheio, senão None
+        """
+        items = self._items
+        capacity = len(items)
+        self._total += 1
+        if self._size < capacity:
+            items[(self._head + self._size) % capacity] = entry
+            self._size += 1
+            return None
+        evicted = items[self._head]
+        items[self._head] = entry
+        self._head = (self._head + 1) % capacity
+        return evicted
+
+    def last(self, k: int) -> HistoryView:
+        """Visão (sem cópia) das k entradas mais recentes, em ordem cronológica."""
+        length = max(0, min(k, self._size))
+        return HistoryView(self, self._total - length, length)
+
+    def copy(self) -> "HistoryBuffer":
+        """Cópia rasa (as entradas são compartilhadas)."""
+        clone = HistoryBuffer.__new__(HistoryBuffer)
+        clone._items = list(self._items)
+        clone._head = self._head
+        clone._size = self._size
+        clone._total = self._total
+        return clone
+
+    __copy__ = copy
+
+    def _at_position(self, position: int) -> Dict[str, Any]:
+        """Entrada pela posição absoluta (0 = primeira entrada já adicionada)."""
+        offset = position - (self._total - self._size)
+        if not 0 <= offset < self._size:
+            raise IndexError("Entrada do histórico já descartada")
+        return self._items[(self._head + offset) % len(self._items)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Fatias devolvem lista (compatível com o antigo list); use last(k) para evitar a cópia
+            items, head, capacity = self._items, self._head, len(self._items)
+            return [items[(head + i) % capacity] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Índice fora do histórico")
+        return self._items[(self._head + index) % len(self._items)]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        items = self._items
+        capacity = len(items)
+        for offset in range(self._size):
+            yield items[(self._head + offset) % capacity]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (HistoryBuffer, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"HistoryBuffer(capacity={self.capacity}, entries={list(self)!r})"
+
+
+class HistoryArchive:
+    """
+    Arquivo JSONL somente de acréscimo com entradas descartadas do histórico.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Caminho do arquivo (criado no primeiro acréscimo)
+        """
+        self.path = path
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Acrescenta uma entrada como uma linha JSON."""
+        with open(self.path, "a", encoding="utf-8") as archive_file:
+            archive_file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def read(self) -> Iterator[Dict[str, Any]]:
+        """Lê as entradas arquivadas, da mais antiga para a mais recente."""
+        try:
+            with open(self.path, encoding="utf-8") as archive_file:
+                for line in archive_file:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+
+# Teste e validação
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    print("=== TESTE DO HISTORY BUFFER ===\n")
+
+    buffer = HistoryBuffer(3)
+    archive = HistoryArchive(os.path.join(tempfile.mkdtemp(), "history.jsonl"))
+    for page in range(1, 6):
+        evicted = buffer.append({"page_number": page})
+        if evicted is not None:
+            archive.append(evicted)
+
+    print(f"1. {buffer!r}")
+    print(f"   last(2): {list(buffer.last(2))}  history[-2:]: {buffer[-2:]}")
+    print(f"2. Arquivadas: {[entry['page_number'] for entry in archive.read()]}")
+
+    print("\n=== TESTE CONCLUÍDO ===")
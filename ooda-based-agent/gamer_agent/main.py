@@ -7,14 +7,24 @@ Usage:
     python main.py --player demo   (modo demonstração automática)
     python main.py --player human  (modo console interativo)
     python main.py --player llm    (modo IA via API)
+    python main.py --player optimal (política ótima pré-calculada)
+    python main.py --player mcts   (busca em árvore Monte Carlo)
+    python main.py --renderer live (tela atualizada no lugar, sem limpar o terminal)
+    python main.py --renderer live --background-render (desenha a tela em uma thread, fora do turno)
+    python main.py --simulate 1000 (simulação headless em lote)
+    python main.py --analyze       (análise exata dos desfechos, sem simulação)
 """
 
 import argparse
+import json
 import os
 import sys
 from game_repository import GameRepository
 from agent import Agent
-from player_strategy import DemoPlayerAdapter, HumanPlayerAdapter, LLMPlayerAdapter
+from player_strategy import (
+    DemoPlayerAdapter, HumanPlayerAdapter, LLMPlayerAdapter, OptimalPlayerAdapter, MCTSPlayerAdapter,
+    RenderConsole, LiveRenderConsole, NullRenderer, BackgroundRenderer
+)
 
 
 def main():
@@ -31,17 +41,23 @@ Tipos de jogador disponíveis:
   demo    - Modo demonstração automática (DefaultDecisionController interno)
   human   - Modo console interativo (input manual via terminal)
   llm     - Modo IA via API (requer GEMINI_API_KEY)
+  optimal - Política ótima pré-calculada (iteração de valor, consulta O(1))
+  mcts    - Busca em árvore Monte Carlo por decisão (--rollouts, --time-budget-ms)
 
 Exemplos:
   python main.py --player demo
   python main.py --player human
   python main.py --player llm
+  python main.py --player human --renderer live
+  python main.py --player demo --renderer live --background-render
+  python main.py --simulate 1000
+  python main.py --analyze
         """
     )
     
     parser.add_argument(
         '--player', 
-        choices=['demo', 'human', 'llm'], 
+        choices=['demo', 'human', 'llm', 'optimal', 'mcts'], 
         default='demo',
         help='Tipo de interface do jogador (padrão: demo)'
     )
@@ -59,26 +75,116 @@ Exemplos:
         help='Ativa o modo de depuração com logs detalhados'
     )
     
+    parser.add_argument(
+        '--renderer',
+        choices=['classic', 'live', 'none'],
+        default='classic',
+        help='Renderização da tela: classic limpa e redesenha tudo; live atualiza no lugar só os painéis alterados; none descarta os quadros (padrão: classic)'
+    )
+
+    parser.add_argument(
+        '--background-render',
+        action='store_true',
+        help='Desenha a tela em uma thread, sem bloquear a decisão; prompts e pausas aguardam o quadro pendente (requer --renderer live ou none)'
+    )
+
+    parser.add_argument(
+        '--simulate',
+        type=int,
+        metavar='N',
+        help='Executa N partidas headless (sem renderização e sem pausas) e exibe o relatório'
+    )
+
+    parser.add_argument(
+        '--max-turns',
+        type=int,
+        default=500,
+        help='Limite de jogadas por partida no modo --simulate (padrão: 500)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Processos paralelos no modo --simulate (padrão: 1; 0 = todos os núcleos)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Semente inicial no modo --simulate; partidas usam seed, seed+1, ... (reprodutível)'
+    )
+    
+    parser.add_argument(
+        '--rollouts',
+        type=int,
+        default=1000,
+        help='Rollouts por decisão do jogador mcts (padrão: 1000)'
+    )
+
+    parser.add_argument(
+        '--time-budget-ms',
+        type=float,
+        help='Tempo máximo por decisão do jogador mcts, em milissegundos'
+    )
+
+    parser.add_argument(
+        '--analyze',
+        action='store_true',
+        help='Calcula exatamente (cadeia de Markov) as probabilidades de cada final e as jogadas esperadas'
+    )
+    
     args = parser.parse_args()
+    # O renderizador clássico limpa o terminal a cada quadro: em uma thread, a
+    # limpeza apagaria o log de ações impresso pelo agente durante o desenho
+    if args.background_render and args.renderer == 'classic':
+        parser.error("--background-render requer --renderer live ou none")
     
     try:
         # Game Repository com cache das 112 páginas
         print("[INFO] Carregando repositório do jogo...")
         game_repo = GameRepository(lang=args.lang)
+        load_stats = game_repo.get_load_statistics()
+        print(f"[INFO] Conteúdo carregado de {load_stats['source']} em {load_stats['load_time_ms']:.1f} ms")
+
+        if args.analyze:
+            run_analysis(game_repo)
+            return
+
+        if args.simulate:
+            run_simulation(game_repo, args)
+            return
         
         # Seleção e configuração do PlayerInputAdapter baseado no argumento
         print(f"[INFO] Configurando {args.player} player adapter...")
+
+        # Renderizador com acesso ao grafo para pré-aquecer os painéis das próximas páginas
+        renderer_class = {'live': LiveRenderConsole, 'none': NullRenderer}.get(args.renderer, RenderConsole)
+        renderer = renderer_class(debug=args.debug, game_repository=game_repo)
+        if args.background_render:
+            renderer = BackgroundRenderer(renderer)
         
         if args.player == 'human':
-            player_adapter = HumanPlayerAdapter(debug=args.debug)
+            player_adapter = HumanPlayerAdapter(debug=args.debug, renderer=renderer)
             print("[INFO] Modo humano: Use o console para interagir")
             
         elif args.player == 'llm':
             player_adapter = LLMPlayerAdapter(debug=args.debug)
             print("[INFO] Modo LLM: IA tomará decisões via API")
+
+        elif args.player == 'optimal':
+            player_adapter = OptimalPlayerAdapter(game_repository=game_repo, debug=args.debug,
+                                                  renderer=renderer)
+            print("[INFO] Modo ótimo: decisões por consulta à política pré-calculada")
+
+        elif args.player == 'mcts':
+            player_adapter = MCTSPlayerAdapter(game_repository=game_repo, rollouts=args.rollouts,
+                                               time_budget_ms=args.time_budget_ms, debug=args.debug,
+                                               renderer=renderer)
+            print("[INFO] Modo MCTS: decisões por busca em árvore Monte Carlo")
             
         else:  # default: demo
-            player_adapter = DemoPlayerAdapter(debug=args.debug)
+            player_adapter = DemoPlayerAdapter(debug=args.debug, renderer=renderer)
             print("[INFO] Modo demo: Execução automática para demonstração")
         
         # Instanciar Agent com dependency injection (arquitetura v1.2)
@@ -105,5 +211,39 @@ Exemplos:
         sys.exit(1)
 
 
+def run_simulation(game_repo: GameRepository, args: argparse.Namespace):
+    """
+    Executa o modo --simulate: N partidas headless com o jogador demo.
+
+    Com --seed e/ou --workers, as partidas são semeadas (seed, seed+1, ...) e
+    distribuídas entre processos com resultados reprodutíveis.
+    """
+    from simulator import Simulator, ParallelSimulator
+
+    if args.seed is None and args.workers == 1:
+        print(f"[INFO] Simulando {args.simulate} partidas (headless)...")
+        simulator = Simulator(game_repository=game_repo, max_turns=args.max_turns)
+        report = simulator.run(args.simulate)
+    else:
+        first_seed = args.seed if args.seed is not None else 0
+        seeds = range(first_seed, first_seed + args.simulate)
+        runner = ParallelSimulator(workers=args.workers or None, lang=args.lang, max_turns=args.max_turns)
+        print(f"[INFO] Simulando {args.simulate} partidas semeadas em {runner.workers} processos...")
+        report = runner.run(seeds)
+
+    print(json.dumps(report["summary"], indent=2, ensure_ascii=False))
+
+
+def run_analysis(game_repo: GameRepository):
+    """
+    Executa o modo --analyze: desfechos exatos da política aleatória do jogador demo.
+    """
+    from markov_analyzer import MarkovAnalyzer
+
+    print("[INFO] Resolvendo cadeia de Markov do livro-jogo...")
+    report = MarkovAnalyzer(game_repository=game_repo).analyze()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
 if __name__ == "__main__":
     main()
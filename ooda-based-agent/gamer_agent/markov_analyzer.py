@@ -0,0 +1,516 @@
+"""
+Markov Analyzer Module - Análise exata de desfechos do livro-jogo
+
+Este módulo trata o livro-jogo como uma cadeia de Markov absorvente para uma
+política fixa (por padrão a política uniforme do DemoPlayerAdapter) e resolve,
+sem simulação, a probabilidade de terminar em cada página final e o número
+esperado de jogadas, para a partida completa e por ocupação inicial.
+
+Modelo:
+- Estado = (página, ocupação). Páginas sem choices, 'goto: 0' e páginas
+  inexistentes são absorventes; o desfecho é a página final.
+- As transições seguem as regras do livro: conditional_on é resolvido pela
+  ocupação, set-occupation muda a ocupação, rolagens usam as distribuições
+  exatas de dice_probability (dificuldade e bonus_dice respeitados), testes
+  opostos usam as probabilidades de vitória/derrota/empate, e luck_roll usa o
+  nível imediatamente inferior quando o nível obtido não tem resultado. Nível
+  sem resultado (ou resultado sem goto) mantém o personagem na página.
+- Os valores de habilidade vêm da ficha da ocupação; a sorte é a mistura exata
+  da sorte inicial (50 + 2d10). Efeitos de recursos (dano, gasto de sorte,
+  modificadores, ganho de habilidades) não alteram as transições.
+
+Estados transientes que não alcançam nenhum estado absorvente são "presos":
+a probabilidade de ficar preso é reportada e o número esperado de jogadas
+passa a ser infinito.
+"""
+
+import contextlib
+import io
+import random
+from collections import defaultdict, deque
+from fractions import Fraction
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from action_plan import DEFAULT_OPPONENT_FULL
+from character import Character
+from dice_probability import opposed_roll_distribution, success_level_distribution
+from story_graph import END_PAGE
+
+Number = Union[float, Fraction]
+State = Tuple[int, Optional[str]]
+Transition = Tuple[Number, int, Optional[str]]
+
+
+class OccupationProfile:
+    """
+    Valores de rolagem de uma ocupação usados pela análise.
+
+    Constrói a ficha com Character.set_occupation (saída descartada) e
+    pré-calcula a distribuição de níveis de sorte sobre a sorte inicial.
+    """
+
+    def __init__(self, occupation: Optional[str], exact: bool = False):
+        """
+        Inicializa o perfil.
+
+        Args:
+            occupation: Nome da ocupação (None = antes da escolha de ocupação)
+            exact: Se True, usa frações exatas
+        """
+        self.occupation = occupation
+        self.exact = exact
+        self._character = Character(rng=random.Random(0))
+        if occupation is not None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self._character.set_occupation(occupation)
+        self._luck_distribution = self._build_luck_distribution()
+
+    def skill_values(self, name: str) -> Tuple[int, int]:
+        """
+        Valores (full, half) de uma habilidade ou característica.
+
+        Procura em common, combat e expert e depois nas características; uma
+        habilidade inexistente usa o mesmo padrão de Character.roll_skill (50/50).
+        """
+        for skill_type in ("common", "combat", "expert"):
+            try:
+                data = self._character.get_skill(name, skill_type)
+                return data["full"], data["half"]
+            except KeyError:
+                continue
+        try:
+            data = self._character.get_characteristic(name)
+            return data["full"], data["half"]
+        except KeyError:
+            return 50, 50
+
+    def level_distribution(self, name: str, difficulty: str = "regular",
+                           bonus_dice: bool = False, penalty_dice: bool = False) -> Dict[int, Number]:
+        """Distribuição exata dos níveis de uma rolagem de habilidade/característica."""
+        full, half = self.skill_values(name)
+        return success_level_distribution(full, half, bonus_dice, penalty_dice, difficulty, exact=self.exact)
+
+    def luck_distribution(self) -> Dict[int, Number]:
+        """Distribuição dos níveis de luck_roll sobre a sorte inicial."""
+        return self._luck_distribution
+
+    def _build_luck_distribution(self) -> Dict[int, Number]:
+        """Mistura exata das distribuições de sorte para 50 + 2d10 (ou a sorte atual, sem ocupação)."""
+        one = Fraction(1) if self.exact else 1.0
+        if self.occupation is None:
+            luck = self._character.get_luck()["current"]
+            return success_level_distribution(luck, luck // 2, exact=self.exact)
+
+        mixture: Dict[int, Number] = defaultdict(lambda: 0 * one)
+        for die_1 in range(1, 11):
+            for die_2 in range(1, 11):
+                luck = 50 + die_1 + die_2
+                for level, p in success_level_distribution(luck, luck // 2, exact=self.exact).items():
+                    mixture[level] += p * one / 100
+        return dict(mixture)
+
+
+def resolve_choice(choice: Dict[str, Any], occupation: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Resolve conditional_on para a ocupação (mesma regra de ChoicePlan.resolve).
+
+    Returns:
+        Choice efetiva, ou None se não houver path para a ocupação nem default
+    """
+    if not isinstance(choice, dict):
+        return None
+    if choice.get("conditional_on") != "occupation":
+        return choice
+    paths = choice.get("paths", {})
+    if occupation in paths:
+        return paths[occupation]
+    return paths.get("default")
+
+
+def _result_goto(result: Any) -> Optional[int]:
+    """Extrai o goto de um resultado (inteiro simples ou dicionário)."""
+    if isinstance(result, dict):
+        result = result.get("goto")
+    if isinstance(result, int) and not isinstance(result, bool) and result >= 0:
+        return result
+    return None
+
+
+def choice_transitions(choice: Dict[str, Any], page_id: int, occupation: Optional[str],
+                       profile_for: Callable[[Optional[str]], OccupationProfile],
+                       exact: bool = False) -> List[Transition]:
+    """
+    Distribuição de (próxima página, próxima ocupação) ao executar uma choice.
+
+    Args:
+        choice: Choice já resolvida (sem conditional_on)
+        page_id: Página atual (destino quando não há goto aplicável)
+        occupation: Ocupação atual
+        profile_for: Função que retorna o OccupationProfile de uma ocupação
+        exact: Se True, usa frações exatas
+
+    Returns:
+        Lista de tuplas (probabilidade, página, ocupação), com destinos agregados
+    """
+    one = Fraction(1) if exact else 1.0
+    next_occupation = choice.get("set-occupation", occupation)
+    profile = profile_for(next_occupation)
+    outcomes: Dict[int, Number] = defaultdict(lambda: 0 * one)
+
+    if "roll" in choice:
+        roll_data = choice["roll"]
+        if isinstance(roll_data, dict):
+            skill_name = roll_data.get("skill")
+            difficulty = roll_data.get("difficulty", choice.get("difficulty", "regular"))
+            results = roll_data.get("results", choice.get("results", {}))
+        else:
+            skill_name, difficulty, results = roll_data, choice.get("difficulty", "regular"), choice.get("results", {})
+        distribution = profile.level_distribution(skill_name, difficulty,
+                                                  bool(choice.get("bonus_dice")), bool(choice.get("penalty_dice")))
+        for level, p in distribution.items():
+            target = _result_goto(results.get(str(level)))
+            outcomes[page_id if target is None else target] += p
+
+    elif choice.get("luck_roll"):
+        results = choice.get("results", {})
+        for level, p in profile.luck_distribution().items():
+            # Sem resultado para o nível: usa o nível inferior mais próximo
+            result = next((results[str(i)] for i in range(level, 0, -1) if results.get(str(i))), None)
+            target = _result_goto(result)
+            outcomes[page_id if target is None else target] += p
+
+    elif "opposed_roll" in choice:
+        my_full, my_half = profile.skill_values(choice["opposed_roll"])
+        opponent = choice.get("opponent_skill", {})
+        opponent_full = opponent.get("full", DEFAULT_OPPONENT_FULL)
+        odds = opposed_roll_distribution(my_full, my_half, opponent_full, opponent.get("half", opponent_full // 2),
+                                         bool(choice.get("bonus_dice")), bool(choice.get("penalty_dice")),
+                                         exact=exact)
+        for outcome, p in odds.items():
+            target = _result_goto(choice.get("outcomes", {}).get(outcome))
+            outcomes[page_id if target is None else target] += p
+
+    else:
+        target = _result_goto(choice.get("goto"))
+        outcomes[page_id if target is None else target] += one
+
+    return [(p, target, next_occupation) for target, p in outcomes.items() if p]
+
+
+def solve_sparse(rows: Dict[Hashable, Dict[Hashable, Number]],
+                 rhs: Dict[Hashable, Dict[Hashable, Number]]) -> Dict[Hashable, Dict[Hashable, Number]]:
+    """
+    Resolve A·X = B por eliminação de Gauss-Jordan esparsa (linhas em dicionários).
+
+    Sem pivotamento: adequado a matrizes I - Q de cadeias absorventes (M-matrizes).
+    Funciona com float ou Fraction. Os argumentos são consumidos.
+
+    Args:
+        rows: Linhas de A (índice → {coluna: valor})
+        rhs: Linhas de B (índice → {coluna do lado direito: valor})
+
+    Returns:
+        Linhas de X (índice → {coluna do lado direito: valor})
+    """
+    column_rows: Dict[Hashable, set] = defaultdict(set)
+    for i, row in rows.items():
+        for j in row:
+            column_rows[j].add(i)
+
+    for pivot in list(rows):
+        pivot_row = rows[pivot]
+        pivot_value = pivot_row[pivot]
+        pivot_row = {j: v / pivot_value for j, v in pivot_row.items()}
+        rows[pivot] = pivot_row
+        pivot_rhs = {k: v / pivot_value for k, v in rhs[pivot].items()}
+        rhs[pivot] = pivot_rhs
+
+        for i in list(column_rows[pivot]):
+            if i == pivot:
+                continue
+            row = rows[i]
+            factor = row.pop(pivot)
+            for j, v in pivot_row.items():
+                if j == pivot:
+                    continue
+                value = row.get(j, 0) - factor * v
+                if value:
+                    row[j] = value
+                    column_rows[j].add(i)
+                elif j in row:
+                    del row[j]
+                    column_rows[j].discard(i)
+            target_rhs = rhs[i]
+            for k, v in pivot_rhs.items():
+                target_rhs[k] = target_rhs.get(k, 0) - factor * v
+        column_rows[pivot] = {pivot}
+
+    return rhs
+
+
+class MarkovAnalyzer:
+    """
+    Análise exata do livro-jogo como cadeia de Markov absorvente.
+
+    A cadeia é construída a partir das páginas do GameRepository para uma
+    política fixa e resolvida com um único sistema linear esparso.
+    """
+
+    TURNS = "__turns__"
+
+    def __init__(self, game_repository: Any = None, pages: Optional[Dict[int, Dict[str, Any]]] = None,
+                 start_page: int = 1, exact: bool = False,
+                 policy: Optional[Callable[[int, Optional[str], List[Dict[str, Any]]], List[Number]]] = None):
+        """
+        Inicializa o analisador.
+
+        Args:
+            game_repository: GameRepository com as páginas (ignorado se pages for informado)
+            pages: Dicionário de páginas (alternativa ao repositório)
+            start_page: Página inicial
+            exact: Se True, resolve com frações exatas
+            policy: Função (página, ocupação, choices válidas) → probabilidades de
+                    cada choice (padrão: uniforme, como o DemoPlayerAdapter)
+        """
+        if pages is None:
+            if game_repository is None:
+                from game_repository import GameRepository
+                game_repository = GameRepository()
+            pages = {page_id: game_repository.get_page(page_id) for page_id in game_repository.get_all_page_ids()}
+
+        self.pages = pages
+        self.start_page = start_page
+        self.exact = exact
+        self.policy = policy or self._uniform_policy
+        self._profiles: Dict[Optional[str], OccupationProfile] = {}
+        self._transitions: Dict[State, List[Transition]] = {}
+        self._solution: Optional[Dict[State, Dict[Hashable, Number]]] = None
+        self._trapped: set = set()
+        self._extra_starts: List[State] = []
+
+    def _uniform_policy(self, page_id: int, occupation: Optional[str],
+                        choices: List[Dict[str, Any]]) -> List[Number]:
+        """Política uniforme sobre as choices válidas."""
+        one = Fraction(1) if self.exact else 1.0
+        return [one / len(choices)] * len(choices)
+
+    def profile(self, occupation: Optional[str]) -> OccupationProfile:
+        """Obtém (com cache) o perfil de rolagens de uma ocupação."""
+        if occupation not in self._profiles:
+            self._profiles[occupation] = OccupationProfile(occupation, self.exact)
+        return self._profiles[occupation]
+
+    def is_absorbing(self, page_id: int) -> bool:
+        """Verifica se a página encerra a partida."""
+        return page_id == END_PAGE or not self.pages.get(page_id, {}).get("choices")
+
+    def transitions(self, state: State) -> List[Transition]:
+        """
+        Transições de um estado transiente sob a política.
+
+        Returns:
+            Lista de tuplas (probabilidade, página, ocupação); vazia se nenhuma
+            choice for válida para a ocupação (partida encerra na página)
+        """
+        if state in self._transitions:
+            return self._transitions[state]
+
+        page_id, occupation = state
+        choices = [resolve_choice(choice, occupation) for choice in self.pages[page_id].get("choices", [])]
+        choices = [choice for choice in choices if choice is not None]
+
+        merged: Dict[State, Number] = {}
+        if choices:
+            for weight, choice in zip(self.policy(page_id, occupation, choices), choices):
+                if not weight:
+                    continue
+                for p, target, next_occupation in choice_transitions(choice, page_id, occupation,
+                                                                     self.profile, self.exact):
+                    key = (target, next_occupation)
+                    merged[key] = merged.get(key, 0) + weight * p
+
+        self._transitions[state] = [(p, page, occ) for (page, occ), p in merged.items()]
+        return self._transitions[state]
+
+    def _transient_states(self) -> List[State]:
+        """Estados transientes alcançáveis a partir do início, em ordem de busca."""
+        starts = [(self.start_page, None)] + self._extra_starts
+        order: List[State] = []
+        seen = set(starts)
+        queue = deque(starts)
+        while queue:
+            state = queue.popleft()
+            if self.is_absorbing(state[0]) or not self.transitions(state):
+                continue
+            order.append(state)
+            for _, page, occupation in self.transitions(state):
+                next_state = (page, occupation)
+                if next_state not in seen:
+                    seen.add(next_state)
+                    queue.append(next_state)
+        return order
+
+    def solve(self) -> Dict[State, Dict[Hashable, Number]]:
+        """
+        Resolve a cadeia para todos os estados transientes alcançáveis.
+
+        Returns:
+            Estado → {página final: probabilidade, TURNS: jogadas esperadas}
+        """
+        if self._solution is not None:
+            return self._solution
+
+        one = Fraction(1) if self.exact else 1.0
+        transient = self._transient_states()
+        transient_set = set(transient)
+
+        # Estados que não alcançam absorção ficam de fora do sistema linear
+        reverse: Dict[State, set] = defaultdict(set)
+        escaping = set()
+        for state in transient:
+            for _, page, occupation in self.transitions(state):
+                target = (page, occupation)
+                if target in transient_set:
+                    reverse[target].add(state)
+                else:
+                    escaping.add(state)
+        can_absorb = set(escaping)
+        frontier = list(escaping)
+        while frontier:
+            for source in reverse[frontier.pop()]:
+                if source not in can_absorb:
+                    can_absorb.add(source)
+                    frontier.append(source)
+        self._trapped = transient_set - can_absorb
+
+        rows: Dict[State, Dict[Hashable, Number]] = {}
+        rhs: Dict[State, Dict[Hashable, Number]] = {}
+        for state in transient:
+            if state in self._trapped:
+                continue
+            row = {state: one}
+            b: Dict[Hashable, Number] = {self.TURNS: one}
+            for p, page, occupation in self.transitions(state):
+                target = (page, occupation)
+                if target in can_absorb:
+                    row[target] = row.get(target, 0) - p
+                elif target not in transient_set:
+                    b[page] = b.get(page, 0) + p
+            rows[state] = {k: v for k, v in row.items() if v}
+            rhs[state] = b
+
+        self._solution = solve_sparse(rows, rhs)
+        for state in self._trapped:
+            self._solution[state] = {}
+        return self._solution
+
+    def _report(self, values: Dict[Hashable, Number]) -> Dict[str, Any]:
+        """Formata os valores de um estado (ou mistura) em relatório."""
+        terminal = {page: p for page, p in values.items() if page != self.TURNS and p}
+        absorbed = sum(terminal.values())
+        trapped = 1 - absorbed
+        if self.exact:
+            trapped_free = trapped == 0
+        else:
+            trapped = max(0.0, trapped)
+            trapped_free = trapped < 1e-12
+        return {
+            "terminal_probabilities": dict(sorted(terminal.items())),
+            "expected_turns": values.get(self.TURNS, 0) if trapped_free else float("inf"),
+            "trapped_probability": 0 * trapped if trapped_free else trapped
+        }
+
+    def _expected_after(self, transitions: List[Tuple[Number, State]]) -> Dict[Hashable, Number]:
+        """Valores esperados após uma jogada com as transições informadas (soma 1 jogada)."""
+        solution = self.solve()
+        one = Fraction(1) if self.exact else 1.0
+        total = sum(p for p, _ in transitions)
+        values: Dict[Hashable, Number] = {self.TURNS: one}
+        for p, (page, occupation) in transitions:
+            weight = p / total
+            if self.is_absorbing(page) or not self.transitions((page, occupation)):
+                values[page] = values.get(page, 0) + weight
+            else:
+                for key, value in solution[(page, occupation)].items():
+                    values[key] = values.get(key, 0) + weight * value
+        return values
+
+    def analyze_state(self, page_id: int, occupation: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Relatório de desfechos a partir de um estado qualquer.
+
+        Args:
+            page_id: Página de partida
+            occupation: Ocupação do personagem
+
+        Returns:
+            Dicionário com 'terminal_probabilities', 'expected_turns' e 'trapped_probability'
+        """
+        state = (page_id, occupation)
+        if self.is_absorbing(page_id) or not self.transitions(state):
+            return self._report({page_id: Fraction(1) if self.exact else 1.0, self.TURNS: 0})
+        if state not in self.solve():
+            # Estado fora da região alcançável a partir do início: inclui e resolve novamente
+            self._extra_starts.append(state)
+            self._solution = None
+        return self._report(self.solve()[state])
+
+    def analyze(self) -> Dict[str, Any]:
+        """
+        Resolve a partida completa e cada ocupação inicial.
+
+        A análise por ocupação condiciona a primeira jogada às choices da página
+        inicial que definem aquela ocupação (ou, sem elas, parte da página inicial
+        já com a ocupação).
+
+        Returns:
+            Dicionário com 'overall', 'by_occupation', 'states' e 'trapped_states'
+        """
+        solution = self.solve()
+        start = (self.start_page, None)
+        overall = self.analyze_state(*start)
+
+        occupations = sorted({occ for _, occ in solution if occ is not None} |
+                             {occ for transitions in self._transitions.values() for _, _, occ in transitions
+                              if occ is not None})
+        start_choices = self.pages.get(self.start_page, {}).get("choices", [])
+        by_occupation = {}
+        for occupation in occupations:
+            selecting = [choice for choice in start_choices
+                         if isinstance(choice, dict) and choice.get("set-occupation") == occupation]
+            if selecting:
+                transitions = []
+                for choice in selecting:
+                    for p, page, occ in choice_transitions(choice, self.start_page, None, self.profile, self.exact):
+                        transitions.append((p, (page, occ)))
+                by_occupation[occupation] = self._report(self._expected_after(transitions))
+            else:
+                by_occupation[occupation] = self.analyze_state(self.start_page, occupation)
+
+        return {
+            "overall": overall,
+            "by_occupation": by_occupation,
+            "states": len(solution),
+            "trapped_states": len(self._trapped)
+        }
+
+
+# Teste e validação
+if __name__ == "__main__":
+    import time
+
+    print("=== TESTE DO MARKOV ANALYZER ===\n")
+
+    start_time = time.perf_counter()
+    report = MarkovAnalyzer().analyze()
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Estados transientes: {report['states']} (presos: {report['trapped_states']})")
+    print(f"Resolvido em {elapsed * 1000:.1f} ms\n")
+    for label, data in [("Geral", report["overall"])] + list(report["by_occupation"].items()):
+        print(f"{label}: jogadas esperadas = {data['expected_turns']:.2f}, "
+              f"preso = {data['trapped_probability']:.4f}")
+        for page, p in data["terminal_probabilities"].items():
+            print(f"   página {page}: {p:.4f}")
+
+    print("\n=== TESTE CONCLUÍDO ===")
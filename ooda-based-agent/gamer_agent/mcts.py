@@ -0,0 +1,304 @@
+"""
+MCTS Module - Busca em árvore Monte Carlo sobre o livro-jogo
+
+Este módulo implementa o MCTSPlanner, uma busca UCT de laço aberto (open-loop):
+os nós da árvore são sequências de choices e cada iteração parte de uma cópia
+barata do personagem (Character.fork), amostrando novamente os dados. Após a
+expansão, uma simulação aleatória segue até o fim da história ou até o limite
+de profundidade.
+
+O modelo de avanço executa os planos compilados das choices (action_plan),
+os mesmos que o Agent executa: conditional_on resolvido pela ocupação, efeitos
+aplicados com Character.apply_validated_effects, rolagens com bonus/penalty dice
+e dificuldade, testes opostos e luck_roll com recuo para o nível inferior já
+resolvidos na compilação.
+
+Orçamento por decisão: número de rollouts e/ou tempo máximo em milissegundos.
+"""
+
+import contextlib
+import io
+import math
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from action_plan import (
+    ChoicePlan, EffectsOp, GotoOp, LuckRollOp, OpposedRollOp, Outcome, SetOccupationOp, SkillRollOp,
+    compile_pages,
+)
+from character import Character
+from dice_probability import evaluate_level
+from story_graph import END_PAGE
+
+
+class _Node:
+    """Nó da árvore de busca: estatísticas de uma sequência de choices."""
+
+    __slots__ = ("children", "visits", "value_sum")
+
+    def __init__(self):
+        self.children: Dict[int, "_Node"] = {}
+        self.visits = 0
+        self.value_sum = 0.0
+
+
+class MCTSPlanner:
+    """
+    Busca UCT de laço aberto com rollouts aleatórios.
+
+    Cada decisão cria uma nova árvore a partir do estado atual; o resultado é
+    a choice mais visitada na raiz.
+    """
+
+    def __init__(self, pages: Dict[int, Dict[str, Any]], rollouts: int = 1000,
+                 time_budget_ms: Optional[float] = None, max_depth: int = 60,
+                 exploration: float = 1.4, objective: Union[str, int] = "survival",
+                 rng: Optional[random.Random] = None,
+                 plans: Optional[Dict[int, Tuple[ChoicePlan, ...]]] = None):
+        """
+        Inicializa o planejador.
+
+        Args:
+            pages: Dicionário de páginas do jogo (efeitos já validados no
+                carregamento pelo GameRepository)
+            rollouts: Número máximo de iterações por decisão
+            time_budget_ms: Tempo máximo por decisão (None = apenas rollouts)
+            max_depth: Profundidade máxima (em jogadas) de cada iteração
+            exploration: Constante de exploração do UCB1
+            objective: "survival" ou página final alvo
+            rng: Gerador aleatório dedicado
+            plans: Planos compilados por página (ex.: GameRepository.get_choice_plans);
+                sem eles, as choices de 'pages' são compiladas aqui
+        """
+        if objective != "survival" and not isinstance(objective, int):
+            raise ValueError(f"Objetivo inválido: {objective!r} (use 'survival' ou uma página)")
+
+        self.pages = pages
+        self.plans = plans if plans is not None else compile_pages(pages)
+        self.rollouts = rollouts
+        self.time_budget_ms = time_budget_ms
+        self.max_depth = max_depth
+        self.exploration = exploration
+        self.objective = objective
+        self._rng = rng if rng is not None else random.Random()
+        self._op_handlers = {
+            SetOccupationOp: self._run_set_occupation,
+            EffectsOp: self._run_effects,
+            SkillRollOp: self._run_skill_roll,
+            LuckRollOp: self._run_luck_roll,
+            OpposedRollOp: self._run_opposed_roll,
+            GotoOp: self._run_goto,
+        }
+
+    # Modelo de avanço
+    def is_terminal(self, page_id: int, character: Character) -> bool:
+        """Verifica se a partida terminou (fim da história ou personagem Impaired)."""
+        if page_id == END_PAGE or not self.plans.get(page_id):
+            return True
+        return not character.is_alive()
+
+    def valid_actions(self, page_id: int, character: Character) -> List[int]:
+        """Índices (base 0) das choices executáveis na página para a ocupação atual."""
+        occupation = character.occupation
+        return [index for index, plan in enumerate(self.plans.get(page_id, ()))
+                if plan.resolve(occupation) is not None]
+
+    @staticmethod
+    def _roll_level(character: Character, name: str, difficulty: str = "regular",
+                    bonus_dice: bool = False, penalty_dice: bool = False) -> Tuple[int, int]:
+        """Rola uma habilidade/característica sem mensagens de erro; retorna (nível, rolagem)."""
+        result = character.roll_check(name, bonus_dice, penalty_dice, difficulty)
+        return result["level"], result["roll"]
+
+    def step(self, page_id: int, choice_index: int, character: Character) -> int:
+        """
+        Executa o plano compilado de uma choice sobre o personagem (modificando-o)
+        e retorna a próxima página.
+
+        Args:
+            page_id: Página atual
+            choice_index: Índice (base 0) da choice na página
+            character: Personagem da simulação (será modificado)
+
+        Returns:
+            Próxima página (a própria página se nenhum goto se aplicar)
+        """
+        plan = self.plans[page_id][choice_index].resolve(character.occupation)
+        target = None
+        if plan is not None:
+            for op in plan.ops:
+                op_target = self._op_handlers[type(op)](op, character)
+                if op_target is not None:
+                    target = op_target
+        character.advance_turn()
+        return page_id if target is None else target
+
+    @staticmethod
+    def _apply_outcome(outcome: Optional[Outcome], character: Character) -> Optional[int]:
+        """Aplica os efeitos de um resultado de rolagem e retorna seu destino."""
+        if outcome is None:
+            return None
+        if outcome.effects:
+            character.apply_validated_effects(outcome.effects)
+        return outcome.goto
+
+    @staticmethod
+    def _run_set_occupation(op: SetOccupationOp, character: Character) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            character.set_occupation(op.occupation)
+
+    @staticmethod
+    def _run_effects(op: EffectsOp, character: Character) -> None:
+        character.apply_validated_effects(op.effects)
+
+    def _run_skill_roll(self, op: SkillRollOp, character: Character) -> Optional[int]:
+        level, _ = self._roll_level(character, op.skill, op.difficulty, op.bonus_dice, op.penalty_dice)
+        return self._apply_outcome(op.outcomes[level], character)
+
+    def _run_luck_roll(self, op: LuckRollOp, character: Character) -> Optional[int]:
+        level = character.roll_luck(op.bonus_dice, op.penalty_dice)["level"]
+        return self._apply_outcome(op.outcomes[level], character)
+
+    def _run_opposed_roll(self, op: OpposedRollOp, character: Character) -> Optional[int]:
+        my_level, my_roll = self._roll_level(character, op.skill, "regular", op.bonus_dice, op.penalty_dice)
+        opponent_roll = character._make_d100_roll()
+        opponent_level = evaluate_level(opponent_roll, op.opponent_full, op.opponent_half)
+        if my_level != opponent_level:
+            outcome = op.win if my_level > opponent_level else op.lose
+        else:
+            outcome = op.win if my_roll < opponent_roll else op.lose if my_roll > opponent_roll else op.draw
+        return self._apply_outcome(outcome, character)
+
+    @staticmethod
+    def _run_goto(op: GotoOp, character: Character) -> Optional[int]:
+        return op.target
+
+    def _reward(self, page_id: int, character: Character, terminal: bool) -> float:
+        """Recompensa ao fim de uma iteração (terminal ou corte por profundidade)."""
+        alive = character.is_alive()
+        if not alive:
+            return 0.0
+        if self.objective == "survival":
+            if terminal:
+                return 1.0
+            # Corte por profundidade: estimativa neutra reduzida pelo dano sofrido
+            damage = character.get_health_status()
+            return 0.5 * (1.0 - damage["damage_taken"] / max(1, damage["max_damage"]))
+        return 1.0 if terminal and page_id == self.objective else 0.0
+
+    # Busca
+    def search(self, character: Character, page_id: int) -> Tuple[Optional[int], Dict[str, Any]]:
+        """
+        Executa a busca a partir do estado atual.
+
+        Args:
+            character: Personagem atual (não é modificado)
+            page_id: Página atual
+
+        Returns:
+            Tupla (índice base 0 da melhor choice ou None, estatísticas da busca)
+        """
+        root_actions = self.valid_actions(page_id, character)
+        if not root_actions:
+            return None, {"iterations": 0, "actions": {}}
+        if len(root_actions) == 1:
+            return root_actions[0], {"iterations": 0, "actions": {root_actions[0]: {"visits": 0, "value": None}}}
+
+        root = _Node()
+        deadline = None
+        if self.time_budget_ms is not None:
+            deadline = time.perf_counter() + self.time_budget_ms / 1000.0
+
+        iterations = 0
+        while iterations < self.rollouts:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._iterate(root, character, page_id)
+            iterations += 1
+
+        best = max(root_actions, key=lambda a: root.children[a].visits if a in root.children else -1)
+        actions = {
+            action: {
+                "visits": node.visits,
+                "value": node.value_sum / node.visits if node.visits else None
+            }
+            for action, node in sorted(root.children.items())
+        }
+        return best, {"iterations": iterations, "actions": actions}
+
+    def _iterate(self, root: _Node, character: Character, page_id: int) -> None:
+        """Uma iteração: seleção, expansão, simulação e retropropagação."""
+        simulated = character.fork(rng=self._rng)
+        node = root
+        path = [root]
+        depth = 0
+        terminal = self.is_terminal(page_id, simulated)
+
+        # Seleção e expansão
+        while not terminal and depth < self.max_depth:
+            actions = self.valid_actions(page_id, simulated)
+            untried = [a for a in actions if a not in node.children]
+            if untried:
+                action = self._rng.choice(untried)
+                node.children[action] = _Node()
+                node = node.children[action]
+                path.append(node)
+                page_id = self.step(page_id, action, simulated)
+                depth += 1
+                terminal = self.is_terminal(page_id, simulated)
+                break
+
+            log_visits = math.log(node.visits)
+            action = max(actions, key=lambda a: self._ucb(node.children[a], log_visits))
+            node = node.children[action]
+            path.append(node)
+            page_id = self.step(page_id, action, simulated)
+            depth += 1
+            terminal = self.is_terminal(page_id, simulated)
+
+        # Simulação aleatória
+        while not terminal and depth < self.max_depth:
+            actions = self.valid_actions(page_id, simulated)
+            if not actions:
+                terminal = True
+                break
+            page_id = self.step(page_id, self._rng.choice(actions), simulated)
+            depth += 1
+            terminal = self.is_terminal(page_id, simulated)
+
+        reward = self._reward(page_id, simulated, terminal)
+        for visited in path:
+            visited.visits += 1
+            visited.value_sum += reward
+
+    def _ucb(self, node: _Node, log_parent_visits: float) -> float:
+        """Pontuação UCB1 de um filho."""
+        return node.value_sum / node.visits + self.exploration * math.sqrt(log_parent_visits / node.visits)
+
+
+# Teste e validação
+if __name__ == "__main__":
+    from game_repository import GameRepository
+
+    print("=== TESTE DO MCTS ===\n")
+
+    repo = GameRepository()
+    page_ids = repo.get_all_page_ids()
+    pages = {page_id: repo.get_page(page_id) for page_id in page_ids}
+    plans = {page_id: repo.get_choice_plans(page_id) for page_id in page_ids}
+    planner = MCTSPlanner(pages, rollouts=2000, rng=random.Random(42), plans=plans)
+
+    character = Character(rng=random.Random(1))
+    with contextlib.redirect_stdout(io.StringIO()):
+        character.set_occupation("Police Officer")
+
+    start_time = time.perf_counter()
+    best, stats = planner.search(character, 3)
+    elapsed = time.perf_counter() - start_time
+    print(f"Página 3: melhor choice {best + 1} após {stats['iterations']} iterações "
+          f"({stats['iterations'] / elapsed:.0f} rollouts/s)")
+    for action, data in stats["actions"].items():
+        print(f"   choice {action + 1}: visitas={data['visits']} valor={data['value']:.3f}")
+
+    print("\n=== TESTE CONCLUÍDO ===")
@@ -12,22 +12,120 @@ from rich.table import Table
 from rich.columns import Columns
 from rich.text import Text
 from rich.console import Console
+from rich.live import Live
+from rich.measure import Measurement
+from rich.segment import Segment
 from typing import Tuple, Optional
+from collections import OrderedDict
+import atexit
 import json
 import os, re
+import queue
 import random
+import threading
 import requests
 
 
+class _RenderedPanel:
+    """
+    Painel com as linhas já renderizadas em cache (por largura disponível).
+
+    Enquanto o painel não é substituído, os quadros seguintes reaproveitam os
+    segmentos em vez de refazer o layout das tabelas e a quebra de texto.
+    """
+
+    __slots__ = ("renderable", "options", "_lines", "_lines_key", "_measure", "_measure_key")
+
+    def __init__(self, renderable: Any):
+        self.renderable = renderable
+        self.options = None   # opções da última renderização (usadas no pré-aquecimento)
+        self._lines = None
+        self._lines_key = None
+        self._measure = None
+        self._measure_key = None
+
+    def __rich_measure__(self, console: Console, options: Any) -> Measurement:
+        key = (options.min_width, options.max_width)
+        if self._measure_key != key:
+            self._measure = Measurement.get(console, options, self.renderable)
+            self._measure_key = key
+        return self._measure
+
+    def prerender(self, console: Console, options: Any) -> None:
+        """Renderiza as linhas antecipadamente para as opções dadas."""
+        key = (options.max_width, options.height)
+        if self._lines_key != key:
+            self._lines = console.render_lines(self.renderable, options, pad=False)
+            self._lines_key = key
+
+    def __rich_console__(self, console: Console, options: Any):
+        self.options = options
+        self.prerender(console, options)
+        new_line = Segment.line()
+        for line in self._lines:
+            yield from line
+            yield new_line
+
+
+class PagePanelCache:
+    """
+    Cache LRU dos painéis de página e de escolhas já renderizados.
+
+    Chave: (página, ocupação, largura do terminal); a ocupação só entra na
+    chave das páginas com escolhas conditional_on.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[int, Optional[str], int], Tuple[Any, ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[int, Optional[str], int]) -> Optional[Tuple[Any, ...]]:
+        """Entrada da chave (marcada como usada recentemente) ou None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Tuple[int, Optional[str], int], entry: Tuple[Any, ...]) -> None:
+        """Guarda uma entrada, descartando a usada há mais tempo se necessário."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: Tuple[int, Optional[str], int]) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class RenderConsole:
     """
     Encapsula toda a lógica de renderização da UI do jogo para um jogador humano,
     utilizando a biblioteca Rich para criar um "cockpit" informativo no console.
     """
 
-    def __init__(self, debug: bool = False):
+    # Limpa o terminal a cada quadro: mensagens impressas durante o desenho se perdem
+    clears_screen = True
+
+    def __init__(self, debug: bool = False, game_repository: Any = None, cache_size: int = 64):
+        """
+        Args:
+            debug: Se True, exibe informações de debug
+            game_repository: GameRepository usado para pré-aquecer os painéis das
+                páginas seguintes (sem ele, só as páginas já visitadas ficam em cache)
+            cache_size: Número máximo de páginas no cache de painéis
+        """
         self.console = Console()
         self._debug = debug
+        self._game_repository = game_repository
+        self._page_panel_cache = PagePanelCache(cache_size)
 
     def render_game_screen(
         self,
@@ -65,14 +163,9 @@ class RenderConsole:
         # 3. Construir painel de histórico
         history_panel = self._build_history_panel(history)
 
-        # 4. Construir painel da situação atual
-        page_text = current_page_data.get("text", "Página não encontrada.")
-        page_panel = Panel(
-            Text(page_text, style="white"), title="SITUAÇÃO ATUAL", border_style="cyan"
-        )
-
-        # 5. Construir painel de escolhas
-        choices_panel = self._build_choices_panel(choices)
+        # 4-5. Painéis da situação atual e de escolhas (do cache por página)
+        occupation = character_data["character_info"].get("occupation")
+        page_panel, choices_panel = self._page_panels(current_page_number, current_page_data, choices, occupation)
 
         # 6. Montar layout principal em um grid
         main_grid = Table.grid(padding=(1, 0), expand=True)
@@ -96,6 +189,56 @@ class RenderConsole:
         # 7. Renderizar na tela
         self.console.print(main_panel)
 
+        # 8. Preparar os painéis das próximas páginas
+        self.prewarm(current_page_number, occupation, page_panel.options)
+
+    def _page_key(self, page_number: int, choices: List[Dict[str, Any]],
+                  occupation: Optional[str]) -> Tuple[int, Optional[str], int]:
+        """Chave do cache de painéis de uma página."""
+        conditional = any(isinstance(choice, dict) and choice.get("conditional_on") == "occupation"
+                          for choice in choices)
+        return (page_number, occupation if conditional else None, self.console.width)
+
+    def _page_panels(self, page_number: int, page_data: Dict[str, Any], choices: List[Dict[str, Any]],
+                     occupation: Optional[str], options: Any = None) -> Tuple[Any, Any]:
+        """
+        Painéis (situação atual, escolhas) de uma página, do cache quando possível.
+
+        A entrada só é reaproveitada se o texto e as escolhas forem os mesmos
+        (escolhas de sistema, por exemplo, geram painéis próprios).
+        """
+        page_text = page_data.get("text", "Página não encontrada.")
+        key = self._page_key(page_number, choices, occupation)
+        entry = self._page_panel_cache.get(key)
+        if entry is not None and entry[0] == page_text and entry[1] == choices:
+            return entry[2], entry[3]
+
+        page_panel = _RenderedPanel(Panel(
+            Text(page_text, style="white"), title="SITUAÇÃO ATUAL", border_style="cyan"
+        ))
+        choices_panel = _RenderedPanel(self._build_choices_panel(choices))
+        if options is not None:
+            page_panel.prerender(self.console, options)
+            choices_panel.prerender(self.console, options)
+        self._page_panel_cache.put(key, (page_text, choices, page_panel, choices_panel))
+        return page_panel, choices_panel
+
+    def prewarm(self, page_number: int, occupation: Optional[str], options: Any = None) -> None:
+        """
+        Constrói (e, com options, já renderiza) os painéis das páginas alcançáveis.
+
+        Args:
+            page_number: Página atual
+            occupation: Ocupação do personagem
+            options: Opções de renderização do painel da página atual
+        """
+        if self._game_repository is None:
+            return
+        for target in sorted(self._game_repository.get_successors(page_number)):
+            page_data = self._game_repository.get_page(target)
+            if page_data:
+                self._page_panels(target, page_data, page_data.get("choices", []), occupation, options)
+
     def _build_info_table(self, status_data: Dict[str, Any]) -> Panel:
         """Cria a tabela de informações básicas e saúde."""
         table = Table.grid(padding=(0, 1))
@@ -289,6 +432,270 @@ class RenderConsole:
 
         return text or "Ação sem descrição"
 
+    def prompt(self, message: str) -> str:
+        """Lê uma entrada do jogador abaixo da tela renderizada."""
+        return input(message)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda os quadros pendentes (a renderização aqui é síncrona)."""
+        return True
+
+    def close(self) -> None:
+        """Libera recursos da tela (nada a fazer no modo clássico)."""
+
+
+class LiveRenderConsole(RenderConsole):
+    """
+    Renderizador sobre um Rich Live persistente (sem limpar a tela a cada quadro).
+
+    Em vez de limpar o terminal (subprocesso "clear") e reconstruir todos os
+    painéis, mantém os painéis do último quadro e reconstrói apenas aqueles
+    cujos dados mudaram: personagem, recursos, atributos, habilidades,
+    histórico, página e escolhas. Um quadro sem nenhuma mudança não é
+    redesenhado. Mensagens impressas entre quadros aparecem acima da tela
+    (redirecionamento do Live).
+    """
+
+    clears_screen = False
+
+    def __init__(self, debug: bool = False, console: Optional[Console] = None,
+                 game_repository: Any = None, cache_size: int = 64):
+        super().__init__(debug, game_repository, cache_size)
+        if console is not None:
+            self.console = console
+        self._live: Optional[Live] = None
+        # Painel -> (dados usados na construção, painel construído)
+        self._panels: Dict[str, Tuple[Any, Any]] = {}
+        self._rebuilt = False
+        self._page_number: Optional[int] = None
+        atexit.register(self.close)
+
+    def render_game_screen(
+        self,
+        choices: List[Dict[str, Any]],
+        character_data: Dict[str, Any],
+        history: List[Dict[str, Any]],
+        current_page_data: Dict[str, Any],
+        current_page_number: int,
+    ) -> None:
+        """
+        Atualiza a tela de jogo, reconstruindo só os painéis com dados novos.
+
+        Mesmo layout de RenderConsole.render_game_screen.
+        """
+        if self._debug:
+            print(f"[LiveRenderConsole] Atualizando tela - Página {current_page_number}")
+
+        self._rebuilt = False
+        # Dados de cada painel: os dicionários do Cockpit são reutilizados
+        # enquanto nada muda, e a comparação de conteúdos idênticos é imediata
+        status_layout = Columns(
+            [
+                self._panel("info", (character_data["character_info"], character_data["health_status"]),
+                            lambda: self._build_info_table(character_data)),
+                self._panel("resources", character_data["resources"],
+                            lambda: self._build_resources_table(character_data)),
+                self._panel("attributes", character_data.get("characteristics"),
+                            lambda: self._build_attributes_table(character_data)),
+                self._panel("skills", character_data.get("skills"),
+                            lambda: self._build_skills_table(character_data)),
+            ],
+            equal=True,
+            expand=True,
+        )
+        recent_history = history[-5:]
+        history_panel = self._panel("history", recent_history, lambda: self._build_history_panel(recent_history))
+        occupation = character_data["character_info"].get("occupation")
+        page_panel, choices_panel = self._page_panels(current_page_number, current_page_data, choices, occupation)
+        page_panel = self._panel("page", page_panel, lambda: page_panel)
+        choices_panel = self._panel("choices", choices_panel, lambda: choices_panel)
+
+        if self._live is not None and not self._rebuilt and current_page_number == self._page_number:
+            return
+        self._page_number = current_page_number
+
+        main_grid = Table.grid(padding=(1, 0), expand=True)
+        main_grid.add_column()
+        main_grid.add_row(status_layout)
+        if history_panel:
+            main_grid.add_row("")
+            main_grid.add_row(history_panel)
+        main_grid.add_row("")
+        main_grid.add_row(page_panel)
+        main_grid.add_row("")
+        main_grid.add_row(choices_panel)
+
+        # Linhas do quadro em cache: cada print redirecionado pelo Live
+        # redesenha a tela, e não deve refazer o layout inteiro
+        main_panel = _RenderedPanel(Panel(
+            main_grid,
+            title=f"🎮 COCKPIT - PÁGINA {current_page_number}",
+            border_style="bold blue",
+            expand=False,
+        ))
+
+        if self._live is None:
+            # Novo Live (primeiro quadro ou após uma entrada do jogador)
+            self.console.clear()
+            self._live = Live(main_panel, console=self.console, auto_refresh=False,
+                              vertical_overflow="visible")
+            self._live.start()
+        self._live.update(main_panel, refresh=True)
+        self.prewarm(current_page_number, occupation, page_panel.options)
+
+    def _panel(self, name: str, data: Any, build) -> Any:
+        """Painel em cache, reconstruído apenas quando os dados mudam."""
+        cached = self._panels.get(name)
+        if cached is not None and cached[0] == data:
+            return cached[1]
+        self._rebuilt = True
+        panel = build()
+        if panel is not None and not isinstance(panel, _RenderedPanel):
+            panel = _RenderedPanel(panel)
+        self._panels[name] = (data, panel)
+        return panel
+
+    def prompt(self, message: str) -> str:
+        """
+        Lê uma entrada do jogador.
+
+        O Live é encerrado (o último quadro permanece visível) para que a
+        digitação não desloque a área redesenhada; o próximo quadro começa
+        um novo Live após limpar a tela com sequências ANSI.
+        """
+        self.close()
+        return self.console.input(message)
+
+    def close(self) -> None:
+        """Encerra o Live (restaura o cursor); pode ser chamado mais de uma vez."""
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+
+
+class NullRenderer(RenderConsole):
+    """
+    Renderizador que descarta os quadros.
+
+    Para benchmarks: mantém o caminho interativo dos adapters (prints, pausas)
+    sem o custo de desenhar a tela.
+    """
+
+    clears_screen = False
+
+    def render_game_screen(
+        self,
+        choices: List[Dict[str, Any]],
+        character_data: Dict[str, Any],
+        history: List[Dict[str, Any]],
+        current_page_data: Dict[str, Any],
+        current_page_number: int,
+    ) -> None:
+        """Descarta o quadro."""
+
+
+class BackgroundRenderer:
+    """
+    Desenha os quadros de outro renderizador em uma thread dedicada.
+
+    render_game_screen apenas enfileira o quadro e retorna, tirando a
+    renderização do caminho crítico da decisão. A fila tem um único lugar:
+    um quadro novo substitui o pendente ainda não desenhado, de modo que o
+    worker sempre desenha o estado mais recente. prompt() e wait_idle()
+    aguardam o quadro pendente antes de prosseguir.
+
+    Se o renderizador limpa a tela a cada quadro (RenderConsole clássico),
+    render_game_screen aguarda o desenho: do contrário, a limpeza feita pelo
+    worker se intercalaria com o log de ações impresso pelo agente.
+    """
+
+    def __init__(self, renderer: RenderConsole):
+        """
+        Args:
+            renderer: Renderizador que desenha os quadros (usado só pelo worker)
+        """
+        self.renderer = renderer
+        self.clears_screen = renderer.clears_screen
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._run, name="render-worker", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def render_game_screen(
+        self,
+        choices: List[Dict[str, Any]],
+        character_data: Dict[str, Any],
+        history: List[Dict[str, Any]],
+        current_page_data: Dict[str, Any],
+        current_page_number: int,
+    ) -> None:
+        """
+        Enfileira um quadro (substituindo o pendente) e retorna imediatamente,
+        ou após o desenho se o renderizador limpa a tela.
+
+        O histórico é copiado porque o agente continua a alterá-lo; os dados do
+        personagem vêm do Cockpit, que substitui as partes em vez de alterá-las.
+        """
+        if not self._thread.is_alive():
+            return
+        frame = (list(choices), dict(character_data), list(history), current_page_data, current_page_number)
+        self.frames_submitted += 1
+        while True:
+            try:
+                self._queue.put_nowait(frame)
+                break
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    continue
+                self._queue.task_done()
+                self.frames_dropped += 1
+        if self.clears_screen:
+            self.wait_idle()
+
+    def _run(self) -> None:
+        """Laço do worker: desenha cada quadro recebido até o sinal de parada (None)."""
+        while True:
+            frame = self._queue.get()
+            try:
+                if frame is None:
+                    return
+                self.renderer.render_game_screen(*frame)
+            except Exception as e:
+                print(f"ERRO: Falha ao renderizar a tela: {e}")
+            finally:
+                self._queue.task_done()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Aguarda até não haver quadro pendente nem em desenho.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos (None = sem limite)
+
+        Returns:
+            True se o worker ficou ocioso dentro do prazo
+        """
+        # Mesma condição usada por Queue.join(), mas com prazo
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def prompt(self, message: str) -> str:
+        """Lê uma entrada do jogador depois que a tela mais recente foi desenhada."""
+        self.wait_idle()
+        return self.renderer.prompt(message)
+
+    def close(self) -> None:
+        """Desenha o quadro pendente, encerra o worker e fecha o renderizador."""
+        if self._thread.is_alive():
+            self.wait_idle()
+            self._queue.put(None)
+            self._thread.join()
+        self.renderer.close()
+
 
 class DemoPlayerAdapter(PlayerStrategy):
     """
@@ -296,16 +703,22 @@ class DemoPlayerAdapter(PlayerStrategy):
     Internaliza a lógica do DefaultDecisionController para tomar decisões automáticas.
     """
 
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, headless: bool = False, rng: Optional[random.Random] = None,
+                 renderer: Optional[RenderConsole] = None):
         """
         Inicializa o DemoPlayerAdapter.
 
         Args:
             debug: Se True, exibe informações de debug durante a decisão.
+            headless: Se True, não renderiza a tela nem imprime a decisão (simulação).
+            rng: Gerador aleatório dedicado (padrão: módulo global random)
+            renderer: Renderizador da tela (padrão: RenderConsole)
         """
         self._debug = debug
+        self._headless = headless
+        self._rng = rng if rng is not None else random
         self._last_decision_reason = ""
-        self.renderer = RenderConsole(debug)
+        self.renderer = None if headless else (renderer or RenderConsole(debug))
 
     def get_decision(
         self,
@@ -329,20 +742,21 @@ class DemoPlayerAdapter(PlayerStrategy):
         if self._debug:
             print(f"[DemoPlayerAdapter] Processando {len(available_choices)} choices")
 
-        self.renderer.render_game_screen(
-            choices=available_choices,
-            character_data=character_data,
-            history=history,
-            current_page_data=current_page_data,
-            current_page_number=current_page_number,
-        )
+        if not self._headless:
+            self.renderer.render_game_screen(
+                choices=available_choices,
+                character_data=character_data,
+                history=history,
+                current_page_data=current_page_data,
+                current_page_number=current_page_number,
+            )
 
         # Validação básica
         if not available_choices:
             raise Exception("Lista de choices vazia - não é possível tomar decisão")
 
         if len(available_choices) > 1:
-            selected_index = random.choice(range(len(available_choices)))
+            selected_index = self._rng.choice(range(len(available_choices)))
             self._last_decision_reason = (
                 f"Seleção aleatória entre {len(available_choices)} opções básicas."
             )
@@ -350,6 +764,9 @@ class DemoPlayerAdapter(PlayerStrategy):
             selected_index = 0
             self._last_decision_reason = "Única escolha básica disponível."
 
+        if self._headless:
+            return selected_index + 1, self._last_decision_reason
+
         choice_text = available_choices[selected_index].get(
             "text", str(available_choices[selected_index])[:50]
         )
@@ -361,16 +778,205 @@ class DemoPlayerAdapter(PlayerStrategy):
         return selected_index + 1, self._last_decision_reason
 
 
+class OptimalPlayerAdapter(PlayerStrategy):
+    """
+    Adapter que joga a política ótima calculada pelo PolicySolver.
+
+    A política é resolvida uma única vez na criação; cada decisão é uma
+    consulta O(1) na tabela estado abstrato → choice, sem latência nem custo
+    de API. Serve de linha de base para comparar o LLMPlayerAdapter.
+    """
+
+    def __init__(self, game_repository: Any = None, objective: Any = "survival", debug: bool = False,
+                 headless: bool = False, solver: Any = None, renderer: Optional[RenderConsole] = None):
+        """
+        Inicializa o OptimalPlayerAdapter.
+
+        Args:
+            game_repository: GameRepository usado para resolver a política
+            objective: Objetivo do solver ("survival", página final alvo ou função)
+            debug: Se True, exibe informações de debug durante a decisão.
+            headless: Se True, não renderiza a tela nem imprime a decisão (simulação).
+            solver: PolicySolver já resolvido (reutilizado entre partidas)
+            renderer: Renderizador da tela (padrão: RenderConsole)
+        """
+        from policy_solver import PolicySolver
+
+        self._debug = debug
+        self._headless = headless
+        self._last_decision_reason = ""
+        self.solver = solver or PolicySolver(game_repository=game_repository, objective=objective)
+        self.solver.solve()
+        self.renderer = None if headless else (renderer or RenderConsole(debug))
+
+    def get_decision(
+        self,
+        available_choices: List[Dict[str, Any]],
+        character_data: Dict[str, Any],
+        history: List[Dict[str, Any]],
+        current_page_data: Dict[str, Any],
+        current_page_number: int,
+    ) -> Tuple[int, str]:
+        """
+        Consulta a política ótima para o estado atual.
+
+        Args:
+            available_choices: Lista de choices disponíveis
+            character_data: Dados estruturados do personagem
+            history: Histórico de decisões anteriores
+
+        Returns:
+            Índice (base 1) da escolha selecionada e justificativa
+        """
+        if not self._headless:
+            self.renderer.render_game_screen(
+                choices=available_choices,
+                character_data=character_data,
+                history=history,
+                current_page_data=current_page_data,
+                current_page_number=current_page_number,
+            )
+
+        if not available_choices:
+            raise Exception("Lista de choices vazia - não é possível tomar decisão")
+
+        state = self.solver.state_from_character_data(current_page_number, character_data)
+        choice_index = self.solver.best_choice(state)
+
+        if choice_index is None or choice_index >= len(available_choices):
+            choice_index = 0
+            self._last_decision_reason = "Estado fora da política calculada; usando a primeira escolha."
+            if not self._headless:
+                print(f"AVISO: Estado sem entrada na política ótima: {state}")
+        else:
+            value = self.solver.value(state)
+            self._last_decision_reason = f"Política ótima ({self.solver.objective})."
+            if value is not None:
+                self._last_decision_reason = f"Política ótima ({self.solver.objective}): valor esperado {value:.3f}."
+
+        if self._debug:
+            print(f"[OptimalPlayerAdapter] Estado: {state}")
+
+        if not self._headless:
+            choice_text = available_choices[choice_index].get("text", str(available_choices[choice_index])[:50])
+            print(f"[OptimalPlayerAdapter] Razão: {self._last_decision_reason}")
+            print(f"[OptimalPlayerAdapter] Selecionada choice {choice_index + 1}: {choice_text}")
+
+        return choice_index + 1, self._last_decision_reason
+
+
+class MCTSPlayerAdapter(PlayerStrategy):
+    """
+    Adapter que decide por busca em árvore Monte Carlo (UCT de laço aberto).
+
+    A cada decisão reconstrói o personagem a partir do status do Cockpit e
+    executa milhares de rollouts sobre cópias baratas (Character.fork),
+    respeitando o orçamento de rollouts e/ou de tempo.
+    """
+
+    def __init__(self, game_repository: Any = None, rollouts: int = 1000,
+                 time_budget_ms: Optional[float] = None, max_depth: int = 60,
+                 objective: Any = "survival", debug: bool = False, headless: bool = False,
+                 rng: Optional[random.Random] = None, renderer: Optional[RenderConsole] = None):
+        """
+        Inicializa o MCTSPlayerAdapter.
+
+        Args:
+            game_repository: GameRepository com as páginas (criado se None)
+            rollouts: Número máximo de rollouts por decisão
+            time_budget_ms: Tempo máximo por decisão em milissegundos
+            max_depth: Profundidade máxima de cada rollout
+            objective: "survival" ou página final alvo
+            debug: Se True, exibe as estatísticas da busca
+            headless: Se True, não renderiza a tela nem imprime a decisão (simulação).
+            rng: Gerador aleatório dedicado
+            renderer: Renderizador da tela (padrão: RenderConsole)
+        """
+        from mcts import MCTSPlanner
+
+        if game_repository is None:
+            from game_repository import GameRepository
+            game_repository = GameRepository()
+
+        self._debug = debug
+        self._headless = headless
+        self._rng = rng if rng is not None else random.Random()
+        self._last_decision_reason = ""
+        page_ids = game_repository.get_all_page_ids()
+        pages = {page_id: game_repository.get_page(page_id) for page_id in page_ids}
+        # Planos já compilados no carregamento do repositório
+        plans = {page_id: game_repository.get_choice_plans(page_id) for page_id in page_ids}
+        self.planner = MCTSPlanner(pages, rollouts=rollouts, time_budget_ms=time_budget_ms,
+                                   max_depth=max_depth, objective=objective, rng=self._rng, plans=plans)
+        self.renderer = None if headless else (renderer or RenderConsole(debug))
+
+    def get_decision(
+        self,
+        available_choices: List[Dict[str, Any]],
+        character_data: Dict[str, Any],
+        history: List[Dict[str, Any]],
+        current_page_data: Dict[str, Any],
+        current_page_number: int,
+    ) -> Tuple[int, str]:
+        """
+        Escolhe a choice mais visitada pela busca a partir do estado atual.
+
+        Args:
+            available_choices: Lista de choices disponíveis
+            character_data: Dados estruturados do personagem
+            history: Histórico de decisões anteriores
+
+        Returns:
+            Índice (base 1) da escolha selecionada e justificativa
+        """
+        from character import Character
+
+        if not self._headless:
+            self.renderer.render_game_screen(
+                choices=available_choices,
+                character_data=character_data,
+                history=history,
+                current_page_data=current_page_data,
+                current_page_number=current_page_number,
+            )
+
+        if not available_choices:
+            raise Exception("Lista de choices vazia - não é possível tomar decisão")
+
+        character = Character.from_status(character_data, rng=self._rng)
+        choice_index, stats = self.planner.search(character, current_page_number)
+
+        if choice_index is None or choice_index >= len(available_choices):
+            choice_index = 0
+            self._last_decision_reason = "Nenhuma choice válida encontrada pela busca; usando a primeira escolha."
+        else:
+            value = stats["actions"].get(choice_index, {}).get("value")
+            self._last_decision_reason = f"MCTS: {stats['iterations']} rollouts"
+            if value is not None:
+                self._last_decision_reason += f", valor estimado {value:.3f}"
+            self._last_decision_reason += "."
+
+        if self._debug:
+            print(f"[MCTSPlayerAdapter] Estatísticas: {stats}")
+
+        if not self._headless:
+            choice_text = available_choices[choice_index].get("text", str(available_choices[choice_index])[:50])
+            print(f"[MCTSPlayerAdapter] Razão: {self._last_decision_reason}")
+            print(f"[MCTSPlayerAdapter] Selecionada choice {choice_index + 1}: {choice_text}")
+
+        return choice_index + 1, self._last_decision_reason
+
+
 class HumanPlayerAdapter(PlayerStrategy):
     """
     Adapter para jogador humano via console.
     Implementa input loop com validação para capturar escolhas do usuário.
     """
 
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, renderer: Optional[RenderConsole] = None):
         self.console = Console()
         self._debug = debug
-        self.renderer = RenderConsole(debug)
+        self.renderer = renderer or RenderConsole(debug)
 
     def get_decision(
         self,
@@ -395,7 +1001,6 @@ class HumanPlayerAdapter(PlayerStrategy):
         # Loop de input com validação
         while True:
             try:
-                self.renderer = RenderConsole()
                 self.renderer.render_game_screen(
                     choices=available_choices,
                     character_data=character_data,
@@ -403,7 +1008,7 @@ class HumanPlayerAdapter(PlayerStrategy):
                     current_page_data=current_page_data,
                     current_page_number=current_page_number,
                 )
-                user_input = input(
+                user_input = self.renderer.prompt(
                     f"\nDigite sua escolha (1-{len(available_choices)}): "
                 ).strip()
 
@@ -34,3 +34,14 @@ class PlayerStrategy(ABC):
             Exception: Se não conseguir obter uma decisão válida do jogador.
         """
         pass
+
+    def wait_render(self) -> None:
+        """
+        Aguarda a tela pendente ser desenhada (renderização em segundo plano).
+
+        Chamado pelo agente antes de pausas interativas; adapters sem
+        renderizador não precisam fazer nada.
+        """
+        renderer = getattr(self, "renderer", None)
+        if renderer is not None:
+            renderer.wait_idle()
@@ -0,0 +1,463 @@
+"""
+Policy Solver Module - Política ótima por iteração de valor
+
+Este módulo resolve o livro-jogo como um processo de decisão de Markov sobre um
+estado abstrato do personagem e calcula, para cada estado alcançável, a melhor
+choice segundo um objetivo configurável:
+
+- "survival": terminar a história (página sem choices ou 'goto: 0') sem chegar
+  a Impaired;
+- um número de página: terminar vivo naquela página final;
+- uma função (AbstractState) → recompensa, avaliada nos estados absorventes.
+
+Estado abstrato: página, ocupação, dano (0-4, 4 = Impaired), faixa de sorte
+(sorte // luck_band_size) e modificadores ativos (habilidade, tipo, turnos
+restantes), que expiram como em Character.advance_turn (um turno por choice). As
+transições seguem as mesmas regras de markov_analyzer; efeitos de dano, cura,
+gasto de sorte e penalidades/bônus alteram o estado. A sorte inicial (50 + 2d10)
+é distribuída exatamente entre as faixas quando a ocupação é definida, e as
+rolagens de sorte usam o ponto médio da faixa.
+
+A política resultante é uma tabela estado → índice da choice, consultada em O(1)
+pelo OptimalPlayerAdapter.
+"""
+
+from collections import deque
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from action_plan import DEFAULT_OPPONENT_FULL
+from dice_probability import opposed_roll_distribution, success_level_distribution
+from markov_analyzer import OccupationProfile, resolve_choice, _result_goto
+from story_graph import END_PAGE
+
+# Dano em que o personagem fica Impaired (índice do último nível de dano)
+IMPAIRED_DAMAGE = 4
+
+
+class AbstractState(NamedTuple):
+    """Estado abstrato do personagem usado pelo solver."""
+    page: int
+    occupation: Optional[str]
+    damage: int
+    luck_band: int
+    modifiers: frozenset   # (habilidade, tipo, turnos restantes)
+
+
+Objective = Union[str, int, Callable[[AbstractState], float]]
+
+
+class PolicySolver:
+    """
+    Calcula a melhor choice por estado abstrato via iteração de valor.
+
+    A iteração usa um fator de desconto próximo de 1 apenas para desempatar
+    a favor de caminhos mais curtos (evita escolher voltas sem progresso); os
+    valores reportados são avaliados sem desconto para a política encontrada.
+    """
+
+    def __init__(self, game_repository: Any = None, pages: Optional[Dict[int, Dict[str, Any]]] = None,
+                 objective: Objective = "survival", start_page: int = 1, luck_band_size: int = 10,
+                 discount: float = 0.999, tolerance: float = 1e-9, max_iterations: int = 10000):
+        """
+        Inicializa o solver.
+
+        Args:
+            game_repository: GameRepository com as páginas (ignorado se pages for informado)
+            pages: Dicionário de páginas (alternativa ao repositório)
+            objective: "survival", página final alvo ou função de recompensa terminal
+            start_page: Página inicial
+            luck_band_size: Largura das faixas de sorte
+            discount: Fator de desconto usado na busca da política (desempate)
+            tolerance: Critério de convergência
+            max_iterations: Limite de iterações
+        """
+        if pages is None:
+            if game_repository is None:
+                from game_repository import GameRepository
+                game_repository = GameRepository()
+            pages = {page_id: game_repository.get_page(page_id) for page_id in game_repository.get_all_page_ids()}
+
+        self.pages = pages
+        self.start_page = start_page
+        self.objective = objective
+        self.luck_band_size = luck_band_size
+        self.discount = discount
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self._reward = self._build_reward(objective)
+        self._profiles: Dict[Optional[str], OccupationProfile] = {}
+
+        self._states: List[AbstractState] = []
+        self._index: Dict[AbstractState, int] = {}
+        self._actions: List[List[Tuple[int, List[Tuple[float, int]]]]] = []
+        self._policy: Dict[AbstractState, int] = {}
+        self._coarse_policy: Dict[Tuple[Any, ...], int] = {}
+        self._values: List[float] = []
+        self._solved = False
+        self._stats: Dict[str, Any] = {}
+
+    # Objetivos
+    def _build_reward(self, objective: Objective) -> Callable[[AbstractState], float]:
+        """Converte o objetivo em função de recompensa terminal."""
+        if callable(objective):
+            return objective
+        if objective == "survival":
+            return lambda state: 0.0 if state.damage >= IMPAIRED_DAMAGE else 1.0
+        if isinstance(objective, int):
+            return lambda state: 1.0 if state.page == objective and state.damage < IMPAIRED_DAMAGE else 0.0
+        raise ValueError(f"Objetivo inválido: {objective!r} (use 'survival', uma página ou uma função)")
+
+    # Modelo de transições
+    def profile(self, occupation: Optional[str]) -> OccupationProfile:
+        """Obtém (com cache) o perfil de rolagens de uma ocupação."""
+        if occupation not in self._profiles:
+            self._profiles[occupation] = OccupationProfile(occupation)
+        return self._profiles[occupation]
+
+    def luck_band(self, luck: int) -> int:
+        """Faixa de sorte de um valor de sorte."""
+        return max(0, luck) // self.luck_band_size
+
+    def _luck_value(self, band: int) -> int:
+        """Valor representativo (ponto médio) de uma faixa de sorte."""
+        if band <= 0:
+            return 0
+        return band * self.luck_band_size + self.luck_band_size // 2
+
+    def is_absorbing(self, state: AbstractState) -> bool:
+        """Verifica se o estado encerra a partida (fim, página inexistente ou Impaired)."""
+        if state.damage >= IMPAIRED_DAMAGE or state.page == END_PAGE:
+            return True
+        return not self.pages.get(state.page, {}).get("choices")
+
+    def _starting_luck_bands(self) -> List[Tuple[float, int]]:
+        """Distribuição exata das faixas para a sorte inicial 50 + 2d10."""
+        bands: Dict[int, float] = {}
+        for die_1 in range(1, 11):
+            for die_2 in range(1, 11):
+                band = self.luck_band(50 + die_1 + die_2)
+                bands[band] = bands.get(band, 0.0) + 0.01
+        return sorted((p, band) for band, p in bands.items())
+
+    def _apply_effects(self, state: AbstractState, effects: Any) -> AbstractState:
+        """Aplica os efeitos que alteram o estado abstrato."""
+        if not isinstance(effects, list):
+            return state
+        damage, luck_band, modifiers = state.damage, state.luck_band, state.modifiers
+        for effect in effects:
+            if not isinstance(effect, dict):
+                continue
+            action, amount = effect.get("action"), effect.get("amount", 0)
+            if effect.get("condition") == "full_health" and damage > 0:
+                continue
+            if action == "take_damage" and isinstance(amount, int) and amount > 0:
+                damage = min(IMPAIRED_DAMAGE, damage + amount)
+            elif action == "heal_damage" and isinstance(amount, int) and amount > 0:
+                damage = max(0, damage - amount)
+            elif action == "spend_luck" and isinstance(amount, int) and amount > 0:
+                if self._luck_value(luck_band) >= amount:
+                    luck_band = self.luck_band(self._luck_value(luck_band) - amount)
+            elif action in ("apply_penalty", "apply_bonus"):
+                modifier_type = "penalty_dice" if action == "apply_penalty" else "bonus_dice"
+                skill_name = effect.get("skill", "General")
+                # Como em Character.add_modifier, a duração conta a partir do
+                # próximo turno: o turno atual é descontado no fim da choice
+                remaining = effect.get("duration", 1) + 1
+                # Modificadores repetidos só importam pelo que dura mais
+                for existing in modifiers:
+                    if existing[:2] == (skill_name, modifier_type):
+                        remaining = max(remaining, existing[2])
+                modifiers = frozenset(m for m in modifiers if m[:2] != (skill_name, modifier_type)) | {
+                    (skill_name, modifier_type, remaining)}
+        return state._replace(damage=damage, luck_band=luck_band, modifiers=modifiers)
+
+    @staticmethod
+    def _advance_turn(state: AbstractState) -> AbstractState:
+        """Fim da choice: desconta um turno dos modificadores e remove os expirados."""
+        if not state.modifiers:
+            return state
+        return state._replace(modifiers=frozenset(
+            (skill_name, modifier_type, remaining - 1)
+            for skill_name, modifier_type, remaining in state.modifiers if remaining > 1
+        ))
+
+    @staticmethod
+    def _has_modifier(state: AbstractState, skill_name: str, modifier_type: str) -> bool:
+        """Verifica se há um modificador ativo do tipo para a habilidade."""
+        return any(modifier[:2] == (skill_name, modifier_type) for modifier in state.modifiers)
+
+    def _dice_flags(self, state: AbstractState, skill_name: str, choice: Dict[str, Any]) -> Tuple[bool, bool]:
+        """Bonus/penalty dice finais combinando a choice e os modificadores ativos."""
+        bonus = bool(choice.get("bonus_dice")) or self._has_modifier(state, skill_name, "bonus_dice")
+        penalty = bool(choice.get("penalty_dice")) or self._has_modifier(state, skill_name, "penalty_dice")
+        if bonus and penalty:
+            return False, False
+        return bonus, penalty
+
+    def _branches(self, state: AbstractState, choice: Dict[str, Any]) -> List[Tuple[float, Any]]:
+        """Resultados possíveis (probabilidade, resultado) da parte aleatória de uma choice."""
+        profile = self.profile(state.occupation)
+
+        if "roll" in choice:
+            roll_data = choice["roll"]
+            if isinstance(roll_data, dict):
+                skill_name = roll_data.get("skill")
+                difficulty = roll_data.get("difficulty", choice.get("difficulty", "regular"))
+                results = roll_data.get("results", choice.get("results", {}))
+            else:
+                skill_name, difficulty, results = roll_data, choice.get("difficulty", "regular"), choice.get("results", {})
+            bonus, penalty = self._dice_flags(state, skill_name, choice)
+            distribution = profile.level_distribution(skill_name, difficulty, bonus, penalty)
+            return [(p, results.get(str(level))) for level, p in distribution.items() if p]
+
+        if choice.get("luck_roll"):
+            results = choice.get("results", {})
+            luck = self._luck_value(state.luck_band)
+            branches = []
+            for level, p in success_level_distribution(luck, luck // 2).items():
+                if p:
+                    # Sem resultado para o nível: usa o nível inferior mais próximo
+                    branches.append((p, next((results[str(i)] for i in range(level, 0, -1) if results.get(str(i))), None)))
+            return branches
+
+        if "opposed_roll" in choice:
+            skill_name = choice["opposed_roll"]
+            my_full, my_half = profile.skill_values(skill_name)
+            opponent = choice.get("opponent_skill", {})
+            opponent_full = opponent.get("full", DEFAULT_OPPONENT_FULL)
+            bonus, penalty = self._dice_flags(state, skill_name, choice)
+            odds = opposed_roll_distribution(my_full, my_half, opponent_full,
+                                             opponent.get("half", opponent_full // 2), bonus, penalty)
+            return [(p, choice.get("outcomes", {}).get(outcome)) for outcome, p in odds.items() if p]
+
+        return [(1.0, {"goto": choice.get("goto")})]
+
+    def choice_outcomes(self, state: AbstractState, choice: Dict[str, Any]) -> List[Tuple[float, AbstractState]]:
+        """
+        Distribuição dos próximos estados ao executar uma choice já resolvida.
+
+        Args:
+            state: Estado abstrato atual
+            choice: Choice sem conditional_on
+
+        Returns:
+            Lista de tuplas (probabilidade, próximo estado)
+        """
+        starts: List[Tuple[float, AbstractState]] = [(1.0, state)]
+        new_occupation = choice.get("set-occupation")
+        if new_occupation is not None:
+            # set_occupation reinicia a sorte com 50 + 2d10
+            starts = [(p, state._replace(occupation=new_occupation, luck_band=band))
+                      for p, band in self._starting_luck_bands()]
+
+        merged: Dict[AbstractState, float] = {}
+        for p_start, start in starts:
+            current = self._apply_effects(start, choice.get("effects"))
+            if current.damage >= IMPAIRED_DAMAGE:
+                current = self._advance_turn(current)
+                merged[current] = merged.get(current, 0.0) + p_start
+                continue
+            for p, result in self._branches(current, choice):
+                if isinstance(result, dict):
+                    after = self._apply_effects(current, result.get("effects"))
+                else:
+                    after = current
+                target = _result_goto(result)
+                after = self._advance_turn(after._replace(page=state.page if target is None else target))
+                merged[after] = merged.get(after, 0.0) + p_start * p
+        return [(p, next_state) for next_state, p in merged.items()]
+
+    def valid_choices(self, state: AbstractState) -> List[Tuple[int, Dict[str, Any]]]:
+        """Choices executáveis no estado: (índice na página, choice resolvida)."""
+        valid = []
+        for index, choice in enumerate(self.pages.get(state.page, {}).get("choices", [])):
+            resolved = resolve_choice(choice, state.occupation)
+            if resolved is not None:
+                valid.append((index, resolved))
+        return valid
+
+    # Solução
+    def initial_state(self) -> AbstractState:
+        """Estado inicial: página inicial, sem ocupação, sem dano nem sorte."""
+        return AbstractState(self.start_page, None, 0, 0, frozenset())
+
+    def _build(self) -> None:
+        """Enumera os estados alcançáveis e suas ações."""
+        start = self.initial_state()
+        self._index = {start: 0}
+        self._states = [start]
+        self._actions = []
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            actions: List[Tuple[int, List[Tuple[float, int]]]] = []
+            if not self.is_absorbing(state):
+                for choice_index, choice in self.valid_choices(state):
+                    successors = []
+                    for p, next_state in self.choice_outcomes(state, choice):
+                        if next_state not in self._index:
+                            self._index[next_state] = len(self._states)
+                            self._states.append(next_state)
+                            queue.append(next_state)
+                        successors.append((p, self._index[next_state]))
+                    actions.append((choice_index, successors))
+            self._actions.append(actions)
+
+    def solve(self) -> Dict[str, Any]:
+        """
+        Enumera os estados, executa a iteração de valor e monta a tabela de política.
+
+        Returns:
+            Dicionário com estatísticas da solução
+        """
+        if self._solved:
+            return self._stats
+
+        self._build()
+        count = len(self._states)
+        rewards = [self._reward(state) if not actions else 0.0
+                   for state, actions in zip(self._states, self._actions)]
+
+        # Iteração de valor (Gauss-Seidel) com desconto para desempate
+        values = list(rewards)
+        iterations = 0
+        for iterations in range(1, self.max_iterations + 1):
+            delta = 0.0
+            for i in range(count):
+                actions = self._actions[i]
+                if not actions:
+                    continue
+                best = max(sum(p * values[j] for p, j in successors) for _, successors in actions)
+                best *= self.discount
+                delta = max(delta, abs(best - values[i]))
+                values[i] = best
+            if delta < self.tolerance:
+                break
+
+        self._policy = {}
+        chosen: List[Optional[List[Tuple[float, int]]]] = [None] * count
+        for i, actions in enumerate(self._actions):
+            if not actions:
+                continue
+            choice_index, successors = max(actions, key=lambda action: sum(p * values[j] for p, j in action[1]))
+            self._policy[self._states[i]] = choice_index
+            chosen[i] = successors
+
+        self._values = self._evaluate(rewards, chosen)
+
+        # Tabelas aproximadas para estados fora da enumeração (ex.: sorte ou
+        # modificadores não previstos): mantém a escolha do estado de maior valor
+        self._coarse_policy = {}
+        coarse_values: Dict[Tuple[Any, ...], float] = {}
+        for state, choice_index in self._policy.items():
+            value = self._values[self._index[state]]
+            for key in ((state.page, state.occupation, state.damage), (state.page, state.occupation)):
+                if key not in coarse_values or value > coarse_values[key]:
+                    coarse_values[key] = value
+                    self._coarse_policy[key] = choice_index
+        self._solved = True
+        self._stats = {
+            "objective": self.objective if not callable(self.objective) else getattr(self.objective, "__name__", "custom"),
+            "states": count,
+            "decision_states": len(self._policy),
+            "iterations": iterations,
+            "value": self._values[0]
+        }
+        return self._stats
+
+    def _evaluate(self, rewards: List[float], chosen: List[Optional[List[Tuple[float, int]]]]) -> List[float]:
+        """Avalia a política encontrada sem desconto."""
+        values = list(rewards)
+        for _ in range(self.max_iterations):
+            delta = 0.0
+            for i, successors in enumerate(chosen):
+                if successors is None:
+                    continue
+                value = sum(p * values[j] for p, j in successors)
+                delta = max(delta, abs(value - values[i]))
+                values[i] = value
+            if delta < self.tolerance:
+                break
+        return values
+
+    # Consultas
+    @property
+    def policy(self) -> Dict[AbstractState, int]:
+        """Tabela estado abstrato → índice (base 0) da melhor choice na página."""
+        self.solve()
+        return self._policy
+
+    def best_choice(self, state: AbstractState) -> Optional[int]:
+        """
+        Índice (base 0) da melhor choice para o estado.
+
+        Estados fora da tabela usam a escolha do estado mais próximo com mesma
+        página, ocupação e dano (ou apenas página e ocupação).
+
+        Returns:
+            Índice da choice, ou None se a página/ocupação não foi resolvida
+        """
+        policy = self.policy
+        choice_index = policy.get(state)
+        if choice_index is None:
+            choice_index = self._coarse_policy.get((state.page, state.occupation, state.damage))
+        if choice_index is None:
+            choice_index = self._coarse_policy.get((state.page, state.occupation))
+        return choice_index
+
+    def value(self, state: AbstractState) -> Optional[float]:
+        """Valor do objetivo (probabilidade, para objetivos padrão) a partir do estado."""
+        self.solve()
+        index = self._index.get(state)
+        return None if index is None else self._values[index]
+
+    def state_from_character_data(self, page_id: int, character_data: Dict[str, Any]) -> AbstractState:
+        """
+        Constrói o estado abstrato a partir dos dados do Cockpit.render_character_status.
+
+        Args:
+            page_id: Página atual
+            character_data: Dados estruturados do personagem
+
+        Returns:
+            Estado abstrato correspondente
+        """
+        health = character_data.get("health_status", {})
+        turn = health.get("turn")
+        remaining_by_modifier: Dict[Tuple[Any, Any], int] = {}
+        for modifier in character_data.get("modifiers", []):
+            if not isinstance(modifier, dict):
+                continue
+            expires_at = modifier.get("expires_at")
+            if isinstance(expires_at, int) and isinstance(turn, int):
+                remaining = expires_at - turn
+            else:
+                remaining = modifier.get("duration", 1)
+            key = (modifier.get("skill"), modifier.get("type"))
+            if remaining > 0:
+                remaining_by_modifier[key] = max(remaining, remaining_by_modifier.get(key, 0))
+        modifiers = frozenset(key + (remaining,) for key, remaining in remaining_by_modifier.items())
+        return AbstractState(
+            page=page_id,
+            occupation=character_data.get("character_info", {}).get("occupation"),
+            damage=min(IMPAIRED_DAMAGE, health.get("damage_taken", 0)),
+            luck_band=self.luck_band(character_data.get("resources", {}).get("luck", {}).get("current", 0)),
+            modifiers=modifiers
+        )
+
+
+# Teste e validação
+if __name__ == "__main__":
+    import time
+
+    print("=== TESTE DO POLICY SOLVER ===\n")
+
+    for objective in ("survival", 111):
+        start_time = time.perf_counter()
+        solver = PolicySolver(objective=objective)
+        stats = solver.solve()
+        elapsed = time.perf_counter() - start_time
+        print(f"Objetivo {objective}: {stats}")
+        print(f"   Resolvido em {elapsed * 1000:.1f} ms")
+
+    print("\n=== TESTE CONCLUÍDO ===")
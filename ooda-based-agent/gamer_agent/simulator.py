@@ -0,0 +1,299 @@
+"""
+Simulator Module - Execução headless de partidas em lote
+
+Este módulo implementa o Simulator, que executa o Agent de ponta a ponta sem
+renderização de console e sem pausas, coletando resultados estruturados por
+partida (página final, páginas visitadas, dano, sorte e magia gastas) para
+avaliação de estratégias e conteúdo em larga escala.
+
+O ParallelSimulator distribui partidas semeadas entre processos. Cada partida
+deriva seus próprios fluxos aleatórios (Character e jogador) exclusivamente
+da sua semente, de modo que o mesmo conjunto de sementes produz os mesmos
+resultados independentemente do número de workers.
+"""
+
+import contextlib
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Iterable
+
+from agent import Agent
+from game_repository import GameRepository
+from player_strategy_interface import PlayerStrategy
+
+
+class Simulator:
+    """
+    Executor headless de partidas completas do livro-jogo.
+
+    Reutiliza um único GameRepository entre partidas e cria um novo Agent
+    (e um novo Character) por partida, sem pausas nem renderização.
+    """
+
+    def __init__(self, game_repository: Optional[GameRepository] = None, lang: str = 'en',
+                 player_factory: Optional[Callable[[Optional[random.Random]], PlayerStrategy]] = None,
+                 max_turns: int = 500, quiet: bool = True):
+        """
+        Inicializa o Simulator.
+
+        Args:
+            game_repository: Repositório já carregado (criado a partir de lang se None)
+            lang: Idioma do jogo, usado apenas se game_repository for None
+            player_factory: Fábrica de PlayerStrategy por partida, recebe o rng do
+                            jogador (padrão: Demo headless)
+            max_turns: Limite de jogadas por partida para evitar loops infinitos
+            quiet: Se True, descarta a saída de console produzida durante as partidas
+        """
+        self.game_repository = game_repository or GameRepository(lang=lang)
+        self.player_factory = player_factory or self._default_player_factory
+        self.max_turns = max_turns
+        self.quiet = quiet
+
+    @staticmethod
+    def _default_player_factory(rng: Optional[random.Random] = None) -> PlayerStrategy:
+        """Cria o jogador padrão da simulação: DemoPlayerAdapter sem renderização."""
+        from player_strategy import DemoPlayerAdapter
+        return DemoPlayerAdapter(headless=True, rng=rng)
+
+    def run_once(self, run_id: int = 0, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Executa uma partida completa e retorna o resultado estruturado.
+
+        Args:
+            run_id: Identificador da partida no lote
+            seed: Semente da partida; se None, usa o módulo global random
+
+        Returns:
+            Dicionário com o resultado da partida
+        """
+        character_rng, player_rng = session_rngs(seed) if seed is not None else (None, None)
+
+        agent = Agent(
+            game_repository=self.game_repository,
+            player_input_adapter=self.player_factory(player_rng),
+            interactive=False,
+            rng=character_rng
+        )
+
+        error = None
+        start = time.perf_counter()
+        with self._output_sink():
+            try:
+                agent.run(max_turns=self.max_turns)
+            except Exception as e:
+                error = str(e)
+                agent.end_reason = "error"
+        elapsed = time.perf_counter() - start
+
+        return self._build_run_result(run_id, seed, agent, error, elapsed)
+
+    def run(self, n: int) -> Dict[str, Any]:
+        """
+        Executa N partidas em sequência.
+
+        Args:
+            n: Número de partidas
+
+        Returns:
+            Dicionário com 'runs' (resultados por partida) e 'summary' (agregado)
+        """
+        start = time.perf_counter()
+        runs = [self.run_once(run_id) for run_id in range(n)]
+        elapsed = time.perf_counter() - start
+
+        return {
+            "runs": runs,
+            "summary": summarize_runs(runs, elapsed)
+        }
+
+    def run_seeds(self, seeds: Iterable[int]) -> Dict[str, Any]:
+        """
+        Executa uma partida por semente, em sequência e de forma reprodutível.
+
+        Args:
+            seeds: Sementes das partidas
+
+        Returns:
+            Dicionário com 'runs' (resultados por partida) e 'summary' (agregado)
+        """
+        start = time.perf_counter()
+        runs = [self.run_once(run_id=seed, seed=seed) for seed in seeds]
+        elapsed = time.perf_counter() - start
+
+        return {
+            "runs": runs,
+            "summary": summarize_runs(runs, elapsed)
+        }
+
+    def _output_sink(self):
+        """Contexto que descarta stdout durante as partidas quando quiet=True."""
+        if not self.quiet:
+            return contextlib.nullcontext()
+        return contextlib.redirect_stdout(_NULL_STREAM)
+
+    def _build_run_result(self, run_id: int, seed: Optional[int], agent: Agent, error: Optional[str],
+                          elapsed: float) -> Dict[str, Any]:
+        """Extrai o resultado estruturado do estado final de um Agent."""
+        character = agent.cockpit.character
+        luck = character.get_luck()
+        magic = character.get_magic_points()
+        health = character.get_health_status()
+
+        return {
+            "run_id": run_id,
+            "seed": seed,
+            "final_page": agent.cockpit.current_page_number,
+            "end_reason": agent.end_reason,
+            "turns": agent.turns,
+            "pages_visited": list(agent.visited_pages),
+            "occupation": character.occupation,
+            "damage_taken": health["damage_taken"],
+            "health": health["current_level"],
+            "luck_spent": luck["starting"] - luck["current"],
+            "magic_spent": magic["starting"] - magic["current"],
+            "error": error,
+            "duration_ms": elapsed * 1000
+        }
+
+
+class ParallelSimulator:
+    """
+    Distribui partidas semeadas entre todos os núcleos via pool de processos.
+
+    Cada worker carrega o GameRepository uma única vez (initializer) e executa
+    partidas isoladas; os resultados são devolvidos na ordem das sementes e
+    agregados em um único relatório.
+    """
+
+    def __init__(self, workers: Optional[int] = None, lang: str = 'en', max_turns: int = 500,
+                 chunksize: int = 16):
+        """
+        Inicializa o ParallelSimulator.
+
+        Args:
+            workers: Número de processos (padrão: os.cpu_count())
+            lang: Idioma do jogo carregado em cada worker
+            max_turns: Limite de jogadas por partida
+            chunksize: Quantidade de sementes enviadas por lote a cada worker
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.lang = lang
+        self.max_turns = max_turns
+        self.chunksize = chunksize
+
+    def run(self, seeds: Iterable[int]) -> Dict[str, Any]:
+        """
+        Executa uma partida por semente distribuindo entre os workers.
+
+        Args:
+            seeds: Sementes das partidas (uma partida por semente)
+
+        Returns:
+            Dicionário com 'runs' (na ordem das sementes) e 'summary' (agregado)
+        """
+        seeds = list(seeds)
+        start = time.perf_counter()
+
+        if self.workers <= 1:
+            # Execução no próprio processo: mesmos resultados, sem custo de pool
+            _init_worker(self.lang, self.max_turns)
+            runs = [_run_seed(seed) for seed in seeds]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.lang, self.max_turns)) as pool:
+                runs = list(pool.map(_run_seed, seeds, chunksize=self.chunksize))
+
+        elapsed = time.perf_counter() - start
+        summary = summarize_runs(runs, elapsed)
+        summary["workers"] = self.workers
+
+        return {
+            "runs": runs,
+            "summary": summary
+        }
+
+
+# Estado por processo do pool (inicializado uma vez por worker)
+_WORKER_SIMULATOR: Optional[Simulator] = None
+
+
+def _init_worker(lang: str, max_turns: int) -> None:
+    """Inicializa o Simulator do worker, carregando o repositório uma única vez."""
+    global _WORKER_SIMULATOR
+    _WORKER_SIMULATOR = Simulator(lang=lang, max_turns=max_turns)
+
+
+def _run_seed(seed: int) -> Dict[str, Any]:
+    """Executa uma partida semeada no Simulator do worker atual."""
+    return _WORKER_SIMULATOR.run_once(run_id=seed, seed=seed)
+
+
+def session_rngs(seed: int) -> tuple[random.Random, random.Random]:
+    """
+    Deriva fluxos aleatórios independentes (Character, jogador) de uma semente.
+
+    Args:
+        seed: Semente da partida
+
+    Returns:
+        Tupla (rng do Character, rng do jogador)
+    """
+    master = random.Random(seed)
+    return random.Random(master.getrandbits(64)), random.Random(master.getrandbits(64))
+
+
+def summarize_runs(runs: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """
+    Agrega resultados de partidas em um relatório resumido.
+
+    Args:
+        runs: Lista de resultados produzidos por Simulator.run_once
+        elapsed: Tempo total de parede em segundos
+
+    Returns:
+        Dicionário com estatísticas agregadas
+    """
+    total = len(runs)
+    if total == 0:
+        return {"runs": 0, "elapsed_s": elapsed, "games_per_second": 0.0}
+
+    return {
+        "runs": total,
+        "elapsed_s": elapsed,
+        "games_per_second": total / elapsed if elapsed > 0 else float("inf"),
+        "avg_turns": sum(r["turns"] for r in runs) / total,
+        "avg_damage_taken": sum(r["damage_taken"] for r in runs) / total,
+        "avg_luck_spent": sum(r["luck_spent"] for r in runs) / total,
+        "avg_magic_spent": sum(r["magic_spent"] for r in runs) / total,
+        "end_reasons": dict(Counter(r["end_reason"] for r in runs)),
+        "final_pages": dict(Counter(r["final_page"] for r in runs)),
+        "occupations": dict(Counter(r["occupation"] for r in runs))
+    }
+
+
+class _NullStream:
+    """Stream de escrita que descarta tudo sem custo de I/O."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+_NULL_STREAM = _NullStream()
+
+
+# Teste e validação
+if __name__ == "__main__":
+    print("=== TESTE DO SIMULATOR ===\n")
+
+    simulator = Simulator()
+    report = simulator.run(50)
+    for key, value in report["summary"].items():
+        print(f"   {key}: {value}")
+
+    print("\n=== TESTE CONCLUÍDO ===")
@@ -0,0 +1,205 @@
+"""
+Story Graph Module - Índice compilado de transições entre páginas
+
+Este módulo implementa o StoryGraph, um índice de adjacência construído uma
+única vez a partir das páginas do jogo. Ele consolida todos os destinos de
+'goto' espalhados pelas choices (goto simples, results[nível], outcomes
+win/lose/draw e paths de conditional_on) e oferece consultas O(1) de
+sucessores e predecessores, páginas terminais, páginas inalcançáveis e
+subgrafos por ocupação.
+"""
+
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, Iterable, List, Mapping, Optional, Set
+
+
+# Página virtual de encerramento usada por 'goto: 0'
+END_PAGE = 0
+
+
+def choice_targets(choice: Dict[str, Any], occupation: Optional[str] = None) -> Set[int]:
+    """
+    Coleta todas as páginas de destino possíveis de uma choice.
+
+    Args:
+        choice: Dicionário da choice
+        occupation: Se informado, resolve conditional_on e set-occupation para
+                    esta ocupação; se None, considera todos os caminhos
+
+    Returns:
+        Conjunto de IDs de páginas de destino
+    """
+    targets: Set[int] = set()
+    if not isinstance(choice, dict):
+        return targets
+
+    if choice.get("conditional_on") == "occupation":
+        paths = choice.get("paths", {})
+        if occupation is None:
+            selected = list(paths.values())
+        else:
+            path = paths.get(occupation, paths.get("default"))
+            selected = [path] if path is not None else []
+        for path in selected:
+            targets |= choice_targets(path, occupation)
+        return targets
+
+    # Choices que definem outra ocupação não pertencem ao subgrafo desta ocupação
+    if occupation is not None and "set-occupation" in choice and choice["set-occupation"] != occupation:
+        return targets
+
+    _add_target(targets, choice.get("goto"))
+
+    for result in choice.get("results", {}).values():
+        if isinstance(result, dict):
+            _add_target(targets, result.get("goto"))
+        else:
+            _add_target(targets, result)
+
+    for outcome in choice.get("outcomes", {}).values():
+        if isinstance(outcome, dict):
+            _add_target(targets, outcome.get("goto"))
+
+    return targets
+
+
+def _add_target(targets: Set[int], value: Any) -> None:
+    """Adiciona um destino válido (inteiro não negativo) ao conjunto."""
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        targets.add(value)
+
+
+class StoryGraph:
+    """
+    Índice de adjacência compilado do livro-jogo.
+
+    Construído uma vez no carregamento do conteúdo; todas as consultas são
+    leituras em dicionários pré-calculados.
+    """
+
+    def __init__(self, pages: Dict[int, Dict[str, Any]], start_page: int = 1):
+        """
+        Compila o grafo de páginas.
+
+        Args:
+            pages: Dicionário com todas as páginas do jogo
+            start_page: Página inicial usada nas análises de alcançabilidade
+        """
+        self.start_page = start_page
+        self._successors: Dict[int, FrozenSet[int]] = {}
+        self._predecessors: Dict[int, FrozenSet[int]] = {}
+
+        predecessors: Dict[int, Set[int]] = {page_id: set() for page_id in pages}
+        occupations: Set[str] = set()
+
+        for page_id, page_data in pages.items():
+            targets: Set[int] = set()
+            for choice in page_data.get("choices", []):
+                targets |= choice_targets(choice)
+                occupations |= self._choice_occupations(choice)
+            self._successors[page_id] = frozenset(targets)
+            for target in targets:
+                predecessors.setdefault(target, set()).add(page_id)
+
+        self._predecessors = {page_id: frozenset(sources) for page_id, sources in predecessors.items()}
+
+        self._terminal_pages = frozenset(
+            page_id for page_id, page_data in pages.items() if not page_data.get("choices")
+        )
+        self._dangling_targets = {
+            page_id: frozenset(t for t in targets if t != END_PAGE and t not in pages)
+            for page_id, targets in self._successors.items()
+            if any(t != END_PAGE and t not in pages for t in targets)
+        }
+        self._unreachable_pages = frozenset(pages) - self._reachable(self._successors, start_page)
+
+        self._occupations = frozenset(occupations)
+        self._occupation_subgraphs = {
+            occupation: self._build_occupation_subgraph(pages, occupation)
+            for occupation in self._occupations
+        }
+
+    @staticmethod
+    def _choice_occupations(choice: Dict[str, Any]) -> Set[str]:
+        """Extrai as ocupações mencionadas por uma choice."""
+        found: Set[str] = set()
+        if not isinstance(choice, dict):
+            return found
+        if "set-occupation" in choice:
+            found.add(choice["set-occupation"])
+        if choice.get("conditional_on") == "occupation":
+            found |= {key for key in choice.get("paths", {}) if key != "default"}
+        return found
+
+    @staticmethod
+    def _reachable(adjacency: Dict[int, Iterable[int]], start: int) -> Set[int]:
+        """Busca em largura a partir de start sobre uma lista de adjacência."""
+        if start not in adjacency:
+            return set()
+        seen = {start}
+        frontier: List[int] = [start]
+        while frontier:
+            page_id = frontier.pop()
+            for target in adjacency.get(page_id, ()):
+                if target not in seen:
+                    seen.add(target)
+                    frontier.append(target)
+        return seen
+
+    def _build_occupation_subgraph(self, pages: Dict[int, Dict[str, Any]], occupation: str) -> Dict[int, FrozenSet[int]]:
+        """Monta a adjacência das páginas alcançáveis para uma ocupação."""
+        adjacency: Dict[int, FrozenSet[int]] = {}
+        for page_id, page_data in pages.items():
+            targets: Set[int] = set()
+            for choice in page_data.get("choices", []):
+                targets |= choice_targets(choice, occupation)
+            adjacency[page_id] = frozenset(targets)
+
+        reachable = self._reachable(adjacency, self.start_page)
+        return {page_id: adjacency[page_id] for page_id in reachable if page_id in adjacency}
+
+    def successors(self, page_id: int) -> FrozenSet[int]:
+        """Páginas alcançáveis diretamente a partir de page_id (inclui 0 = fim)."""
+        return self._successors.get(page_id, frozenset())
+
+    def predecessors(self, page_id: int) -> FrozenSet[int]:
+        """Páginas que levam diretamente a page_id."""
+        return self._predecessors.get(page_id, frozenset())
+
+    @property
+    def terminal_pages(self) -> FrozenSet[int]:
+        """Páginas sem choices (fins de história)."""
+        return self._terminal_pages
+
+    @property
+    def unreachable_pages(self) -> FrozenSet[int]:
+        """Páginas que não podem ser alcançadas a partir da página inicial."""
+        return self._unreachable_pages
+
+    @property
+    def dangling_targets(self) -> Mapping[int, FrozenSet[int]]:
+        """Destinos de goto que apontam para páginas inexistentes, por página de origem."""
+        return MappingProxyType(self._dangling_targets)
+
+    @property
+    def occupations(self) -> FrozenSet[str]:
+        """Ocupações referenciadas pelo conteúdo."""
+        return self._occupations
+
+    def occupation_subgraph(self, occupation: str) -> Mapping[int, FrozenSet[int]]:
+        """
+        Adjacência das páginas alcançáveis jogando com uma ocupação.
+
+        Args:
+            occupation: Nome da ocupação (ex.: "Police Officer")
+
+        Returns:
+            Mapeamento somente leitura página → sucessores, restrito às
+            páginas alcançáveis
+        """
+        return MappingProxyType(self._occupation_subgraphs.get(occupation, {}))
+
+    def __repr__(self) -> str:
+        edges = sum(len(targets) for targets in self._successors.values())
+        return (f"StoryGraph(pages={len(self._successors)}, edges={edges}, "
+                f"terminal={len(self._terminal_pages)}, unreachable={len(self._unreachable_pages)})")
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from action_plan import GotoOp, LuckRollOp, OpposedRollOp, SkillRollOp, compile_choice, compile_pages
+from agent import Agent
+
+
+PAGES = {
+    1: {"text": "start", "choices": [
+        {"conditional_on": "occupation", "paths": {
+            "Police Officer": {"text": "Show badge", "goto": 2},
+            "default": {"roll": {"skill": "POW", "difficulty": "hard"}, "results": {"3": {"goto": 2}, "2": 3}},
+        }},
+        {"luck_roll": True, "results": {"2": {"goto": 3, "effects": [{"action": "take_damage", "amount": 1}]},
+                                        "4": {"goto": 2}}},
+        {"opposed_roll": "Fighting", "opponent_skill": {"full": 40},
+         "outcomes": {"win": {"goto": 2}, "lose": {"goto": 3}, "draw": {"goto": 3}}},
+    ]},
+    2: {"text": "win", "choices": []},
+    3: {"text": "lose", "choices": []},
+}
+
+
+def test_compiled_plans_resolve_tables_and_paths():
+    conditional, luck, opposed = compile_pages(PAGES)[1]
+
+    assert conditional.resolve("Police Officer").ops == (GotoOp(2),)
+    roll = conditional.resolve("Nurse").ops[0]
+    assert isinstance(roll, SkillRollOp) and roll.difficulty == "hard"
+    assert roll.outcomes[3].goto == 2 and roll.outcomes[2].goto == 3 and roll.outcomes[5] is None
+    assert conditional.resolve("Nurse").text == ""
+
+    luck_op = luck.default.ops[0]
+    assert isinstance(luck_op, LuckRollOp)
+    # Níveis sem resultado usam o nível inferior mais próximo
+    assert luck_op.outcomes[1] is None and luck_op.outcomes[3] == luck_op.outcomes[2]
+    assert luck_op.outcomes[5].goto == 2
+
+    opposed_op = opposed.default.ops[0]
+    assert isinstance(opposed_op, OpposedRollOp) and opposed_op.opponent_half == 20
+    assert compile_choice({"goto": -1}).default.ops == (GotoOp(None),)
+
+    # Efeitos são validados uma única vez, na compilação
+    with pytest.raises(ValueError, match="Página 4"):
+        compile_pages({4: {"text": "x", "choices": [{"goto": 2, "effects": [{"action": "fly"}]}]}})
+
+
+def test_agent_executes_conditional_and_opposed_choices():
+    agent = Agent(PAGES, player_input_adapter=None, interactive=False, rng=random.Random(7))
+    agent.cockpit.set_current_page(1)
+    agent.cockpit.character.set_occupation("Police Officer")
+
+    outcome, next_page = agent.perform_action(PAGES[1]["choices"][0])
+    assert not outcome.startswith("Erro") and next_page == 2
+
+    outcome, next_page = agent.perform_action(PAGES[1]["choices"][2])
+    assert not outcome.startswith("Erro") and next_page in (2, 3)
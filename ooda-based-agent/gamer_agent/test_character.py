@@ -0,0 +1,265 @@
+import random
+
+import pytest
+
+from character import Character
+
+
+def test_restore_undoes_mutations_and_shares_untouched_sections():
+    character = Character(rng=random.Random(5))
+    character.set_skill("Dodge", 40)
+    character.add_item("Torch")
+    token = character.snapshot()
+    skills_before = character._sheet["skills"]
+
+    character.take_damage(2)
+    character.add_modifier("Dodge", "penalty_dice", 1)
+    character.add_item("Rope")
+    character.spend_luck(5)
+    # Seções não alteradas continuam compartilhadas com o snapshot
+    assert character._sheet["skills"] is skills_before
+
+    character.restore(token)
+    assert character.get_health_status()["damage_taken"] == 0
+    assert character.get_modifiers() == []
+    assert character.get_inventory()["equipment"] == ["Torch"]
+
+    # O mesmo token pode ser restaurado novamente após novas alterações
+    character.set_skill("Dodge", 90)
+    character.restore(token)
+    assert character.get_skill("Dodge")["full"] == 40
+
+
+def test_atomic_apply_effects_rolls_back_whole_batch():
+    character = Character(rng=random.Random(5))
+    character.add_item("Torch")
+    luck = character.get_luck()["current"]
+    effects = [
+        {"action": "take_damage", "amount": 1},
+        {"action": "gain_skill", "skill": "Occult"},
+        {"action": "spend_luck", "amount": luck + 1},  # sorte insuficiente
+    ]
+
+    result = character.apply_effects(effects, atomic=True)
+
+    assert result["rolled_back"] and result["effects_failed"] == 1
+    assert character.get_health_status()["damage_taken"] == 0
+    assert "Occult" not in character.get_all_skills()
+    assert not character.in_transaction
+
+    # Transações aninhadas: o rollback interno preserva as alterações externas
+    with character.transaction():
+        character.take_damage(1)
+        with character.transaction(commit=False):
+            character.remove_item("Torch")
+            character.add_modifier("Dodge", "bonus_dice", 1)
+            character.add_to_history(1, "Page text", {"goto": 2})
+        assert character.get_history() == []
+        assert character.get_inventory()["equipment"] == ["Torch"]
+    assert character.get_health_status()["damage_taken"] == 1
+    assert character.get_modifiers() == []
+
+
+def test_roll_check_resolves_any_category_without_output(capsys):
+    character = Character(rng=random.Random(2))
+    character.set_characteristic("POW", 70)
+    character.set_skill("Fighting", 55, "combat")
+    character.apply_effect({"action": "gain_skill", "skill": "Occult", "skill_type": "expert"})
+
+    assert character.resolve_check("POW") == ("characteristics", None)
+    assert character.resolve_check("Fighting") == ("skills", "combat")
+    assert character.resolve_check("Occult") == ("skills", "expert")
+    assert character.roll_check("POW")["target"] == 70
+    assert character.roll_check("Fighting", difficulty="hard")["target"] == 27
+    assert character.roll_check("Astronomy")["untrained"]
+    assert capsys.readouterr().out == ""
+
+
+def test_compact_character_round_trips_the_sheet():
+    character = Character(rng=random.Random(4))
+    character.set_characteristic("DEX", 61)
+    character.set_skill("Firearms", 65, "combat")
+    character.add_modifier("Firearms", "penalty_dice", 2)
+    character.add_item("Revolver", "weapons")
+    character.take_damage(2)
+
+    compact = character.compact()
+    assert not hasattr(compact, "__dict__") and not hasattr(character, "__dict__")
+    assert compact.get_skill("Firearms") == ("combat", {"full": 65, "half": 32})
+    assert compact.sheet == character.sheet
+    compact.sheet["status"]["modifiers"].clear()
+    assert compact.sheet == character.sheet
+
+    restored = compact.expand(rng=random.Random(4))
+    restored.take_damage(1)
+    assert restored.get_health_status()["damage_taken"] == 3
+    assert compact.damage_taken == 2
+
+
+def test_modifiers_expire_by_turn_through_the_index():
+    character = Character(rng=random.Random(6))
+    character.add_modifier("Stealth", "bonus_dice", 1)
+    character.add_modifier("Stealth", "penalty_dice", 3)
+    assert character.check_skill_modifiers("Stealth")["cancelled"]
+
+    # A duração conta a partir do turno seguinte
+    assert character.advance_turn()["expired"] == []
+    assert character.check_skill_modifiers("Stealth")["cancelled"]
+    assert character.advance_turn()["expired"][0]["type"] == "bonus_dice"
+    assert character.check_skill_modifiers("Stealth")["net_penalty"]
+
+    token = character.snapshot()
+    assert character.advance_turn(2)["expired"]
+    assert not character.check_skill_modifiers("Stealth")["has_penalty"]
+    character.restore(token)
+    assert character.check_skill_modifiers("Stealth")["has_penalty"]
+
+
+def test_page_60_penalty_still_applies_to_the_next_fighting_roll():
+    from pages import PAGES
+
+    character = Character(rng=random.Random(8))
+    character.set_skill("Fighting", 65, "combat")
+    character.apply_effects(PAGES[60]["choices"][0]["effects"])
+    character.advance_turn()  # fim da choice da página 60; a próxima é a 65
+    assert character.roll_check("Fighting")["penalty_dice"]
+
+    character.advance_turn()
+    assert not character.roll_check("Fighting")["penalty_dice"]
+
+
+def test_inventory_counts_duplicates_and_rolls_back():
+    character = Character(rng=random.Random(7))
+    character.add_item("Bullet", "weapons")
+    character.add_item("Bullet", "weapons")
+    view = character.inventory_view()
+    assert view["weapons"] == ("Bullet", "Bullet")
+    assert character.inventory_view() is view
+
+    with character.transaction(commit=False):
+        character.remove_item("Bullet")
+        character.apply_effect({"action": "remove_inventory", "item": "Bullet"})
+        assert not character.has_item("Bullet")
+    assert character.get_item_count("Bullet", "weapons") == 2
+    assert character.get_inventory() == {"equipment": [], "weapons": ["Bullet", "Bullet"]}
+
+
+def test_effects_share_one_dispatcher_and_honor_conditions():
+    single = Character(rng=random.Random(8))
+    batch = Character(rng=random.Random(8))
+    single.apply_effect({"action": "gain_skill", "skill": "Impello"})
+    batch.apply_effects([{"action": "gain_skill", "skill": "Impello"}])
+    assert single.get_all_skills() == batch.get_all_skills()
+    assert single.resolve_check("Impello") == ("skills", "expert")
+
+    effects = [
+        {"action": "take_damage", "amount": 1, "condition": "full_health"},
+        {"action": "take_damage", "amount": 1, "condition": "full_health"},
+        {"action": "add_inventory", "item": "Lamp"},
+        {"action": "apply_penalty", "skill": "Fighting", "duration": 1},
+    ]
+    result = batch.apply_validated_effects(effects)
+    assert (result["effects_applied"], result["effects_skipped"], result["effects_failed"]) == (3, 1, 0)
+    assert batch.get_health_status()["damage_taken"] == 1
+    assert batch.has_item("Lamp") and batch.check_skill_modifiers("Fighting")["has_penalty"]
+
+
+def test_binary_round_trip_keeps_state_and_leaves_history_out():
+    character = Character(rng=random.Random(9))
+    character.set_skill("Firearms", 65, "combat")
+    character.add_modifier("Firearms", "penalty_dice", 2)
+    character.add_item("Rope")
+    character.add_item("Rope")
+    character.take_damage(1)
+    character.add_to_history(1, "Page text", {"goto": 2})
+
+    data = character.to_bytes()
+    assert b"Page text" not in data
+    restored = Character.from_bytes(data, rng=random.Random(1), history=character.get_history())
+    assert restored.sheet == character.sheet
+
+    with pytest.raises(ValueError):
+        Character.from_bytes(data[:3] + bytes([99]) + data[4:])
+
+
+def test_history_is_a_bounded_ring_with_zero_copy_tail():
+    character = Character(rng=random.Random(10))
+    evicted = [character.add_to_history(page, "text", {"goto": page + 1}) for page in range(35)]
+    history = character.get_history()
+    assert len(history) == 30 and history[0]["page_number"] == 5
+    assert [entry["page_number"] for entry in evicted if entry] == [0, 1, 2, 3, 4]
+    assert [entry["page_number"] for entry in history.last(3)] == [32, 33, 34]
+    assert history[-2:] == list(history.last(2))
+
+    with character.transaction(commit=False):
+        character.add_to_history(35, "text", {"goto": 36})
+    assert character.get_history()[0]["page_number"] == 5
+
+
+def test_versions_drive_cockpit_status_cache():
+    from cockpit import Cockpit
+
+    character = Character(rng=random.Random(11))
+    cockpit = Cockpit(character, {})
+    first = cockpit.render_character_status()
+    version = character.version
+    assert cockpit.render_character_status()["skills"] is first["skills"]
+    assert character.version == version
+
+    token = character.snapshot()
+    character.take_damage(1)
+    second = cockpit.render_character_status()
+    assert second["health_status"]["damage_taken"] == 1 and second["skills"] is first["skills"]
+    character.restore(token)
+    assert cockpit.render_character_status()["health_status"]["damage_taken"] == 0
+
+
+def test_cockpit_history_json_is_assembled_from_cached_fragments():
+    import json
+    from cockpit import Cockpit
+
+    cockpit = Cockpit(Character(rng=random.Random(12)), {})
+    for page in range(5):
+        cockpit.add_to_history(page, "Você abre a porta " * page, {"text": "Abrir", "goto_executed": page + 1})
+    calls = []
+    cockpit._format_history_entry = lambda entry: calls.append(entry)
+
+    rendered = cockpit.render_history(2)
+    assert calls == []
+    data = json.loads(rendered)
+    assert [entry["step"] for entry in data["entries"]] == [1, 2]
+    assert data["entries"][1]["action_result"] == {"goto_executed": 5}
+    assert rendered == json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def test_rolled_back_clear_modifiers_does_not_leak_into_forks_or_snapshots():
+    character = Character(rng=random.Random(1))
+    character.add_modifier("Dodge", "bonus_dice", 3)
+    fork = character.fork()
+    with character.transaction(commit=False):
+        character.clear_modifiers()
+    character.add_modifier("Fighting", "penalty_dice", 1)
+    assert [mod["skill"] for mod in fork.get_modifiers()] == ["Dodge"]
+
+    token = character.snapshot()
+    with character.transaction(commit=False):
+        character.clear_modifiers("Dodge")
+    character.add_modifier("Spot Hidden", "bonus_dice", 1)
+    character.restore(token)
+    assert [mod["skill"] for mod in character.get_modifiers()] == ["Dodge", "Fighting"]
+
+
+def test_from_status_keeps_modifier_expiry_relative_to_the_turn():
+    from cockpit import Cockpit
+
+    character = Character(rng=random.Random(1))
+    character.advance_turn(20)
+    character.add_modifier("Fighting", "penalty_dice", 1)
+    character.advance_turn()
+    status = Cockpit(character, {}).render_character_status()
+
+    for data in (status, dict(status, health_status={k: v for k, v in status["health_status"].items() if k != "turn"})):
+        rebuilt = Character.from_status(data, rng=random.Random(2))
+        assert len(rebuilt.get_modifiers()) == 1
+        rebuilt.advance_turn()
+        assert rebuilt.get_modifiers() == []
@@ -0,0 +1,99 @@
+import itertools
+from collections import Counter
+from fractions import Fraction
+
+import pytest
+
+from character import Character
+from dice_probability import success_level_distribution, D100_OUTCOMES
+
+
+class EnumeratingRng:
+    """Fornece randint() percorrendo todas as combinações (dezena, dezena, unidade)."""
+
+    def __init__(self):
+        self._values = iter(v for combo in itertools.product(range(10), range(10), range(1, 11)) for v in combo)
+
+    def randint(self, a, b):
+        return next(self._values)
+
+
+def enumerate_levels(target, half, bonus=False, penalty=False, difficulty="regular"):
+    character = Character(rng=EnumeratingRng())
+    character.set_skill("Probe", 0)
+    character._sheet["skills"]["common"]["Probe"] = {"full": target, "half": half}
+    levels = Counter(
+        character.roll_skill("Probe", bonus_dice=bonus, penalty_dice=penalty, difficulty=difficulty)["level"]
+        for _ in range(D100_OUTCOMES)
+    )
+    return {level: Fraction(levels[level], D100_OUTCOMES) for level in range(1, 6)}
+
+
+def test_distribution_matches_exhaustive_enumeration_of_character_rolls():
+    for target, half, bonus, penalty, difficulty in [
+        (50, 25, False, False, "regular"),
+        (65, 32, True, False, "regular"),
+        (40, 20, False, True, "hard"),
+        (5, 2, True, True, "regular"),
+    ]:
+        exact = success_level_distribution(target, half, bonus, penalty, difficulty, exact=True)
+        assert exact == enumerate_levels(target, half, bonus, penalty, difficulty)
+        assert sum(exact.values()) == 1
+
+
+def test_character_reports_odds_for_rolls():
+    character = Character()
+    character.set_characteristic("DEX", 60)
+
+    result = character.roll_characteristic("DEX", report_odds=True)
+
+    assert result["odds"] == character.characteristic_odds("DEX")
+    assert abs(result["odds"][3] - 0.30) < 1e-9
+
+
+def test_opposed_roll_distribution_matches_brute_force_over_both_rolls():
+    from dice_probability import d100_distribution, evaluate_level, opposed_roll_distribution, OpposedRollTable
+
+    def brute_force(my_full, my_half, opp_full, opp_half, bonus):
+        tally = Counter()
+        for my_roll, my_count in enumerate(d100_distribution(bonus, False), 1):
+            for opp_roll, opp_count in enumerate(d100_distribution(), 1):
+                mine, theirs = evaluate_level(my_roll, my_full, my_half), evaluate_level(opp_roll, opp_full, opp_half)
+                if mine != theirs:
+                    outcome = "win" if mine > theirs else "lose"
+                else:
+                    outcome = "win" if my_roll < opp_roll else "lose" if my_roll > opp_roll else "draw"
+                tally[outcome] += my_count * opp_count
+        return {k: Fraction(tally[k], D100_OUTCOMES ** 2) for k in ("win", "lose", "draw")}
+
+    assert opposed_roll_distribution(65, 32, 40, 20, exact=True) == brute_force(65, 32, 40, 20, False)
+    assert opposed_roll_distribution(30, 15, 40, 20, True, exact=True) == brute_force(30, 15, 40, 20, True)
+
+    table = OpposedRollTable()
+    expected = opposed_roll_distribution(65, 32, 40, 20, my_bonus_dice=True)
+    assert table.lookup(65, 40, "bonus") == expected
+
+
+def test_numpy_dice_engine_matches_scalar_semantics():
+    np = pytest.importorskip("numpy")
+    from dice_engine import NumpyDiceEngine
+    from dice_probability import d100_distribution, evaluate_level
+
+    engine = NumpyDiceEngine(seed=7)
+    all_rolls = np.arange(1, 101)
+    for target, half in ((0, 0), (45, 22), (99, 49), (120, 60)):
+        expected = [evaluate_level(int(roll), target, half) for roll in all_rolls]
+        assert engine.evaluate_levels(all_rolls, target, half).tolist() == expected
+
+    n = 200_000
+    for bonus, penalty in ((False, False), (True, False), (False, True)):
+        rolls = engine.roll_d100_batch(n, bonus, penalty)
+        observed = np.bincount(rolls, minlength=101)[1:] / n
+        exact = np.array(d100_distribution(bonus, penalty)) / D100_OUTCOMES
+        assert rolls.min() >= 1 and rolls.max() <= 100
+        assert np.abs(observed - exact).max() < 0.004
+
+    character = Character(dice_engine=NumpyDiceEngine(seed=7))
+    batch = character.roll_skill_batch("Dodge", 50_000)
+    assert sum(batch["level_counts"].values()) == 50_000
+    assert 1 <= character.roll_skill("Dodge")["roll"] <= 100
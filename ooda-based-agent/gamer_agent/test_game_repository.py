@@ -0,0 +1,39 @@
+import os
+import pickle
+
+import game_repository
+from game_repository import GameRepository
+
+
+def test_snapshot_is_reused_and_invalidated_by_key_change(tmp_path, monkeypatch):
+    first = GameRepository(snapshot_dir=str(tmp_path))
+    second = GameRepository(snapshot_dir=str(tmp_path))
+
+    assert first.get_load_statistics()["source"] == "module"
+    assert second.get_load_statistics()["source"] == "snapshot"
+    page_ids = first.get_all_page_ids()
+    assert second.get_all_page_ids() == page_ids
+    assert all(second.get_page(page) == first.get_page(page) for page in page_ids)
+    assert all(second.get_choice_plans(page) == first.get_choice_plans(page) for page in page_ids)
+    assert all(second.get_successors(page) == first.get_successors(page) for page in page_ids)
+    assert repr(second.graph) == repr(first.graph)
+
+    old_path = first.get_load_statistics()["snapshot_path"]
+    monkeypatch.setattr(game_repository, "SNAPSHOT_FORMAT_VERSION", game_repository.SNAPSHOT_FORMAT_VERSION + 1)
+    changed = GameRepository(snapshot_dir=str(tmp_path))
+
+    assert changed.get_load_statistics()["source"] == "module"
+    assert os.listdir(tmp_path) == [os.path.basename(changed.get_load_statistics()["snapshot_path"])]
+    assert not os.path.exists(old_path)
+
+
+def test_snapshot_write_failure_is_not_fatal(tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise pickle.PicklingError("não serializável")
+
+    monkeypatch.setattr(game_repository.pickle, "dump", fail)
+    repository = GameRepository(snapshot_dir=str(tmp_path))
+
+    assert repository.get_load_statistics()["source"] == "module"
+    assert repository.get_total_pages() > 0
+    assert os.listdir(tmp_path) == []
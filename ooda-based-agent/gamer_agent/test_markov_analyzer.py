@@ -0,0 +1,39 @@
+from fractions import Fraction
+
+from dice_probability import success_chance, success_level_distribution
+from markov_analyzer import MarkovAnalyzer
+
+
+PAGES = {
+    1: {"text": "Start", "choices": [
+        {"goto": 2, "set-occupation": "Nurse"},
+        {"goto": 3, "set-occupation": "Police Officer"},
+    ]},
+    2: {"text": "Retry until success", "choices": [
+        {"roll": "Medicine", "results": {"5": {"goto": 4}, "4": {"goto": 4}, "3": 4}},
+    ]},
+    3: {"text": "Fork", "choices": [{"goto": 0}, {"goto": 5}]},
+    4: {"text": "The end"},
+    5: {"text": "Loop A", "choices": [{"goto": 6}]},
+    6: {"text": "Loop B", "choices": [{"goto": 5}]},
+}
+
+
+def test_markov_analyzer_solves_absorption_and_turns_exactly():
+    report = MarkovAnalyzer(pages=PAGES, exact=True).analyze()
+
+    p_success = success_chance(success_level_distribution(70, 35, exact=True))
+    nurse = report["by_occupation"]["Nurse"]
+    assert nurse["terminal_probabilities"] == {4: 1}
+    assert nurse["expected_turns"] == 1 + 1 / p_success
+    assert nurse["trapped_probability"] == 0
+
+    police = report["by_occupation"]["Police Officer"]
+    assert police["terminal_probabilities"] == {0: Fraction(1, 2)}
+    assert police["trapped_probability"] == Fraction(1, 2)
+    assert police["expected_turns"] == float("inf")
+
+    overall = report["overall"]
+    assert overall["terminal_probabilities"] == {0: Fraction(1, 4), 4: Fraction(1, 2)}
+    assert overall["trapped_probability"] == Fraction(1, 4)
+    assert report["trapped_states"] == 2
@@ -0,0 +1,46 @@
+import random
+
+from character import Character
+from mcts import MCTSPlanner
+
+
+PAGES = {
+    1: {"text": "Choose", "choices": [
+        {"goto": 2},
+        {"roll": "DEX", "results": {"5": {"goto": 3}, "4": {"goto": 3}, "3": {"goto": 3},
+                                     "2": {"goto": 4, "effects": [{"action": "take_damage", "amount": 4}]},
+                                     "1": {"goto": 4, "effects": [{"action": "take_damage", "amount": 4}]}}},
+    ]},
+    2: {"text": "Trap", "choices": [{"goto": 2, "effects": [{"action": "take_damage", "amount": 1}]}]},
+    3: {"text": "Safe ending"},
+    4: {"text": "Deadly ending"},
+}
+
+
+def test_character_fork_is_independent_of_original():
+    character = Character(rng=random.Random(3))
+    character.set_skill("Dodge", 40)
+    character.add_modifier("Dodge", "bonus_dice", 2)
+
+    fork = character.fork()
+    fork.take_damage(2)
+    fork.set_skill("Dodge", 80)
+    fork.add_item("Torch")
+    fork.clear_modifiers()
+
+    assert character.get_health_status()["damage_taken"] == 0
+    assert character.get_skill("Dodge")["full"] == 40
+    assert character.get_inventory()["equipment"] == []
+    assert len(character.get_modifiers()) == 1
+
+
+def test_mcts_prefers_risky_roll_over_certain_death():
+    character = Character(rng=random.Random(0))
+    character.set_characteristic("DEX", 70)
+
+    planner = MCTSPlanner(PAGES, rollouts=400, max_depth=20, rng=random.Random(5))
+    best, stats = planner.search(character, 1)
+
+    assert best == 1
+    assert stats["iterations"] == 400
+    assert character.get_health_status()["damage_taken"] == 0
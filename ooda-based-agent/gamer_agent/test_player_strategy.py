@@ -0,0 +1,114 @@
+import io
+from unittest import mock
+
+from rich.console import Console
+
+from game_repository import GameRepository
+from player_strategy import LiveRenderConsole, RenderConsole
+
+
+def _character_data(occupation="Nurse"):
+    return {
+        "character_info": {"name": "Ana", "occupation": occupation, "age": 30},
+        "health_status": {"icon": "💚", "current_level": "Healthy", "damage_taken": 0},
+        "resources": {"luck": {"current": 50, "starting": 50}, "magic": {"current": 10, "starting": 10}},
+        "characteristics": {"STR": {"full": 50}},
+        "skills": {"Medicine": {"full": 60}},
+    }
+
+
+def test_live_renderer_rebuilds_only_changed_panels_without_subprocess():
+    console = Console(file=io.StringIO(), force_terminal=True, width=100)
+    renderer = LiveRenderConsole(console=console)
+    character_data = _character_data()
+    choices = [{"text": "Seguir", "goto": 2}]
+
+    with mock.patch("os.system") as system:
+        renderer.render_game_screen(choices, character_data, [], {"text": "Início"}, 1)
+        panels = {name: panel for name, (_, panel) in renderer._panels.items()}
+        written = console.file.tell()
+
+        # Mesmo quadro: nada é reconstruído nem redesenhado
+        renderer.render_game_screen(choices, character_data, [], {"text": "Início"}, 1)
+        assert console.file.tell() == written
+
+        history = [{"page_number": 1, "choice_made": {"goto": 2}}]
+        renderer.render_game_screen(choices, character_data, history, {"text": "Corredor"}, 2)
+        renderer.close()
+
+    system.assert_not_called()
+    rebuilt = {name for name, (_, panel) in renderer._panels.items() if panel is not panels[name]}
+    assert rebuilt == {"history", "page", "choices"}
+    assert "Corredor" in console.file.getvalue()
+
+
+def test_page_panels_are_prewarmed_for_successors_and_reused():
+    repository = GameRepository()
+    renderer = RenderConsole(game_repository=repository)
+    renderer.console = Console(file=io.StringIO(), force_terminal=True, width=100)
+
+    with mock.patch("os.system"), mock.patch("builtins.print"):
+        page = repository.get_page(1)
+        renderer.render_game_screen(page["choices"], _character_data(), [], page, 1)
+        for target in repository.get_successors(1):
+            assert renderer._page_key(target, repository.get_page_choices(target), "Nurse") in renderer._page_panel_cache
+
+        target = min(repository.get_successors(1))
+        page = repository.get_page(target)
+        key = renderer._page_key(target, page["choices"], "Nurse")
+        prewarmed = renderer._page_panel_cache.get(key)
+        with mock.patch.object(renderer, "_build_choices_panel", wraps=renderer._build_choices_panel) as build:
+            renderer.render_game_screen(page["choices"], _character_data(), [], page, target)
+
+    # O painel da página visitada veio do cache; só os sucessores dela foram construídos
+    assert renderer._page_panel_cache.get(key) is prewarmed
+    assert build.call_count == len(repository.get_successors(target) - repository.get_successors(1) - {0, 1})
+
+
+def test_background_renderer_coalesces_pending_frames():
+    import threading
+
+    from player_strategy import BackgroundRenderer, NullRenderer
+
+    gate = threading.Event()
+    started = threading.Event()
+    drawn = []
+
+    class SlowRenderer(NullRenderer):
+        def render_game_screen(self, choices, character_data, history, current_page_data, current_page_number):
+            started.set()
+            gate.wait(5)
+            drawn.append(current_page_number)
+
+    renderer = BackgroundRenderer(SlowRenderer())
+    history = [{"page_number": 1}]
+    for page in (1, 2, 3):
+        renderer.render_game_screen([], {}, history, {}, page)
+        if page == 1:
+            assert started.wait(5)  # o worker está desenhando o primeiro quadro
+        history.append({"page_number": page})
+
+    assert not renderer.wait_idle(timeout=0.05)
+    gate.set()
+    assert renderer.wait_idle(timeout=5)
+    renderer.close()
+
+    assert drawn == [1, 3]
+    assert renderer.frames_dropped == 1
+
+
+def test_background_renderer_waits_for_renderers_that_clear_the_screen():
+    from player_strategy import BackgroundRenderer
+
+    drawn = []
+
+    class ClearingRenderer(RenderConsole):
+        def render_game_screen(self, choices, character_data, history, current_page_data, current_page_number):
+            drawn.append(current_page_number)
+
+    renderer = BackgroundRenderer(ClearingRenderer())
+    assert renderer.clears_screen
+    renderer.render_game_screen([], {}, [], {}, 1)
+    # O quadro já foi desenhado antes de o agente voltar a imprimir
+    assert drawn == [1]
+    renderer.close()
@@ -0,0 +1,77 @@
+from policy_solver import AbstractState, PolicySolver
+
+
+PAGES = {
+    1: {"text": "Start", "choices": [
+        {"goto": 2, "set-occupation": "Police Officer"},
+    ]},
+    2: {"text": "Fight or flee", "choices": [
+        {"goto": 2},
+        {"opposed_roll": "Fighting", "opponent_skill": {"full": 90, "half": 45},
+         "outcomes": {"win": {"goto": 3}, "lose": {"goto": 4, "effects": [{"action": "take_damage", "amount": 4}]},
+                      "draw": {"goto": 3}}},
+        {"goto": 5, "effects": [{"action": "take_damage", "amount": 1}]},
+    ]},
+    3: {"text": "Victory"},
+    4: {"text": "Defeat"},
+    5: {"text": "Escape"},
+}
+
+
+def test_policy_solver_picks_best_choice_per_objective():
+    survival = PolicySolver(pages=PAGES, objective="survival")
+    survival.solve()
+    state = AbstractState(2, "Police Officer", 0, 6, frozenset())
+    # Fugir garante a sobrevivência; ficar parado nunca termina
+    assert survival.best_choice(state) == 2
+    assert abs(survival.value(survival.initial_state()) - 1.0) < 1e-9
+
+    victory = PolicySolver(pages=PAGES, objective=3)
+    victory.solve()
+    assert victory.best_choice(state) == 1
+    assert 0 < victory.value(victory.initial_state()) < 1
+
+
+def test_optimal_player_adapter_answers_from_policy_table():
+    from player_strategy import OptimalPlayerAdapter
+
+    adapter = OptimalPlayerAdapter(solver=PolicySolver(pages=PAGES, objective=3), headless=True)
+    character_data = {
+        "character_info": {"occupation": "Police Officer"},
+        "health_status": {"damage_taken": 0},
+        "resources": {"luck": {"current": 63}},
+        "modifiers": [],
+    }
+    index, reason = adapter.get_decision(PAGES[2]["choices"], character_data, [], PAGES[2], 2)
+    assert index == 2
+    assert "Política ótima" in reason
+
+
+def test_solver_modifiers_expire_like_the_character():
+    import random
+
+    from character import Character
+    from cockpit import Cockpit
+
+    pages = {
+        1: {"text": "Ambush", "choices": [
+            {"goto": 2, "effects": [{"action": "apply_penalty", "skill": "Fighting", "duration": 1}]},
+            {"goto": 2, "effects": [{"action": "apply_penalty", "skill": "Dodge", "duration": 2}]},
+        ]},
+        2: {"text": "Fight", "choices": [{"opposed_roll": "Fighting", "outcomes": {"win": {"goto": 3}}}]},
+        3: {"text": "End"},
+    }
+    solver = PolicySolver(pages=pages)
+    solver.solve()
+    # A penalidade de 1 turno ainda vale ao chegar na página 2; a de 2 turnos, também na seguinte
+    start = solver.initial_state()
+    page_2 = {state.modifiers for _, choice in solver.valid_choices(start)
+              for _, state in solver.choice_outcomes(start, choice)}
+    assert page_2 == {frozenset({("Fighting", "penalty_dice", 1)}), frozenset({("Dodge", "penalty_dice", 2)})}
+
+    character = Character(rng=random.Random(1))
+    character.advance_turn(5)
+    character.apply_effects([{"action": "apply_penalty", "skill": "Dodge", "duration": 2}])
+    character.advance_turn()
+    state = solver.state_from_character_data(2, Cockpit(character, {}).render_character_status())
+    assert state in solver.policy
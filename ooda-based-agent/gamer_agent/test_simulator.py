@@ -0,0 +1,28 @@
+from simulator import Simulator
+
+
+def test_simulator_runs_headless_and_reports_structured_results():
+    simulator = Simulator(max_turns=50)
+    report = simulator.run(5)
+
+    assert report["summary"]["runs"] == 5
+    assert report["summary"]["games_per_second"] > 0
+    for run in report["runs"]:
+        assert run["pages_visited"][0] == 1
+        assert run["pages_visited"][-1] == run["final_page"]
+        assert run["turns"] <= 50
+        assert run["end_reason"] in ("end", "goto_zero", "max_turns", "error", "circuit_breaker")
+
+
+def test_parallel_runs_are_identical_regardless_of_worker_count():
+    from simulator import ParallelSimulator
+
+    def strip_timing(report):
+        return [{k: v for k, v in run.items() if k != "duration_ms"} for run in report["runs"]]
+
+    seeds = range(100, 112)
+    single = ParallelSimulator(workers=1, max_turns=60).run(seeds)
+    pooled = ParallelSimulator(workers=3, max_turns=60, chunksize=2).run(seeds)
+
+    assert strip_timing(single) == strip_timing(pooled)
+    assert [run["seed"] for run in pooled["runs"]] == list(seeds)
@@ -0,0 +1,38 @@
+from story_graph import StoryGraph
+
+
+PAGES = {
+    1: {"text": "start", "choices": [
+        {"goto": 2, "set-occupation": "Nurse"},
+        {"goto": 3, "set-occupation": "Police Officer"},
+    ]},
+    2: {"text": "roll", "choices": [{"roll": "DEX", "results": {"3": {"goto": 4}, "2": 5}}]},
+    3: {"text": "fight", "choices": [
+        {"opposed_roll": "Fighting", "outcomes": {"win": {"goto": 4}, "lose": {"goto": 5}, "draw": {"goto": 3}}},
+        {"conditional_on": "occupation", "paths": {"Police Officer": {"goto": 0}, "default": {"goto": 5}}},
+    ]},
+    4: {"text": "win", "choices": []},
+    5: {"text": "lose", "choices": []},
+    6: {"text": "orphan", "choices": [{"goto": 4}]},
+}
+
+
+def test_story_graph_indexes_every_goto_form():
+    graph = StoryGraph(PAGES)
+
+    assert graph.successors(2) == {4, 5}
+    assert graph.successors(3) == {0, 3, 4, 5}
+    assert graph.predecessors(4) == {2, 3, 6}
+    assert graph.terminal_pages == {4, 5}
+    assert graph.unreachable_pages == {6}
+
+
+def test_story_graph_occupation_subgraphs_resolve_conditionals():
+    graph = StoryGraph(PAGES)
+
+    nurse = graph.occupation_subgraph("Nurse")
+    police = graph.occupation_subgraph("Police Officer")
+
+    assert set(nurse) == {1, 2, 4, 5}
+    assert police[1] == {3}
+    assert police[3] == {0, 3, 4, 5}